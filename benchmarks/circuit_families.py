@@ -0,0 +1,109 @@
+"""
+Scalable circuit families for benchmarking the Quantum Circuit Simulator.
+
+Each builder takes the number of qubits and returns a measured QuantumCircuit,
+so the same family can be run across a range of widths.
+"""
+import math
+
+import numpy as np
+from qiskit import QuantumCircuit
+
+
+def ghz_circuit(num_qubits):
+    """GHZ state: H on qubit 0 followed by a CNOT chain"""
+    qc = QuantumCircuit(num_qubits, name=f"ghz_{num_qubits}")
+    qc.h(0)
+    for qubit in range(1, num_qubits):
+        qc.cx(qubit - 1, qubit)
+    qc.measure_all()
+    return qc
+
+
+def qft_circuit(num_qubits):
+    """Quantum Fourier transform of an alternating basis state"""
+    qc = QuantumCircuit(num_qubits, name=f"qft_{num_qubits}")
+    for qubit in range(0, num_qubits, 2):
+        qc.x(qubit)
+    for target in reversed(range(num_qubits)):
+        qc.h(target)
+        for control in reversed(range(target)):
+            qc.cp(math.pi / 2 ** (target - control), control, target)
+    for qubit in range(num_qubits // 2):
+        qc.swap(qubit, num_qubits - 1 - qubit)
+    qc.measure_all()
+    return qc
+
+
+def grover_circuit(num_qubits, iterations=None):
+    """
+    Grover search for the all-ones state
+
+    Args:
+        num_qubits (int): Number of search qubits
+        iterations (int): Grover iterations (defaults to the optimal count, capped at 8)
+    """
+    if iterations is None:
+        iterations = min(8, max(1, int(math.pi / 4 * math.sqrt(2 ** num_qubits))))
+    qc = QuantumCircuit(num_qubits, name=f"grover_{num_qubits}")
+    qubits = list(range(num_qubits))
+    qc.h(qubits)
+
+    def phase_flip_all_ones():
+        if num_qubits == 1:
+            qc.z(0)
+            return
+        qc.h(num_qubits - 1)
+        qc.mcx(qubits[:-1], num_qubits - 1)
+        qc.h(num_qubits - 1)
+
+    for _ in range(iterations):
+        # Oracle
+        phase_flip_all_ones()
+        # Diffuser
+        qc.h(qubits)
+        qc.x(qubits)
+        phase_flip_all_ones()
+        qc.x(qubits)
+        qc.h(qubits)
+    qc.measure_all()
+    return qc
+
+
+def tfim_circuit(num_qubits, steps=4, coupling=1.0, field=1.0, dt=0.1):
+    """Trotterized time evolution of the transverse-field Ising chain"""
+    qc = QuantumCircuit(num_qubits, name=f"tfim_{num_qubits}")
+    for _ in range(steps):
+        for qubit in range(num_qubits - 1):
+            qc.rzz(2 * coupling * dt, qubit, qubit + 1)
+        for qubit in range(num_qubits):
+            qc.rx(2 * field * dt, qubit)
+    qc.measure_all()
+    return qc
+
+
+def random_qubo_circuit(num_qubits, density=0.5, gamma=0.8, beta=0.4, seed=7):
+    """Single-layer QAOA circuit for a random QUBO instance"""
+    rng = np.random.default_rng(seed)
+    linear = rng.uniform(-1, 1, num_qubits)
+    qc = QuantumCircuit(num_qubits, name=f"qubo_{num_qubits}")
+    qc.h(range(num_qubits))
+    for i in range(num_qubits):
+        for j in range(i + 1, num_qubits):
+            if rng.random() < density:
+                qc.rzz(2 * gamma * rng.uniform(-1, 1), i, j)
+    for qubit in range(num_qubits):
+        qc.rz(2 * gamma * linear[qubit], qubit)
+    qc.rx(2 * beta, range(num_qubits))
+    qc.measure_all()
+    return qc
+
+
+# Family name -> circuit builder
+CIRCUIT_FAMILIES = {
+    "ghz": ghz_circuit,
+    "qft": qft_circuit,
+    "grover": grover_circuit,
+    "tfim": tfim_circuit,
+    "qubo": random_qubo_circuit,
+}
@@ -0,0 +1,148 @@
+"""
+Import-time profile of the Streamlit entry points.
+
+Runs each entry point once in a fresh interpreter with ``python -X importtime``
+(Streamlit runs the script in bare mode, without a server) and reports the
+time spent importing modules before the first paint, the slowest imports and
+whether heavy libraries were pulled in. A budget makes the script fail when
+cold start regresses.
+
+Usage:
+    python benchmarks/import_profile.py --budget-ms 1500
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENTRY_POINTS = [
+    "quantum_circuit_simulator.py",
+    "simplified_quantum_simulator.py",
+    "quantum_circuit_simulator_new.py",
+]
+
+# Libraries that should only load once an execution needs them
+# (plotly is left out: Streamlit imports it itself)
+HEAVY_PACKAGES = ["qiskit", "qiskit_aer", "scipy"]
+
+# Packages the Streamlit server has already loaded before an entry point runs
+BASELINE_PACKAGES = ["streamlit"]
+
+
+def parse_importtime(stderr):
+    """
+    Parse ``-X importtime`` output
+
+    Returns:
+        list[dict]: ``module``, ``self_us``, ``cumulative_us`` and ``depth`` per imported module
+    """
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        except ValueError:
+            continue
+        depth = (len(name) - len(name.lstrip(" "))) // 2
+        imports.append({
+            "module": name.strip(),
+            "self_us": int(self_us),
+            "cumulative_us": int(cumulative_us),
+            "depth": depth,
+        })
+    return imports
+
+
+def profile_entry_point(script, top=15):
+    """
+    Import-profile one entry point in a fresh interpreter
+
+    Args:
+        script (str): Path of the entry point, relative to the repository root
+        top (int): Number of slowest top-level imports to report
+
+    Returns:
+        dict: Import totals, per-package self time, slowest imports and loaded heavy packages
+    """
+    runner = (
+        "import runpy, sys; "
+        f"sys.argv = [{script!r}]; "
+        f"runpy.run_path({script!r}, run_name='__main__')"
+    )
+    # Background work (preload, circuit indexing) would start worker processes
+    env = dict(os.environ, QUANTUM_PRELOAD="0", QUANTUM_CIRCUIT_INDEX="0", PYTHONDONTWRITEBYTECODE="1")
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", runner],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True
+    )
+    wall_seconds = time.perf_counter() - start
+
+    imports = parse_importtime(completed.stderr)
+    packages = {}
+    for entry in imports:
+        package = entry["module"].split(".")[0]
+        packages[package] = packages.get(package, 0) + entry["self_us"]
+
+    top_level = sorted((entry for entry in imports if entry["depth"] == 0), key=lambda entry: -entry["cumulative_us"])
+    total_us = sum(entry["self_us"] for entry in imports)
+    baseline_us = sum(packages.get(package, 0) for package in BASELINE_PACKAGES)
+    return {
+        "script": script,
+        "returncode": completed.returncode,
+        "wall_ms": wall_seconds * 1000,
+        "import_ms": total_us / 1000,
+        "import_ms_excluding_streamlit": (total_us - baseline_us) / 1000,
+        "modules_imported": len(imports),
+        "heavy_packages_loaded": [package for package in HEAVY_PACKAGES if package in packages],
+        "packages_ms": {
+            package: self_us / 1000
+            for package, self_us in sorted(packages.items(), key=lambda item: -item[1])[:top]
+        },
+        "slowest_imports": [
+            {"module": entry["module"], "cumulative_ms": entry["cumulative_us"] / 1000}
+            for entry in top_level[:top]
+        ],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Profile the import time of the Streamlit entry points")
+    parser.add_argument("scripts", nargs="*", default=ENTRY_POINTS, help="Entry points to profile")
+    parser.add_argument("--budget-ms", type=float,
+                        help="Fail when an entry point spends longer than this importing (Streamlit excluded)")
+    parser.add_argument("--top", type=int, default=15, help="Number of slowest imports to list")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    reports = [profile_entry_point(script, args.top) for script in args.scripts]
+    over_budget = [
+        report["script"] for report in reports
+        if args.budget_ms is not None and report["import_ms_excluding_streamlit"] > args.budget_ms
+    ]
+
+    if args.json:
+        print(json.dumps({"budget_ms": args.budget_ms, "over_budget": over_budget, "entry_points": reports}, indent=2))
+    else:
+        for report in reports:
+            print(f"{report['script']}: {report['import_ms']:.0f} ms importing "
+                  f"({report['import_ms_excluding_streamlit']:.0f} ms excluding streamlit), "
+                  f"{report['modules_imported']} modules, wall {report['wall_ms']:.0f} ms")
+            heavy = ", ".join(report["heavy_packages_loaded"]) or "none"
+            print(f"  heavy packages loaded before first paint: {heavy}")
+            for entry in report["slowest_imports"]:
+                print(f"  {entry['cumulative_ms']:9.1f} ms  {entry['module']}")
+            if report["returncode"] != 0:
+                print(f"  (script exited with code {report['returncode']})")
+        if over_budget:
+            print(f"Over the {args.budget_ms:.0f} ms budget: {', '.join(over_budget)}")
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,258 @@
+"""
+Benchmark harness for the Quantum Circuit Simulator.
+
+Runs every predefined example module and the scalable circuit families
+(GHZ-n, QFT-n, Grover-n, TFIM-n, random QUBO-n) and reports cold and warm
+latency, throughput, peak RSS and the transpile vs simulate split as JSON.
+
+Each case runs in a fresh process by default, so the cold run includes
+first-use setup and the peak RSS belongs to that case alone.
+
+Usage:
+    python benchmarks/run_benchmarks.py --qubits 4 8 12 16 --output results.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import sys
+import time
+from importlib import metadata
+
+# Allow running as a script from any directory
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.circuit_families import CIRCUIT_FAMILIES
+
+DEFAULT_QUBITS = [4, 8, 12, 16, 20]
+DEFAULT_SHOTS = 1024
+DEFAULT_REPEATS = 5
+
+# Phases (see utils.timing) counted as simulation time
+SIMULATE_PHASES = ("numpy_engine", "run", "result")
+
+
+def _peak_rss_mb():
+    """Return the peak resident set size of this process in MiB, if available"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in KiB elsewhere
+    return peak / 1024 ** 2 if sys.platform == "darwin" else peak / 1024
+
+
+def _package_version(name):
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def environment_info():
+    """Describe the machine and library versions the benchmark ran with"""
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "qiskit": _package_version("qiskit"),
+        "qiskit_aer": _package_version("qiskit-aer"),
+        "numpy": _package_version("numpy"),
+        "timestamp": time.time(),
+    }
+
+
+def build_cases(families, qubit_counts, include_examples=True):
+    """
+    List the benchmark cases to run
+
+    Returns:
+        list[dict]: One entry per example module and per (family, qubits) pair
+    """
+    cases = []
+    if include_examples:
+        from examples.examples import examples
+        cases.extend({"kind": "example", "name": name} for name in examples)
+    for family in families:
+        for num_qubits in qubit_counts:
+            cases.append({"kind": "family", "name": f"{family}_{num_qubits}", "family": family, "qubits": num_qubits})
+    return cases
+
+
+def _phase_split(timings):
+    """Return (transpile, simulate) seconds recorded in a timing trace"""
+    from utils.timing import summarize
+
+    summary = summarize(timings) if timings else {}
+    transpile_seconds = summary.get("transpile", {}).get("wall", 0.0)
+    simulate_seconds = sum(summary.get(name, {}).get("wall", 0.0) for name in SIMULATE_PHASES)
+    return transpile_seconds, simulate_seconds
+
+
+def run_case(case, shots=DEFAULT_SHOTS, repeats=DEFAULT_REPEATS):
+    """
+    Run one benchmark case: a cold run followed by warm repeats
+
+    Args:
+        case (dict): Entry of build_cases
+        shots (int): Shots per run for circuit families (modules choose their own)
+        repeats (int): Number of warm runs
+
+    Returns:
+        dict: Latency, throughput, memory and phase split of the case
+    """
+    record = {**case, "shots": shots if case["kind"] == "family" else None, "error": None}
+
+    import_start = time.perf_counter()
+    from quantum_core import execute_module, run_with_simulator
+    from utils.timing import trace
+    from utils.transpile_cache import transpile_cache
+    record["import_seconds"] = time.perf_counter() - import_start
+    record["rss_after_import_mb"] = _peak_rss_mb()
+
+    if case["kind"] == "example":
+        from examples.examples import examples
+        code = examples[case["name"]]
+
+        def run_once():
+            return execute_module(code, label=case["name"])["timings"]
+    else:
+        circuit = CIRCUIT_FAMILIES[case["family"]](case["qubits"])
+        record["depth"] = circuit.depth()
+
+        def run_once():
+            with trace(circuit.name, log=False) as timings:
+                run_with_simulator(circuit, shots=shots, use_cache=False)
+            return timings
+
+    # Nothing transpiled earlier in this process may make the cold run look warm
+    transpile_cache.clear()
+
+    latencies = []
+    splits = []
+    try:
+        for _ in range(repeats + 1):
+            start = time.perf_counter()
+            timings = run_once()
+            latencies.append(time.perf_counter() - start)
+            splits.append(_phase_split(timings))
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+
+    record["peak_rss_mb"] = _peak_rss_mb()
+    if not latencies:
+        return record
+
+    record["cold_seconds"] = latencies[0]
+    record["cold_transpile_seconds"], record["cold_simulate_seconds"] = splits[0]
+
+    warm = latencies[1:]
+    if warm:
+        warm_median = statistics.median(warm)
+        record["warm_seconds"] = {"min": min(warm), "median": warm_median, "mean": statistics.fmean(warm), "runs": len(warm)}
+        record["warm_transpile_seconds"] = statistics.median(split[0] for split in splits[1:])
+        record["warm_simulate_seconds"] = statistics.median(split[1] for split in splits[1:])
+        record["runs_per_second"] = 1 / warm_median if warm_median > 0 else None
+        if record["shots"]:
+            record["shots_per_second"] = record["shots"] / warm_median if warm_median > 0 else None
+    return record
+
+
+def run_benchmarks(cases, shots=DEFAULT_SHOTS, repeats=DEFAULT_REPEATS, isolated=True, progress=None):
+    """
+    Run benchmark cases one after another
+
+    Args:
+        cases (list[dict]): Output of build_cases
+        shots (int): Shots per run for circuit families
+        repeats (int): Warm runs per case
+        isolated (bool): Run each case in a fresh process
+        progress (callable): Called with each finished record
+
+    Returns:
+        list[dict]: One record per case
+    """
+    results = []
+    pool = None
+    if isolated:
+        # One task per child: every case starts from a fresh interpreter
+        pool = multiprocessing.get_context("spawn").Pool(processes=1, maxtasksperchild=1)
+    try:
+        for case in cases:
+            if pool is not None:
+                record = pool.apply(run_case, (case, shots, repeats))
+            else:
+                record = run_case(case, shots, repeats)
+            results.append(record)
+            if progress is not None:
+                progress(record)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    return results
+
+
+def _print_progress(record):
+    """Print a one-line summary of a finished case to stderr"""
+    if record.get("error") and "cold_seconds" not in record:
+        print(f"{record['name']:<40} ERROR {record['error']}", file=sys.stderr)
+        return
+    warm = record.get("warm_seconds", {}).get("median")
+    warm_text = f"{warm * 1000:9.1f} ms" if warm is not None else "        -"
+    print(
+        f"{record['name']:<40} cold {record['cold_seconds'] * 1000:9.1f} ms | warm {warm_text} | "
+        f"transpile {record['cold_transpile_seconds'] * 1000:8.1f} ms | "
+        f"simulate {record['cold_simulate_seconds'] * 1000:8.1f} ms | peak RSS {record['peak_rss_mb'] or 0:7.1f} MiB",
+        file=sys.stderr
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the quantum circuit simulator")
+    parser.add_argument("--families", nargs="*", default=list(CIRCUIT_FAMILIES), choices=list(CIRCUIT_FAMILIES),
+                        help="Circuit families to scale (default: all)")
+    parser.add_argument("--qubits", nargs="*", type=int, default=DEFAULT_QUBITS, help="Qubit counts for each family")
+    parser.add_argument("--shots", type=int, default=DEFAULT_SHOTS, help="Shots per circuit family run")
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS, help="Warm runs per case")
+    parser.add_argument("--no-examples", action="store_true", help="Skip the predefined example modules")
+    parser.add_argument("--in-process", action="store_true",
+                        help="Run all cases in this process (faster, but cold runs and peak RSS are less meaningful)")
+    parser.add_argument("--output", help="Write the JSON results to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    # Benchmarks measure simulation, never the result or distribution caches
+    os.environ["QUANTUM_RESULT_CACHE"] = "0"
+    os.environ["QUANTUM_RESAMPLE_MAX_QUBITS"] = "0"
+
+    cases = build_cases(args.families, args.qubits, include_examples=not args.no_examples)
+    results = run_benchmarks(cases, args.shots, args.repeats, isolated=not args.in_process, progress=_print_progress)
+
+    report = {
+        "environment": environment_info(),
+        "settings": {
+            "families": args.families,
+            "qubits": args.qubits,
+            "shots": args.shots,
+            "repeats": args.repeats,
+            "isolated": not args.in_process,
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2, default=str)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0 if not any(record["error"] for record in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,11 +2,9 @@
 Create new module tab component for the Quantum Circuit Simulator.
 """
 import streamlit as st
-import io
-import sys
-from qiskit import QuantumCircuit
-from utils.simulator import save_user_applications, run_with_simulator # Import the simulator function
-from utils.ui import display_success_message, display_error_message, display_terminal_output
+from datetime import datetime
+from utils.ui import display_success_message, display_error_message, save_user_application
+from components.job_status import render_module_job, is_job_running, current_session_id
 
 def render_create_module_tab(user_applications, templates):
     """Render the Create New Module tab"""
@@ -51,16 +49,16 @@ def render_create_module_tab(user_applications, templates):
                 user_applications[edit_name]["code"] = edit_code
                 user_applications[edit_name]["last_modified"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
                 
-                save_user_applications(user_applications)
-                
-                # Show success message with futuristic styling
-                display_success_message(
-                    "MODULE UPDATED SUCCESSFULLY",
-                    "All changes have been saved to quantum storage"
-                )
-                
-                st.session_state.editing_app = False
-                st.experimental_rerun()
+                # Writes only this module's row (renames replace the old row, never another module)
+                if save_user_application(edit_name, user_applications[edit_name], old_name=st.session_state.edit_app_name):
+                    # Show success message with futuristic styling
+                    display_success_message(
+                        "MODULE UPDATED SUCCESSFULLY",
+                        "All changes have been saved to quantum storage"
+                    )
+                    
+                    st.session_state.editing_app = False
+                    st.experimental_rerun()
         with col2:
             if st.button("❌ CANCEL", key="cancel_edit", help="Discard changes"):
                 st.session_state.editing_app = False
@@ -196,7 +194,8 @@ print(counts)
                         "code": new_app_code,
                         "created": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
                     }
-                    save_result = save_user_applications(user_applications)
+                    # Another session may have taken the name since the page was drawn
+                    save_result = save_user_application(new_app_name, user_applications[new_app_name], create=True)
                     if save_result:
                         # Show success with futuristic styling
                         display_success_message(
@@ -211,29 +210,19 @@ print(counts)
         
         with col2:
             if st.button("▶ TEST EXECUTE", key="test_run", help="Execute this quantum module"):
-                try:
-                    # Redirect stdout to capture print output
-                    old_stdout = sys.stdout
-                    redirected_output = io.StringIO()
-                    sys.stdout = redirected_output
-
-                    # Execute the new application code
-                    exec(new_app_code)
-
-                    # Retrieve and display output
-                    output = redirected_output.getvalue()
-                    
-                    # Show success with futuristic styling
-                    display_success_message(
-                        "TEST EXECUTION SUCCESSFUL",
-                        "Module executed in test environment | Status: OPTIMAL"
+                if is_job_running("test_run_job"):
+                    # Don't pile up runs while the previous one is still executing
+                    st.info("A module is already executing. Please wait for it to finish.")
+                else:
+                    # Execute the new application code in the background
+                    from utils.executor import submit_module
+                    st.session_state.test_run_job = submit_module(
+                        new_app_code, label=new_app_name or "test module", session=current_session_id()
                     )
-                    
-                    # Output in a terminal-like display
-                    display_terminal_output(output)
-                except Exception as e:
-                    # Show error with futuristic styling
-                    display_error_message("EXECUTION ERROR DETECTED", str(e))
-                finally:
-                    # Reset stdout
-                    sys.stdout = old_stdout
+        
+        # Show progress while the module runs, then its output
+        render_module_job(
+            "test_run_job",
+            "TEST EXECUTION SUCCESSFUL",
+            "Module executed in test environment | Status: OPTIMAL"
+        )
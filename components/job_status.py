@@ -0,0 +1,156 @@
+"""
+Background job status component for the Quantum Circuit Simulator.
+"""
+import time
+import streamlit as st
+from datetime import datetime
+from utils.timing import add_phase, write_trace
+from utils.ui import display_success_message, display_error_message, display_terminal_output, display_timing_breakdown
+from utils.ui import new_terminal_view, update_terminal_view, display_terminal_view
+
+# Seconds between status refreshes while a job is running
+JOB_POLL_INTERVAL = 0.5
+
+
+def _poll_fragment(func):
+    """Rerun only this part of the page periodically, when Streamlit supports fragments (used while a job runs)"""
+    fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+    if fragment is None:
+        return func
+    return fragment(run_every=JOB_POLL_INTERVAL)(func)
+
+
+def current_session_id():
+    """Return the id of the Streamlit session running this script, used as its scheduler queue"""
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+    except ImportError:
+        return None
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else None
+
+
+def is_job_running(job_key):
+    """Return True if the job stored under job_key has not finished yet"""
+    future = st.session_state.get(job_key)
+    return future is not None and not future.done()
+
+
+def display_job_progress(status):
+    """Display a progress indicator for a queued or running job"""
+    from utils.executor import QUEUED
+    state = status["state"]
+    label = "WAITING FOR A FREE EXECUTION SLOT" if state == QUEUED else "MODULE EXECUTING"
+    if status.get("cancel_requested"):
+        label = "CANCELLING"
+    details = f"STATUS: {state} | PRIORITY: {status.get('priority', 'NORMAL')}"
+    if status.get("position"):
+        details += f" | QUEUE POSITION: {status['position']}"
+    st.markdown(f"""
+    <div style="display: flex; align-items: center; background-color: #1a1a2e; color: #00ffcc; padding: 10px;
+         border-radius: 5px; border-left: 5px solid #00ffcc; margin: 10px 0;">
+        <div style="width: 20px; height: 20px; border-radius: 50%; border: 3px solid transparent;
+             border-top-color: #00ffcc; animation: spin 1s linear infinite; margin-right: 10px;"></div>
+        <span style="font-family: 'Courier New', monospace;">{label} | {details} | ELAPSED: {status['elapsed']:.1f}s</span>
+    </div>
+    <style>
+        @keyframes spin {{
+            0% {{ transform: rotate(0deg); }}
+            100% {{ transform: rotate(360deg); }}
+        }}
+    </style>
+    """, unsafe_allow_html=True)
+
+
+def display_live_output(job_key, future, stream):
+    """Show what a running module has printed so far, processing only the new lines on each poll"""
+    if stream is None:
+        return
+    view_key = f"{job_key}_terminal"
+    view = st.session_state.get(view_key)
+    if view is None or view.get("job") != id(future):
+        view = new_terminal_view()
+        view["job"] = id(future)
+        st.session_state[view_key] = view
+    update_terminal_view(view, stream)
+    if view["seq"] or view["partial"]:
+        display_terminal_view(view, title="LIVE OUTPUT")
+
+
+def display_cancel_button(job_key, future, status):
+    """Show a CANCEL button that stops the job (and its worker process) when pressed"""
+    from utils.executor import cancel_job
+    if st.button("CANCEL", key=f"{job_key}_cancel", disabled=status.get("cancel_requested", False)):
+        cancel_job(future)
+
+
+def render_module_job(job_key, success_message, success_details, output_field="stdout"):
+    """
+    Render the status or result of the module job stored in st.session_state[job_key]
+
+    Args:
+        job_key (str): Session state key holding the job's Future
+        success_message (str): Title shown when the module finished successfully
+        success_details (str): Details line; ``{time}`` is replaced by the finish time
+        output_field (str): Which field of the module result to show ("stdout" or "output")
+    """
+    def job_panel(future):
+        # Only imported once a job exists, keeping the first paint free of qiskit
+        from utils.executor import get_job_status, get_job_output, QUEUED, RUNNING, CANCELLED
+        status = get_job_status(future)
+        if status["state"] in (QUEUED, RUNNING):
+            display_job_progress(status)
+            display_cancel_button(job_key, future, status)
+            display_live_output(job_key, future, get_job_output(future))
+            return
+
+        if status["state"] == CANCELLED:
+            display_error_message("EXECUTION CANCELLED", f"Stopped after {status['elapsed']:.1f}s")
+            display_live_output(job_key, future, get_job_output(future))
+            return
+
+        try:
+            result = future.result()
+        except Exception as e:
+            display_error_message("EXECUTION ERROR DETECTED", str(e))
+            # Whatever the module printed before it failed (or was stopped) helps to find out why
+            display_live_output(job_key, future, get_job_output(future))
+            return
+
+        finished_at = datetime.fromtimestamp(status["finished_at"] or datetime.now().timestamp())
+        display_success_message(success_message, success_details.format(time=finished_at.strftime('%H:%M:%S')))
+
+        output_column, timing_column = st.columns([3, 1])
+        with output_column:
+            wall_start = time.perf_counter()
+            cpu_start = time.process_time()
+            display_terminal_output(str(result[output_field]), from_cache=result.get("from_cache", False))
+            render_wall = time.perf_counter() - wall_start
+            render_cpu = time.process_time() - cpu_start
+
+        timings = result.get("timings")
+        if timings is not None and not timings.get("logged"):
+            # The panel reruns while it is shown; only the first render is recorded and logged
+            add_phase(timings, "render", render_wall, render_cpu)
+            write_trace(timings)
+            timings["logged"] = True
+        with timing_column:
+            display_timing_breakdown(timings)
+
+    future = st.session_state.get(job_key)
+    if future is None:
+        return
+    if future.done():
+        # A finished job does not change any more, so it is rendered once per script run
+        job_panel(future)
+        return
+
+    @_poll_fragment
+    def polling_job_panel():
+        current = st.session_state.get(job_key)
+        if current is None or current.done():
+            # Stop polling: the full rerun renders the finished job statically
+            st.rerun()
+        job_panel(current)
+
+    polling_job_panel()
@@ -2,16 +2,15 @@
 Predefined modules tab component for the Quantum Circuit Simulator.
 """
 import streamlit as st
-import io
 import sys
-from datetime import datetime
 import os
 
 # Add the project root directory to the Python path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from utils.ui import display_success_message, display_error_message, display_terminal_output
-from utils.simulator import run_with_simulator
+from components.job_status import render_module_job, is_job_running, current_session_id
+from utils.circuit_index import circuit_index
+from utils.ui import format_complexity
 
 def render_predefined_tab(examples):
     """Render the Predefined Modules tab"""
@@ -25,6 +24,9 @@ def render_predefined_tab(examples):
     if 'selected_predefined_example' not in st.session_state:
         st.session_state.selected_predefined_example = None
     
+    # Real cost data from the circuit index; unindexed modules are queued in the background
+    index_entries = circuit_index.lookup(examples)
+    
     # Display examples as clickable cards in a 2-column grid
     for i, (example_name, example_code) in enumerate(examples.items()):
         col_idx = i % 2
@@ -40,7 +42,7 @@ def render_predefined_tab(examples):
                 <p style="color: #00ffcc99;">MODULE TYPE: {description}</p>
                 <div style="display: flex; justify-content: space-between; align-items: center;">
                     <div style="width: 50px; height: 10px; background: linear-gradient(90deg, #00ffcc, transparent); border-radius: 5px;"></div>
-                    <div style="font-size: 0.8em; color: #00ffcc80;">COMPLEXITY: {'●' * min(5, (i + 1) // 2)}{'○' * (5 - min(5, (i + 1) // 2))}</div>
+                    <div style="font-size: 0.8em; color: #00ffcc80;">{format_complexity(index_entries.get(example_name))}</div>
                 </div>
             </div>
             """
@@ -84,53 +86,21 @@ def render_predefined_tab(examples):
             # Add a run button with futuristic styling
             if st.button("▶ EXECUTE QUANTUM MODULE", key="run_predefined", 
                        help="Run the selected quantum circuit example"):
-                try:
-                    # Ensure compatibility with the latest Qiskit version
-                    from qiskit import transpile
-                    from qiskit_aer import AerSimulator
-                    from utils.simulator import global_simulator
-                    
-                    # Create a local namespace to execute the code
-                    local_namespace = {
-                        'run_with_simulator': run_with_simulator,
-                        'transpile': transpile,
-                        'AerSimulator': AerSimulator,
-                        'global_simulator': global_simulator
-                    }
-                    
-                    # Execute the example code to generate the quantum circuit
-                    exec(examples[selected_example], globals(), local_namespace)
-                    
-                    # Display the output captured during execution
-                    
-                    # Get the result from the local namespace (the example code should store its result there)
-                    if 'counts' in local_namespace:
-                        # Most examples store results directly in a 'counts' variable
-                        output = local_namespace['counts']
-                    elif 'result' in local_namespace:
-                        result = local_namespace['result']
-                        output = result.get_counts() if hasattr(result, 'get_counts') else str(result)
-                    elif 'circuit' in local_namespace:
-                        # If no result is present but a circuit is, run it with the simulator
-                        circuit = local_namespace['circuit']
-                        output = run_with_simulator(circuit)
-                    elif 'qc' in local_namespace:
-                        # If there's a quantum circuit called 'qc', run it
-                        qc = local_namespace['qc']
-                        output = run_with_simulator(qc)
-                    else:
-                        output = "Execution completed, but no result or circuit was returned."
-                        
-                    display_success_message(
-                        "EXECUTION SUCCESSFUL", 
-                        f"Module executed at {datetime.now().strftime('%H:%M:%S')} | System status: OPTIMAL"
+                if is_job_running("predefined_job"):
+                    # Don't pile up runs while the previous one is still executing
+                    st.info("A module is already executing. Please wait for it to finish.")
+                else:
+                    # Execute the example code in the background so the page stays responsive
+                    # (the execution layer, with qiskit and qiskit_aer, is imported on first use)
+                    from utils.executor import submit_module
+                    st.session_state.predefined_job = submit_module(
+                        examples[selected_example], label=selected_example, session=current_session_id()
                     )
 
-                    # Output results in a terminal-like display
-                    display_terminal_output(str(output))
-                except Exception as e:
-                    # Display error with robotic styling
-                    display_error_message("EXECUTION ERROR DETECTED", str(e))
-                finally:
-                    # Save the current stdout before redirecting it
-                    old_stdout = sys.stdout
+            # Show progress while the module runs, then its results
+            render_module_job(
+                "predefined_job",
+                "EXECUTION SUCCESSFUL",
+                "Module executed at {time} | System status: OPTIMAL",
+                output_field="output"
+            )
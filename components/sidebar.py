@@ -0,0 +1,27 @@
+"""
+Sidebar component for the Quantum Circuit Simulator.
+"""
+import streamlit as st
+
+def render_sidebar():
+    """
+    Render the sidebar with the QASM uploader and simulation settings
+
+    Returns:
+        int: Number of shots selected in the sidebar
+    """
+    # Add a sidebar for user interaction
+    st.sidebar.title("Quantum Circuit Simulator Sidebar")
+
+    # File uploader for quantum circuits
+    uploaded_file = st.sidebar.file_uploader("Upload a Quantum Circuit (QASM format)", type=["qasm"])
+    if uploaded_file is not None:
+        st.sidebar.success("File uploaded successfully!")
+        # Placeholder for processing the uploaded file
+        st.write("Uploaded file content:")
+        st.code(uploaded_file.getvalue().decode("utf-8"))
+
+    # Settings configuration
+    shots = st.sidebar.number_input("Number of Shots", min_value=1, max_value=10000, value=1024)
+    st.sidebar.write(f"Current shots: {shots}")
+    return shots
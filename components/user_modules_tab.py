@@ -2,11 +2,8 @@
 User modules tab component for the Quantum Circuit Simulator.
 """
 import streamlit as st
-import io
-import sys
-from datetime import datetime
-from utils.ui import display_success_message, display_error_message, display_terminal_output
-from utils.simulator import save_user_applications
+from utils.ui import remove_user_application
+from components.job_status import render_module_job, is_job_running, current_session_id
 
 def render_user_modules_tab(user_applications):
     """Render the User Modules tab"""
@@ -70,31 +67,16 @@ def render_user_modules_tab(user_applications):
             
             with actions_col1:
                 if st.button("▶ EXECUTE", key="run_user_app", help="Run this quantum module"):
-                    try:
-                        # Redirect stdout to capture print output
-                        old_stdout = sys.stdout
-                        redirected_output = io.StringIO()
-                        sys.stdout = redirected_output
-
-                        # Execute the selected user application
-                        exec(user_applications[selected_user_app]["code"])
-
-                        # Retrieve and display output
-                        output = redirected_output.getvalue()
-                        
-                        # Display success with robotic styling
-                        display_success_message(
-                            "EXECUTION SUCCESSFUL", 
-                            f"Module executed at {datetime.now().strftime('%H:%M:%S')} | Runtime: OPTIMAL"
+                    if is_job_running("user_app_job"):
+                        # Don't pile up runs while the previous one is still executing
+                        st.info("A module is already executing. Please wait for it to finish.")
+                    else:
+                        # Execute the selected user application in the background
+                        from utils.executor import submit_module
+                        st.session_state.user_app_job = submit_module(
+                            user_applications[selected_user_app]["code"], label=selected_user_app,
+                            session=current_session_id()
                         )
-                        
-                        # Output in a terminal-like display
-                        display_terminal_output(output)
-                    except Exception as e:
-                        display_error_message("EXECUTION ERROR DETECTED", str(e))
-                    finally:
-                        # Reset stdout
-                        sys.stdout = old_stdout
             
             with actions_col2:
                 if st.button("✏️ MODIFY", key="edit_user_app", help="Edit this quantum module"):
@@ -116,7 +98,7 @@ def render_user_modules_tab(user_applications):
                     with confirm_col1:
                         if st.button("CONFIRM DELETE", key="confirm_delete"):
                             user_applications.pop(selected_user_app)
-                            save_user_applications(user_applications)
+                            remove_user_application(selected_user_app)
                             st.session_state.selected_user_app = None
                             st.success(f"Module '{selected_user_app}' deleted successfully!")
                             st.experimental_rerun()
@@ -124,6 +106,13 @@ def render_user_modules_tab(user_applications):
                         if st.button("CANCEL", key="cancel_delete"):
                             st.experimental_rerun()
             
+            # Show progress while the module runs, then its output
+            render_module_job(
+                "user_app_job",
+                "EXECUTION SUCCESSFUL",
+                "Module executed at {time} | Runtime: OPTIMAL"
+            )
+            
             # Display code in a futuristic terminal-like area
             st.markdown("<h4>MODULE SOURCE CODE</h4>", unsafe_allow_html=True)
             st.code(user_applications[selected_user_app]["code"], language="python")
@@ -2,52 +2,85 @@
 3D Visualization component for the Quantum Circuit Simulator apps.
 """
 import streamlit as st
-import plotly.graph_objects as go
-import numpy as np
+from utils.rerun_cache import cached_data
+from utils.circuit_index import circuit_index
 
-def create_3d_app_visualization(predefined_apps, user_apps):
+def _index_hover(entry):
+    """Return the hover lines describing a module's circuit index entry"""
+    if entry is None:
+        return "<br>Circuit metadata: pending"
+    if not entry.get('circuits'):
+        return f"<br>Circuit metadata: {entry.get('error') or 'no circuits found'}"
+    gates = ", ".join(f"{name}: {count}" for name, count in sorted(entry['gates'].items(), key=lambda item: -item[1])[:6])
+    return (
+        f"<br>Qubits: {entry['qubits']} | Depth: {entry['depth']}"
+        f"<br>Gates: {entry['gate_count']} ({entry['two_qubit_gates']} two-qubit)"
+        f"<br>Clifford: {'yes' if entry['clifford'] else 'no'}"
+        f"<br>{gates}"
+    )
+
+def create_3d_app_visualization(predefined_apps, user_apps, predefined_metadata=None, user_metadata=None):
     """
     Generates an interactive 3D scatter plot of available applications.
 
+    Modules found in the circuit index are placed by qubit count, two-qubit
+    gate count and depth; the others sit at the origin until they are indexed.
+
     Args:
         predefined_apps (dict): Dictionary of predefined example applications.
         user_apps (dict): Dictionary of user-created applications.
+        predefined_metadata (dict): Circuit index entries of the predefined applications, by name.
+        user_metadata (dict): Circuit index entries of the user applications, by name.
 
     Returns:
         plotly.graph_objects.Figure: A Plotly figure object for the 3D visualization.
     """
+    # Imported here so only pages that show the visualizer load plotly
+    import plotly.graph_objects as go
+    from utils.circuit_index import complexity_rating
+
+    predefined_metadata = predefined_metadata or {}
+    user_metadata = user_metadata or {}
+
     app_names = []
     x_coords = []
     y_coords = []
     z_coords = []
+    sizes = []
     colors = []
     symbols = []
     texts = []
 
-    # Process predefined apps
-    for i, (name, _) in enumerate(predefined_apps.items()):
+    def place(name, entry, color, symbol, text):
         app_names.append(name)
-        # Simple positioning logic (can be made more sophisticated)
-        x_coords.append(np.cos(i * np.pi / 6) * (i + 1))
-        y_coords.append(np.sin(i * np.pi / 6) * (i + 1))
-        z_coords.append(i * 0.5) # Spread them out vertically
-        colors.append('#00ffcc') # Predefined color
-        symbols.append('circle')
-        texts.append(f"<b>{name}</b><br>Type: Predefined")
+        rating = complexity_rating(entry)
+        if rating is not None:
+            x_coords.append(entry['qubits'])
+            y_coords.append(entry['two_qubit_gates'])
+            z_coords.append(entry['depth'])
+            symbols.append(symbol)
+        else:
+            # Not indexed (yet): show it at the origin with an open marker
+            x_coords.append(0)
+            y_coords.append(0)
+            z_coords.append(0)
+            symbols.append(f"{symbol}-open")
+        sizes.append(8 + 2 * (rating or 0))
+        colors.append(color)
+        texts.append(text + _index_hover(entry))
+
+    # Process predefined apps
+    for name in predefined_apps:
+        place(name, predefined_metadata.get(name), '#00ffcc', 'circle', f"<b>{name}</b><br>Type: Predefined")
 
     # Process user apps
-    offset = len(predefined_apps)
-    for i, (name, data) in enumerate(user_apps.items()):
-        app_names.append(name)
-        # Position user apps differently
-        x_coords.append(np.cos((i + offset) * np.pi / 4 + np.pi/2) * (i + 1) * 1.5)
-        y_coords.append(np.sin((i + offset) * np.pi / 4 + np.pi/2) * (i + 1) * 1.5)
-        z_coords.append((i + offset) * 0.6) # Slightly different vertical spread
-        colors.append('#ff66ff') # User app color
-        symbols.append('diamond')
+    for name, data in user_apps.items():
         created = data.get('created', 'N/A')
         modified = data.get('last_modified', 'N/A')
-        texts.append(f"<b>{name}</b><br>Type: User Module<br>Created: {created}<br>Modified: {modified}")
+        place(
+            name, user_metadata.get(name), '#ff66ff', 'diamond',
+            f"<b>{name}</b><br>Type: User Module<br>Created: {created}<br>Modified: {modified}"
+        )
 
     # Create the 3D scatter plot
     fig = go.Figure(data=[go.Scatter3d(
@@ -56,7 +89,7 @@ def create_3d_app_visualization(predefined_apps, user_apps):
         z=z_coords,
         mode='markers+text',
         marker=dict(
-            size=10,
+            size=sizes,
             color=colors,
             symbol=symbols,
             opacity=0.8,
@@ -78,30 +111,27 @@ def create_3d_app_visualization(predefined_apps, user_apps):
         ),
         scene=dict(
             xaxis=dict(
-                title='X Dimension',
+                title=dict(text='Qubits', font=dict(color='#00ffcc')),
                 backgroundcolor="rgba(10, 10, 26, 0.8)", # Match app background
                 gridcolor="rgba(0, 255, 204, 0.3)",
                 showbackground=True,
                 zerolinecolor="rgba(0, 255, 204, 0.5)",
-                titlefont=dict(color='#00ffcc'),
                 tickfont=dict(color='#00ffcc')
             ),
             yaxis=dict(
-                title='Y Dimension',
+                title=dict(text='Two-Qubit Gates', font=dict(color='#00ffcc')),
                 backgroundcolor="rgba(10, 10, 26, 0.8)",
                 gridcolor="rgba(0, 255, 204, 0.3)",
                 showbackground=True,
                 zerolinecolor="rgba(0, 255, 204, 0.5)",
-                titlefont=dict(color='#00ffcc'),
                 tickfont=dict(color='#00ffcc')
             ),
             zaxis=dict(
-                title='Complexity/Index',
+                title=dict(text='Depth', font=dict(color='#00ffcc')),
                 backgroundcolor="rgba(10, 10, 26, 0.8)",
                 gridcolor="rgba(0, 255, 204, 0.3)",
                 showbackground=True,
                 zerolinecolor="rgba(0, 255, 204, 0.5)",
-                titlefont=dict(color='#00ffcc'),
                 tickfont=dict(color='#00ffcc')
             ),
             camera=dict(
@@ -116,6 +146,12 @@ def create_3d_app_visualization(predefined_apps, user_apps):
 
     return fig
 
+@cached_data("3d figure", max_entries=8)
+def build_3d_figure(predefined_names, user_entries, predefined_metadata, user_metadata):
+    """Build the 3D figure from module names, (name, created, last_modified) of user modules and their index entries"""
+    user_apps = {name: {'created': created, 'last_modified': modified} for name, created, modified in user_entries}
+    return create_3d_app_visualization(dict.fromkeys(predefined_names), user_apps, predefined_metadata, user_metadata)
+
 def render_3d_visualization_tab(predefined_apps, user_apps):
     """Renders the 3D visualization tab content."""
     st.markdown("<h2>3D APPLICATION VISUALIZER</h2>", unsafe_allow_html=True)
@@ -125,9 +161,16 @@ def render_3d_visualization_tab(predefined_apps, user_apps):
         st.warning("No applications found to visualize.")
         return
 
+    # Index entries are looked up, never computed here; missing ones are queued in the background
+    predefined_metadata = circuit_index.lookup(predefined_apps)
+    user_metadata = circuit_index.lookup({name: data.get('code', '') for name, data in user_apps.items()})
+
     # Generate and display the plot
-    fig = create_3d_app_visualization(predefined_apps, user_apps)
+    user_entries = tuple(
+        (name, data.get('created', 'N/A'), data.get('last_modified', 'N/A')) for name, data in user_apps.items()
+    )
+    fig = build_3d_figure(tuple(predefined_apps), user_entries, predefined_metadata, user_metadata)
     st.plotly_chart(fig, use_container_width=True)
 
-    st.markdown("<p style='color: #00ffcc99; font-size: 0.9em;'>Hint: Rotate the view by dragging. Zoom with scroll. Hover over points for details. Colors differentiate types: <span style='color:#00ffcc;'>● Predefined</span>, <span style='color:#ff66ff;'>♦ User Module</span>.</p>", unsafe_allow_html=True)
+    st.markdown("<p style='color: #00ffcc99; font-size: 0.9em;'>Hint: Rotate the view by dragging. Zoom with scroll. Points are placed by qubits, two-qubit gates and depth, sized by complexity; open markers are still being indexed. Colors differentiate types: <span style='color:#00ffcc;'>● Predefined</span>, <span style='color:#ff66ff;'>♦ User Module</span>.</p>", unsafe_allow_html=True)
 
@@ -147,8 +147,9 @@ print(counts)
     "10. Transverse Field Ising Model Hamiltonian": """
 import numpy as np
 from qiskit import QuantumCircuit
+from qiskit.circuit import ParameterVector
 # from qiskit.opflow import X, Z, I # Deprecated
-from qiskit.quantum_info import SparsePauliOp # Use new module
+from qiskit.quantum_info import SparsePauliOp, Statevector # Use new module
 from qiskit.algorithms.minimum_eigensolvers import VQE, NumPyMinimumEigensolver # Updated import path
 from qiskit.algorithms.optimizers import COBYLA
 # from qiskit.utils import QuantumInstance # Deprecated and often replaced by primitives or specific simulator backends
@@ -220,6 +221,7 @@ print("\\nSetting up VQE (Variational Quantum Eigensolver)...")
 # Create a simple parameterized circuit as the ansatz
 def create_ansatz(num_qubits, depth=2):
     qc = QuantumCircuit(num_qubits)
+    theta = ParameterVector('θ', 2 * depth * num_qubits)
     
     # Initial state: superposition
     for i in range(num_qubits):
@@ -233,8 +235,8 @@ def create_ansatz(num_qubits, depth=2):
         
         # Rotation gates (parameterized)
         for i in range(num_qubits):
-            qc.rx(0.1, i)  # Initial parameter value
-            qc.rz(0.1, i)  # Initial parameter value
+            qc.rx(theta[2 * (d * num_qubits + i)], i)
+            qc.rz(theta[2 * (d * num_qubits + i) + 1], i)
     
     return qc
 
@@ -242,6 +244,15 @@ def create_ansatz(num_qubits, depth=2):
 ansatz = create_ansatz(num_qubits)
 print(f"Created ansatz circuit with {ansatz.num_parameters} parameters")
 
+# Initial parameter values (the rotation angles the ansatz used to have built
+# in); add measurements to scan many parameter sets in one job with run_sweep
+initial_point = np.full(ansatz.num_parameters, 0.1)
+
+# Energy of the ansatz at the initial point, where VQE would start its optimization
+initial_state = Statevector(ansatz.assign_parameters(initial_point))
+initial_energy = initial_state.expectation_value(hamiltonian).real
+print(f"Energy at the initial point: {initial_energy:.6f}")
+
 # Demonstrating how to set up VQE
 print("\\nNote: Full VQE would run hundreds of iterations to estimate the ground state.")
 print("For demonstration, we're just showing the setup procedure.")
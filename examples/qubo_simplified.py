@@ -106,9 +106,12 @@ def create_hamiltonian(h, J):
     hamiltonian_op = SparsePauliOp.from_list(hamiltonian_terms)
     return hamiltonian_op
 
-def create_simple_quantum_circuit(n_qubits):
+def create_simple_quantum_circuit(n_qubits, theta=np.pi/4):
     """
     Create a simple parameterized quantum circuit for the QUBO problem
+
+    Pass a qiskit Parameter as theta to get an unbound circuit that can be
+    scanned over many angles in one job with utils.simulator.run_sweep.
     """
     circuit = QuantumCircuit(n_qubits)
     
@@ -118,7 +121,7 @@ def create_simple_quantum_circuit(n_qubits):
     
     # Add some parameterized rotation gates
     for i in range(n_qubits):
-        circuit.rx(np.pi/4, i)
+        circuit.rx(theta, i)
     
     # Add some entanglement
     for i in range(n_qubits-1):
@@ -9,27 +9,23 @@ st.set_page_config(
 )
 
 # Import necessary libraries and modules
-from qiskit import QuantumCircuit, transpile
-from qiskit_aer import AerSimulator
-import io
-import sys
-import json
-import os
-import base64
-import numpy as np
-from datetime import datetime
+# (qiskit and qiskit_aer are imported on first execution, see utils/preload.py)
 
 # Import tab components
-from components.predefined_tab import render_predefined_tab
-from components.user_modules_tab import render_user_modules_tab
 from components.create_module_tab import render_create_module_tab
-from components.visualization_3d import render_3d_visualization_tab # Import the new 3D tab component
+from components.job_status import render_module_job, is_job_running, current_session_id
+from components.sidebar import render_sidebar
 
 # Import examples and utilities
 from examples.examples import examples
-from utils.simulator import load_user_applications, save_user_applications, run_with_simulator # Ensure run_with_simulator is imported if needed globally or passed around
-from utils.ui import display_success_message, display_error_message, display_terminal_output
-from utils.simulator import global_simulator
+from utils.ui import load_user_applications
+from utils.ui import format_complexity
+from utils.circuit_index import circuit_index
+from utils.preload import preload_simulation_core
+from utils.rerun_cache import begin_rerun, render_cache_metrics
+
+# Start this rerun's cache metrics
+begin_rerun()
 
 # Custom CSS for robotic/futuristic styling
 st.markdown("""
@@ -153,6 +149,9 @@ st.markdown(get_robot_animation(), unsafe_allow_html=True)
 st.markdown("<h1 style='text-align: center; margin-bottom: 0;'>QUANTUM AI CIRCUIT INTERFACE</h1>", unsafe_allow_html=True)
 st.markdown("<p style='text-align: center; margin-bottom: 30px; color: #00ffcc99;'>SELECT QUANTUM MODULE TO INITIATE SIMULATION SEQUENCE</p>", unsafe_allow_html=True)
 
+# Sidebar with the QASM uploader and simulation settings
+render_sidebar()
+
 # Initialize session state for new application creation
 if 'creating_new_app' not in st.session_state:
     st.session_state.creating_new_app = False
@@ -237,10 +236,8 @@ if 'selected_circuit' not in st.session_state:
     st.session_state.selected_circuit = None
 if 'selected_circuit_type' not in st.session_state:
     st.session_state.selected_circuit_type = None
-if 'circuit_results' not in st.session_state:
-    st.session_state.circuit_results = None
-if 'show_run_details' not in st.session_state:
-    st.session_state.show_run_details = False
+if 'circuit_job' not in st.session_state:
+    st.session_state.circuit_job = None
 
 # Left side - Circuit selection boxes
 with left_section:
@@ -253,6 +250,9 @@ with left_section:
         # Display predefined circuit boxes
         st.markdown("<p style='color: #00ffcc99;'>Click on a circuit to view and run it</p>", unsafe_allow_html=True)
         
+        # Real cost data from the circuit index; unindexed modules are queued in the background
+        index_entries = circuit_index.lookup(examples)
+        
         # Create 3 columns for the boxes
         if len(examples) > 0:
             # Calculate number of rows needed
@@ -276,7 +276,7 @@ with left_section:
                                 <h3 style="margin-top:0; font-size: 1em;">{example_name}</h3>
                                 <div style="display: flex; justify-content: space-between; align-items: center;">
                                     <div style="width: 50px; height: 10px; background: linear-gradient(90deg, #00ffcc, transparent); border-radius: 5px;"></div>
-                                    <div style="font-size: 0.8em; color: #00ffcc80;">COMPLEXITY: {'●' * min(5, (idx + 1) // 2)}{'○' * (5 - min(5, (idx + 1) // 2))}</div>
+                                    <div style="font-size: 0.8em; color: #00ffcc80;">{format_complexity(index_entries.get(example_name))}</div>
                                 </div>
                             </div>
                             """
@@ -286,8 +286,7 @@ with left_section:
                             if st.button(f"SELECT", key=f"select_example_{idx}"):
                                 st.session_state.selected_circuit = example_name
                                 st.session_state.selected_circuit_type = "predefined"
-                                st.session_state.show_run_details = False
-                                st.session_state.circuit_results = None
+                                st.session_state.circuit_job = None
                                 st.rerun()
     
     with circ_tab2:
@@ -325,8 +324,7 @@ with left_section:
                             if st.button(f"SELECT", key=f"select_user_app_{idx}"):
                                 st.session_state.selected_circuit = app_name
                                 st.session_state.selected_circuit_type = "user"
-                                st.session_state.show_run_details = False
-                                st.session_state.circuit_results = None
+                                st.session_state.circuit_job = None
                                 st.rerun()
         else:
             st.info("No user circuits available. Create a new circuit from the menu below.")
@@ -366,58 +364,24 @@ with right_section:
         
         # Add a run button with futuristic styling
         if st.button("▶ EXECUTE QUANTUM CIRCUIT", key="run_circuit"):
-            try:
-                # Prepare to execute the code
-                from qiskit import transpile
-                from qiskit_aer import AerSimulator
-                from utils.simulator import global_simulator
-                
-                # Create a local namespace to execute the code
-                local_namespace = {
-                    'run_with_simulator': run_with_simulator,
-                    'transpile': transpile,
-                    'AerSimulator': AerSimulator,
-                    'global_simulator': global_simulator
-                }
-                
-                # Execute the code
-                exec(circuit_code, globals(), local_namespace)
-                
-                # Get the result from the local namespace
-                if 'counts' in local_namespace:
-                    output = local_namespace['counts']
-                elif 'result' in local_namespace:
-                    result = local_namespace['result']
-                    output = result.get_counts() if hasattr(result, 'get_counts') else str(result)
-                elif 'circuit' in local_namespace:
-                    circuit = local_namespace['circuit']
-                    output = run_with_simulator(circuit)
-                elif 'qc' in local_namespace:
-                    qc = local_namespace['qc']
-                    output = run_with_simulator(qc)
-                else:
-                    output = "Execution completed, but no result or circuit was returned."
-                
-                st.session_state.circuit_results = str(output)
-                st.session_state.show_run_details = True
-                
-                display_success_message(
-                    "EXECUTION SUCCESSFUL", 
-                    f"Circuit executed at {datetime.now().strftime('%H:%M:%S')} | Status: OPTIMAL"
+            if is_job_running("circuit_job"):
+                # Don't pile up runs while the previous one is still executing
+                st.info("A circuit is already executing. Please wait for it to finish.")
+            else:
+                # Execute the code in the background with the headless core, like
+                # the tabs do (imported on first execution)
+                from quantum_core import submit_module
+                st.session_state.circuit_job = submit_module(
+                    circuit_code, label=selected_name, session=current_session_id()
                 )
-                
-                # Display the results
-                st.markdown("<h4>EXECUTION RESULTS</h4>", unsafe_allow_html=True)
-                display_terminal_output(str(output))
-                
-            except Exception as e:
-                # Display error with robotic styling
-                display_error_message("EXECUTION ERROR DETECTED", str(e))
-        
-        # Show previous results if available
-        if st.session_state.show_run_details and st.session_state.circuit_results:
-            st.markdown("<h4>PREVIOUS EXECUTION RESULTS</h4>", unsafe_allow_html=True)
-            display_terminal_output(st.session_state.circuit_results)
+
+        # Show progress while the circuit runs, then its results
+        render_module_job(
+            "circuit_job",
+            "EXECUTION SUCCESSFUL",
+            "Circuit executed at {time} | Status: OPTIMAL",
+            output_field="output"
+        )
     else:
         # Show default message when no circuit is selected
         st.markdown("""
@@ -429,4 +393,10 @@ with right_section:
         """, unsafe_allow_html=True)
 
 # Footer or other common elements can go here
+
+# Time saved by the rerun caches
+render_cache_metrics()
+
+# Load qiskit and the simulator in the background now that the page is painted
+preload_simulation_core()
 st.markdown("---<br><p style='text-align: center; color: #00ffcc80;'>Quantum AI Interface v1.0 | System Status: Nominal</p>", unsafe_allow_html=True)
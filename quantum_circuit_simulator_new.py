@@ -4,13 +4,15 @@ Quantum Circuit Simulator - Main Application
 import streamlit as st
 
 # Import utility modules
-from utils.simulator import load_user_applications
-from utils.ui import configure_page_style, render_app_header
+from utils.ui import configure_page_style, render_app_header, load_user_applications
+from utils.preload import preload_simulation_core
+from utils.rerun_cache import begin_rerun, render_cache_metrics
 
 # Import component modules
 from components.predefined_tab import render_predefined_tab
 from components.user_modules_tab import render_user_modules_tab
 from components.create_module_tab import render_create_module_tab
+from components.sidebar import render_sidebar
 
 # Import examples and templates
 from examples.examples import examples
@@ -18,11 +20,17 @@ from templates.templates import templates
 
 def main():
     """Main application entry point"""
+    # Start this rerun's cache metrics
+    begin_rerun()
+
     # Configure page styling
     configure_page_style()
     
     # Display application header with robot animation
     render_app_header()
+
+    # Sidebar with the QASM uploader and simulation settings
+    render_sidebar()
     
     # Initialize session state for application state management
     if 'creating_new_app' not in st.session_state:
@@ -53,5 +61,11 @@ def main():
     with tab3:
         render_create_module_tab(user_applications, templates)
 
+    # Time saved by the rerun caches
+    render_cache_metrics()
+
+    # Load qiskit and the simulator in the background now that the page is painted
+    preload_simulation_core()
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,80 @@
+"""
+Headless simulation core of the Quantum Circuit Simulator.
+
+Everything here works without Streamlit, so workers, command-line tools,
+batch jobs and tests can run circuits and modules without importing the UI.
+The Streamlit entry points are thin wrappers around this API.
+
+Simulation:
+    simulate, run_with_simulator, run_many, run_sweep, get_simulator, CompactCounts
+
+Module execution:
+    execute_module, submit_module, get_job_status, get_job_output, cancel_job, build_module_namespace,
+    ModuleExecutionError, ModuleCancelledError, ModuleTimeoutError, ModuleMemoryError
+
+User application storage:
+    read_user_applications, write_user_applications, get_user_application,
+    create_user_application, upsert_user_application, rename_user_application, delete_user_application,
+    find_user_applications, get_application_history, StorageError
+
+Batch runs of the module library (JSON Lines output):
+    python -m quantum_core.batch --help
+
+Local HTTP/JSON execution service (submit, status, result, cancel):
+    python -m quantum_core.service --help
+
+Example:
+    >>> from qiskit import QuantumCircuit
+    >>> from quantum_core import run_with_simulator
+    >>> qc = QuantumCircuit(2, 2)
+    >>> qc.h(0); qc.cx(0, 1); qc.measure([0, 1], [0, 1])
+    >>> counts = run_with_simulator(qc, shots=1000, seed_simulator=1)
+"""
+from utils.simulator import simulate, run_with_simulator, run_many, run_sweep, get_simulator
+from utils.compact_counts import CompactCounts
+from utils.executor import execute_module, submit_module, get_job_status, get_job_output, cancel_job
+from utils.executor import build_module_namespace
+from utils.workers import ModuleExecutionError, ModuleCancelledError, ModuleTimeoutError, ModuleMemoryError
+from utils.storage import (
+    read_user_applications,
+    write_user_applications,
+    get_user_application,
+    create_user_application,
+    upsert_user_application,
+    rename_user_application,
+    delete_user_application,
+    find_user_applications,
+    get_application_history,
+    StorageError,
+    ApplicationExistsError,
+)
+
+__all__ = [
+    "simulate",
+    "run_with_simulator",
+    "run_many",
+    "run_sweep",
+    "get_simulator",
+    "CompactCounts",
+    "execute_module",
+    "submit_module",
+    "get_job_status",
+    "get_job_output",
+    "cancel_job",
+    "build_module_namespace",
+    "ModuleExecutionError",
+    "ModuleCancelledError",
+    "ModuleTimeoutError",
+    "ModuleMemoryError",
+    "read_user_applications",
+    "write_user_applications",
+    "get_user_application",
+    "create_user_application",
+    "upsert_user_application",
+    "rename_user_application",
+    "delete_user_application",
+    "find_user_applications",
+    "get_application_history",
+    "StorageError",
+    "ApplicationExistsError",
+]
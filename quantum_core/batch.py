@@ -0,0 +1,188 @@
+"""
+Headless batch runner for the Quantum Circuit Simulator.
+
+Runs the predefined example modules and the modules in the user application
+store without the Streamlit interface, in parallel across a pool of worker
+processes, and writes one JSON record per module (JSON Lines). Modules run
+exactly as the EXECUTE buttons run them: same namespace, same result lookup
+(``counts``, ``result``, ``circuit`` or ``qc``), same time and memory limits.
+
+Usage:
+    python -m quantum_core.batch --workers 8 --timeout 120 --output results.jsonl
+    python -m quantum_core.batch --no-examples --name "VQE*" --name "QAOA*"
+"""
+import argparse
+import fnmatch
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Module sources that can be selected
+SOURCES = ("examples", "user")
+
+
+def collect_modules(sources=SOURCES, patterns=None):
+    """
+    List the modules to run
+
+    Args:
+        sources (iterable): "examples" for examples.examples, "user" for the user application store
+        patterns (list[str]): Shell-style name patterns; a module runs if it matches any (default: all)
+
+    Returns:
+        list[dict]: ``source``, ``name`` and ``code`` of each module, examples first
+    """
+    modules = []
+    if "examples" in sources:
+        from examples.examples import examples
+        modules.extend({"source": "examples", "name": name, "code": code} for name, code in examples.items())
+    if "user" in sources:
+        from utils.storage import read_user_applications
+        modules.extend(
+            {"source": "user", "name": name, "code": data.get("code", "")}
+            for name, data in read_user_applications().items()
+        )
+    if patterns:
+        modules = [module for module in modules if any(fnmatch.fnmatch(module["name"], pattern) for pattern in patterns)]
+    return modules
+
+
+def jsonable_output(output):
+    """Return a module result as JSON data: counts as a dict, anything else as text"""
+    if hasattr(output, "to_dict"):
+        output = output.to_dict()
+    if isinstance(output, dict):
+        return {str(key): value.item() if hasattr(value, "item") else value for key, value in output.items()}
+    return str(output)
+
+
+def run_module(module, pool, timeout=None, memory_mb=None, aer_threads=None):
+    """
+    Run one module in the worker pool and build its record
+
+    Args:
+        module (dict): Entry of collect_modules
+        pool (WorkerPool): Worker processes to run in
+        timeout (float): Seconds the module may run (None for QUANTUM_MODULE_TIMEOUT)
+        memory_mb (int): Memory ceiling of the worker (None for QUANTUM_MODULE_MEMORY_MB)
+        aer_threads (int): Aer threads per simulation
+
+    Returns:
+        dict: ``source``, ``name``, ``status`` (ok, error, timeout or memory), ``counts``,
+        ``stdout``, ``timings``, ``wall_seconds`` and ``error``
+    """
+    from utils.output_stream import OutputStream
+    from utils.timing import summarize
+    from utils.workers import run_module_in_worker, ModuleExecutionError, ModuleTimeoutError, ModuleMemoryError
+
+    record = {
+        "source": module["source"], "name": module["name"], "status": "ok", "counts": None,
+        "stdout": "", "from_cache": False, "timings": None, "wall_seconds": None, "error": None
+    }
+    stream = OutputStream()
+    start = time.perf_counter()
+    try:
+        result = run_module_in_worker(
+            module["code"], label=module["name"], stream=stream, aer_threads=aer_threads,
+            timeout=timeout, memory_mb=memory_mb, pool=pool
+        )
+    except ModuleExecutionError as e:
+        if isinstance(e, ModuleTimeoutError):
+            record["status"] = "timeout"
+        elif isinstance(e, ModuleMemoryError):
+            record["status"] = "memory"
+        else:
+            record["status"] = "error"
+        record["error"] = str(e)
+        # Output printed before the failure, as far as it was forwarded
+        stream.finish()
+        record["stdout"] = stream.getvalue()
+    else:
+        record["counts"] = jsonable_output(result["output"])
+        record["stdout"] = result["stdout"]
+        record["from_cache"] = result["from_cache"]
+        record["timings"] = summarize(result["timings"]) if result["timings"] else None
+    record["wall_seconds"] = time.perf_counter() - start
+    return record
+
+
+def run_batch(modules, workers=None, timeout=None, memory_mb=None, on_record=None):
+    """
+    Run modules in parallel across a pool of worker processes
+
+    Args:
+        modules (list[dict]): Output of collect_modules
+        workers (int): Worker processes (default: one per core, at most one per module)
+        timeout (float): Seconds each module may run (None for QUANTUM_MODULE_TIMEOUT)
+        memory_mb (int): Memory ceiling of each worker (None for QUANTUM_MODULE_MEMORY_MB)
+        on_record (callable): Called with each record as its module finishes (from one thread at a time)
+
+    Returns:
+        list[dict]: One record per module, in the order of ``modules``
+    """
+    from utils.workers import WorkerPool
+
+    if not modules:
+        return []
+    workers = max(1, min(workers or os.cpu_count() or 1, len(modules)))
+    # Concurrent modules share the cores instead of each starting a full set of Aer threads
+    aer_threads = max(1, (os.cpu_count() or 1) // workers)
+
+    pool = WorkerPool(workers)
+    record_lock = threading.Lock()
+
+    def run(module):
+        record = run_module(module, pool, timeout, memory_mb, aer_threads)
+        if on_record is not None:
+            with record_lock:
+                on_record(record)
+        return record
+
+    try:
+        # One thread per worker process; each waits on the module its worker runs
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="quantum-batch") as threads:
+            return list(threads.map(run, modules))
+    finally:
+        pool.shutdown()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the module library headlessly and write JSON Lines results")
+    parser.add_argument("--no-examples", action="store_true", help="Skip the predefined example modules")
+    parser.add_argument("--no-user", action="store_true", help="Skip the user application store")
+    parser.add_argument("--name", action="append", dest="patterns",
+                        help="Only run modules whose name matches this shell pattern (repeatable)")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: one per core)")
+    parser.add_argument("--timeout", type=float, help="Seconds each module may run (0 for no limit)")
+    parser.add_argument("--memory-mb", type=int, help="Memory ceiling of each worker in MB (0 for no limit)")
+    parser.add_argument("--output", help="Write the records to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    sources = [source for source, skip in zip(SOURCES, (args.no_examples, args.no_user)) if not skip]
+    modules = collect_modules(sources, args.patterns)
+    print(f"Running {len(modules)} modules", file=sys.stderr)
+
+    output = open(args.output, "w") if args.output else sys.stdout
+
+    def write_record(record):
+        output.write(json.dumps(record, default=str) + "\n")
+        output.flush()
+        print(f"{record['source']:<8} {record['name']:<40} {record['status']:<7} {record['wall_seconds']:8.2f} s",
+              file=sys.stderr)
+
+    try:
+        records = run_batch(modules, args.workers, args.timeout, args.memory_mb, on_record=write_record)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    failed = sum(1 for record in records if record["status"] != "ok")
+    print(f"{len(records) - failed} succeeded, {failed} failed", file=sys.stderr)
+    return 0 if not failed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
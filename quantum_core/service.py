@@ -0,0 +1,508 @@
+"""
+Local HTTP/JSON execution service for the Quantum Circuit Simulator.
+
+Lets other tools submit circuits (as OpenQASM) and module code to the same
+engine the Streamlit interface uses: jobs go through the same fair scheduler,
+and modules and circuits run in the same warm worker pool with the same time
+and memory limits, so they can be cancelled mid-run.
+
+Endpoints (all bodies are JSON):
+    POST   /jobs                 Submit a job, or several as {"jobs": [...]}
+                                 {"kind": "circuit", "qasm": "...", "shots": 1024, "seed": 7}
+                                 {"kind": "module", "code": "...", "label": "my module"}
+    GET    /jobs/<id>            Status of a job
+    GET    /jobs/<id>/result     Result of a job; ?wait=<seconds> waits for it to finish
+    DELETE /jobs/<id>            Cancel a job (POST /jobs/<id>/cancel works too)
+    GET    /health               Scheduler statistics
+
+Circuit jobs with the same shot count that arrive within BATCH_WINDOW seconds
+of each other are simulated as one run_many job; if that job fails, each of
+its circuits is rerun on its own, so one bad circuit only fails its own job.
+Connections are kept alive (HTTP/1.1), so a client can submit and poll over
+one connection.
+
+Usage:
+    python -m quantum_core.service --port 8765
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, InvalidStateError, wait as wait_futures
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = int(os.environ.get("QUANTUM_SERVICE_PORT", "8765"))
+
+# Seconds circuit submissions are collected before they are simulated together
+BATCH_WINDOW = float(os.environ.get("QUANTUM_SERVICE_BATCH_WINDOW", "0.02"))
+
+# Largest number of circuits simulated as one batch
+MAX_BATCH_SIZE = int(os.environ.get("QUANTUM_SERVICE_MAX_BATCH", "64"))
+
+# Jobs remembered for status and result requests; the oldest are forgotten first
+MAX_JOBS = int(os.environ.get("QUANTUM_SERVICE_MAX_JOBS", "10000"))
+
+# Largest accepted request body, in bytes
+MAX_BODY_BYTES = 10 * 1024 * 1024
+
+# Longest a result request may wait for its job, in seconds
+MAX_WAIT_SECONDS = 60.0
+
+# Job states (the same names the executor reports)
+QUEUED = "QUEUED"
+RUNNING = "RUNNING"
+DONE = "DONE"
+FAILED = "FAILED"
+CANCELLED = "CANCELLED"
+
+
+class RequestError(Exception):
+    """A request the service rejects, with the HTTP status to answer with"""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def parse_circuit(qasm):
+    """
+    Build a QuantumCircuit from OpenQASM 2 or 3 source
+
+    Raises:
+        RequestError: If the source does not parse
+    """
+    from qiskit import qasm2, qasm3
+
+    try:
+        if qasm.lstrip().startswith("OPENQASM 3"):
+            return qasm3.loads(qasm)
+        return qasm2.loads(qasm, custom_instructions=qasm2.LEGACY_CUSTOM_INSTRUCTIONS)
+    except Exception as e:
+        raise RequestError(f"Invalid QASM: {e}")
+
+
+class _CircuitRequest:
+    """A circuit waiting to be simulated as part of a batch"""
+
+    def __init__(self, circuit, shots, session):
+        self.circuit = circuit
+        self.shots = shots
+        self.session = session
+        self.future = Future()
+        self.batch_future = None
+        self.batch = ()
+
+
+class CircuitBatcher:
+    """
+    Collect circuit submissions and simulate those with the same shot count as one job
+
+    One run_many job is much cheaper than one job per circuit (one transpile
+    pass, and Aer parallelizes across the experiments of a job).
+    """
+
+    def __init__(self, window=BATCH_WINDOW, max_batch=MAX_BATCH_SIZE):
+        self.window = window
+        self.max_batch = max_batch
+        self._pending = []
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="quantum-service-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, circuit, shots, session=None):
+        """Queue a circuit; returns its _CircuitRequest, whose future resolves to the counts"""
+        request = _CircuitRequest(circuit, shots, session)
+        with self._condition:
+            self._pending.append(request)
+            self._condition.notify()
+        return request
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._pending:
+                    self._condition.wait()
+            # Give other submissions the batch window to arrive
+            time.sleep(self.window)
+            with self._condition:
+                pending, self._pending = self._pending, []
+
+            groups = {}
+            for request in pending:
+                if not request.future.cancelled():
+                    groups.setdefault((request.shots, request.session), []).append(request)
+            for (shots, session), requests in groups.items():
+                for start in range(0, len(requests), self.max_batch):
+                    self._dispatch(requests[start:start + self.max_batch], shots, session)
+
+    def _dispatch(self, requests, shots, session):
+        from utils.executor import run_many_async
+        from utils.workers import ModuleCancelledError
+
+        batch_future = run_many_async([request.circuit for request in requests], shots=shots, session=session)
+        for request in requests:
+            request.batch_future = batch_future
+            request.batch = requests
+
+        def distribute(done_future):
+            cancelled = done_future.cancelled() or isinstance(done_future.exception(), ModuleCancelledError)
+            error = done_future.exception() if not cancelled else None
+            if error is not None and len(requests) > 1:
+                # Find out which circuit failed the batch: each is rerun as a batch of its own
+                for request in requests:
+                    if not request.future.cancelled():
+                        self._dispatch([request], shots, session)
+                return
+            for index, request in enumerate(requests):
+                try:
+                    if cancelled:
+                        request.future.cancel()
+                    elif error is not None:
+                        request.future.set_exception(error)
+                    else:
+                        request.future.set_result(done_future.result()[index])
+                except InvalidStateError:
+                    # Cancelled by its client while the batch ran
+                    pass
+
+        batch_future.add_done_callback(distribute)
+
+
+class JobRegistry:
+    """Jobs submitted to the service, by id, with bounded retention"""
+
+    def __init__(self, max_jobs=MAX_JOBS):
+        self.max_jobs = max_jobs
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, job):
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._jobs[job_id] = job
+            while len(self._jobs) > self.max_jobs:
+                self._jobs.popitem(last=False)
+        return job_id
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None:
+            raise RequestError(f"Unknown job {job_id}", status=404)
+        return job
+
+
+class ExecutionService:
+    """Submits, tracks and cancels the circuit and module jobs of the HTTP service"""
+
+    def __init__(self):
+        self.jobs = JobRegistry()
+        self.batcher = CircuitBatcher()
+
+    def _validate(self, spec):
+        """
+        Check a request body and parse its circuit, without submitting anything
+
+        Returns:
+            dict: The spec, with the parsed ``circuit`` of a circuit job and the default shot count filled in
+
+        Raises:
+            RequestError: If the spec is not a valid job
+        """
+        if not isinstance(spec, dict):
+            raise RequestError("A job must be a JSON object")
+        kind = spec.get("kind", "circuit")
+        shots = spec.get("shots", 1024)
+        # bool is a subclass of int, but true is not a shot count
+        if not isinstance(shots, int) or isinstance(shots, bool) or shots < 1:
+            raise RequestError("shots must be a positive integer")
+
+        job = {"kind": kind, "shots": shots}
+        if kind == "circuit":
+            if not isinstance(spec.get("qasm"), str):
+                raise RequestError("A circuit job needs its OpenQASM source in 'qasm'")
+            seed = spec.get("seed")
+            if seed is not None and (not isinstance(seed, int) or isinstance(seed, bool)):
+                raise RequestError("seed must be an integer")
+            job.update(circuit=parse_circuit(spec["qasm"]), seed=seed)
+        elif kind == "module":
+            if not isinstance(spec.get("code"), str):
+                raise RequestError("A module job needs its Python source in 'code'")
+            job.update(code=spec["code"], label=str(spec.get("label", "module")))
+        else:
+            raise RequestError(f"Unknown job kind {kind!r} (expected 'circuit' or 'module')")
+        return job
+
+    def submit(self, spec, session=None):
+        """
+        Submit one job described by a request body
+
+        Returns:
+            dict: ``id``, ``kind`` and ``state`` of the new job
+        """
+        return self.submit_many([spec], session)[0]
+
+    def submit_many(self, specs, session=None):
+        """
+        Submit several jobs; nothing is submitted unless every spec is valid
+
+        Returns:
+            list[dict]: ``id``, ``kind`` and ``state`` of each new job
+        """
+        validated = [self._validate(spec) for spec in specs]
+        return [self._start(job, session) for job in validated]
+
+    def _start(self, spec, session):
+        """Submit a validated job and register it"""
+        kind = spec["kind"]
+        if kind == "circuit" and spec["seed"] is None:
+            job = {"kind": kind, "request": self.batcher.submit(spec["circuit"], spec["shots"], session)}
+        elif kind == "circuit":
+            # Seeded runs must be reproducible on their own, so they are not batched
+            from utils.executor import run_with_simulator_async
+            job = {
+                "kind": kind,
+                "future": run_with_simulator_async(
+                    spec["circuit"], shots=spec["shots"], session=session, seed_simulator=spec["seed"]
+                )
+            }
+        else:
+            from utils.executor import submit_module
+            job = {"kind": kind, "future": submit_module(spec["code"], label=spec["label"], session=session)}
+
+        job["submitted_at"] = time.time()
+        job["finished_at"] = None
+        self._future(job).add_done_callback(lambda _: job.update(finished_at=time.time()))
+        job_id = self.jobs.add(job)
+        return {"id": job_id, "kind": kind, "state": self.status(job_id)["state"]}
+
+    def _future(self, job):
+        """Return the future whose result is the job's result"""
+        return job["request"].future if "request" in job else job["future"]
+
+    def status(self, job_id):
+        """Return the state of a job (QUEUED, RUNNING, DONE, FAILED or CANCELLED)"""
+        from utils.executor import get_job_status
+
+        job = self.jobs.get(job_id)
+        future = self._future(job)
+        status = {"state": QUEUED}
+        if "request" not in job:
+            status.update(get_job_status(future))
+        elif future.cancelled():
+            status["state"] = CANCELLED
+        elif future.done():
+            status["state"] = FAILED if future.exception() is not None else DONE
+        else:
+            # A circuit still collecting its batch stays QUEUED until the batch is submitted
+            if job["request"].batch_future is not None:
+                status.update(get_job_status(job["request"].batch_future))
+            status["label"] = job["request"].circuit.name
+        status.update(
+            id=job_id, kind=job["kind"], elapsed=(job["finished_at"] or time.time()) - job["submitted_at"]
+        )
+        status.pop("submitted_at", None)
+        status.pop("finished_at", None)
+        status.pop("started_at", None)
+        return status
+
+    def result(self, job_id, wait=0.0):
+        """
+        Return the result of a job, waiting up to ``wait`` seconds for it to finish
+
+        Raises:
+            RequestError: 409 if the job has not finished in time
+        """
+        from quantum_core.batch import jsonable_output
+        from utils.timing import summarize
+
+        job = self.jobs.get(job_id)
+        future = self._future(job)
+        if wait > 0:
+            wait_futures([future], timeout=min(wait, MAX_WAIT_SECONDS))
+        if not future.done():
+            raise RequestError(f"Job {job_id} has not finished", status=409)
+
+        result = {"id": job_id, "kind": job["kind"], "state": self.status(job_id)["state"]}
+        if future.cancelled():
+            return result
+        error = future.exception()
+        if error is not None:
+            result["error"] = f"{type(error).__name__}: {error}"
+            return result
+        value = future.result()
+        if job["kind"] == "circuit":
+            result["counts"] = jsonable_output(value)
+        else:
+            result["counts"] = jsonable_output(value["output"])
+            result["stdout"] = value["stdout"]
+            result["from_cache"] = value["from_cache"]
+            result["timings"] = summarize(value["timings"]) if value["timings"] else None
+        return result
+
+    def cancel(self, job_id):
+        """Cancel a job; returns its state afterwards"""
+        from utils.executor import cancel_job
+
+        job = self.jobs.get(job_id)
+        if "request" in job:
+            request = job["request"]
+            request.future.cancel()
+            batch_future = request.batch_future
+            # The batch only stops when none of its circuits are wanted any more
+            if batch_future is not None and all(other.future.cancelled() for other in request.batch):
+                cancel_job(batch_future)
+        else:
+            cancel_job(job["future"])
+        return self.status(job_id)
+
+
+class ServiceRequestHandler(BaseHTTPRequestHandler):
+    """JSON request handler of the execution service (HTTP/1.1 with keep-alive)"""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "QuantumExecutionService/1.0"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send_json(self, status, body):
+        data = json.dumps(body, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _read_body(self):
+        """Read the request body of any method, so the connection stays usable for the next request"""
+        header = self.headers.get("Content-Length")
+        if header is None and self.headers.get("Transfer-Encoding"):
+            # Chunked bodies are not supported; the unread body would corrupt the connection
+            self.close_connection = True
+            raise RequestError("Content-Length required", status=411)
+        try:
+            length = int(header or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.close_connection = True
+            raise RequestError(f"Invalid Content-Length {header!r}")
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+            raise RequestError("Request body too large", status=413)
+        return self.rfile.read(length) if length else b""
+
+    def _read_json(self, raw):
+        try:
+            return json.loads(raw or b"{}")
+        except ValueError as e:
+            raise RequestError(f"Invalid JSON: {e}")
+
+    def _session(self):
+        # Each client gets its own scheduler queue, so one busy tool cannot starve the others
+        return f"http:{self.headers.get('X-Client-Id') or self.client_address[0]}"
+
+    def _handle(self, method):
+        url = urlsplit(self.path)
+        parts = [part for part in url.path.split("/") if part]
+        query = parse_qs(url.query)
+        service = self.server.service
+        try:
+            # Bodies are always read (and ignored for GET/DELETE), so the connection
+            # stays usable for the next request
+            raw = self._read_body()
+            body = self._read_json(raw) if method in ("POST", "PUT") else None
+            if parts == ["health"] and method == "GET":
+                from utils.executor import get_scheduler_stats
+                return self._send_json(200, {"status": "ok", "scheduler": get_scheduler_stats()})
+            if parts == ["jobs"] and method == "POST":
+                if isinstance(body, dict) and "jobs" in body:
+                    if not isinstance(body["jobs"], list):
+                        raise RequestError("'jobs' must be a list")
+                    return self._send_json(202, {"jobs": service.submit_many(body["jobs"], self._session())})
+                return self._send_json(202, service.submit(body, self._session()))
+            if len(parts) == 2 and parts[0] == "jobs":
+                if method == "GET":
+                    return self._send_json(200, service.status(parts[1]))
+                if method == "DELETE":
+                    return self._send_json(200, service.cancel(parts[1]))
+            if len(parts) == 3 and parts[0] == "jobs":
+                if parts[2] == "result" and method == "GET":
+                    try:
+                        wait = float(query.get("wait", ["0"])[0])
+                    except ValueError:
+                        raise RequestError("wait must be a number of seconds")
+                    return self._send_json(200, service.result(parts[1], wait))
+                if parts[2] == "cancel" and method == "POST":
+                    return self._send_json(200, service.cancel(parts[1]))
+            raise RequestError(f"No endpoint {method} {url.path}", status=404)
+        except RequestError as e:
+            self._send_json(e.status, {"error": str(e)})
+        except Exception as e:
+            self._send_json(500, {"error": f"{type(e).__name__}: {e}"})
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_DELETE(self):
+        self._handle("DELETE")
+
+
+def create_server(host=DEFAULT_HOST, port=DEFAULT_PORT, verbose=False):
+    """
+    Create the HTTP server (call serve_forever() on it to start serving)
+
+    The simulation core is preloaded and the worker pool started in the
+    background, so the first requests do not pay for it.
+
+    Args:
+        host (str): Interface to listen on (the service has no authentication; keep it local)
+        port (int): Port to listen on (0 picks a free port)
+        verbose (bool): Log every request to stderr
+
+    Returns:
+        ThreadingHTTPServer: The server, with ``service`` holding its ExecutionService
+    """
+    from utils.preload import preload_simulation_core
+
+    server = ThreadingHTTPServer((host, port), ServiceRequestHandler)
+    server.daemon_threads = True
+    server.service = ExecutionService()
+    server.verbose = verbose
+    preload_simulation_core()
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the quantum circuit simulator over local HTTP/JSON")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="Interface to listen on (default: localhost only)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port to listen on")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args(argv)
+
+    server = create_server(args.host, args.port, args.verbose)
+    print(f"Serving on http://{server.server_address[0]}:{server.server_address[1]}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        from utils.workers import shutdown_pool
+        shutdown_pool()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,14 +9,7 @@ st.set_page_config(
 )
 
 # Import necessary libraries and modules
-from qiskit import QuantumCircuit, transpile
-from qiskit_aer import AerSimulator
-import io
-import sys
-import json
-import os
-import base64
-import numpy as np
+# (qiskit and qiskit_aer are imported on first execution, see utils/preload.py)
 from datetime import datetime
 
 # Import tab components
@@ -24,14 +17,19 @@ from components.predefined_tab import render_predefined_tab
 from components.user_modules_tab import render_user_modules_tab
 from components.create_module_tab import render_create_module_tab
 from components.visualization_3d import render_3d_visualization_tab
+from components.sidebar import render_sidebar
 
 # Import examples and utilities
 from examples.examples import examples
-from utils.simulator import load_user_applications, save_user_applications, run_with_simulator
 from utils.ui import display_success_message, display_error_message, display_terminal_output
-from utils.simulator import global_simulator
+from utils.ui import load_user_applications
+from utils.preload import preload_simulation_core
+from utils.rerun_cache import begin_rerun, render_cache_metrics
 from templates.templates import templates
 
+# Start this rerun's cache metrics
+begin_rerun()
+
 # Custom CSS for simplified but still attractive styling
 st.markdown("""
 <style>
@@ -255,6 +253,9 @@ with st.expander("📚 How to use this simulator"):
     Need help? Click the Help nav item for more detailed instructions.
     """)
 
+# Sidebar with the QASM uploader and simulation settings
+render_sidebar()
+
 # Initialize session state
 if 'creating_new_app' not in st.session_state:
     st.session_state.creating_new_app = False
@@ -341,3 +342,9 @@ with st.expander("Detailed Help & Documentation"):
 # Footer
 st.markdown("---")
 st.markdown("<p style='text-align: center; color: #00ffcc80;'>Quantum Circuit Simulator v1.1 | Simplified Interface</p>", unsafe_allow_html=True)
+
+# Time saved by the rerun caches
+render_cache_metrics()
+
+# Load qiskit and the simulator in the background now that the page is painted
+preload_simulation_core()
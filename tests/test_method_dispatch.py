@@ -0,0 +1,34 @@
+"""
+Tests for simulation method dispatch in the Quantum Circuit Simulator.
+"""
+from qiskit import QuantumCircuit
+from qiskit_aer.noise import NoiseModel, ReadoutError, amplitude_damping_error, depolarizing_error
+
+from utils.method_dispatch import analyze_circuit, estimate_costs, noise_is_clifford
+
+
+def _ghz(num_qubits):
+    circuit = QuantumCircuit(num_qubits, num_qubits)
+    circuit.h(0)
+    for qubit in range(num_qubits - 1):
+        circuit.cx(qubit, qubit + 1)
+    circuit.measure(range(num_qubits), range(num_qubits))
+    return circuit
+
+
+def test_pauli_noise_keeps_stabilizer():
+    noise_model = NoiseModel()
+    noise_model.add_all_qubit_quantum_error(depolarizing_error(0.05, 2), ["cx"])
+    noise_model.add_all_qubit_readout_error(ReadoutError([[0.9, 0.1], [0.1, 0.9]]))
+    assert noise_is_clifford(noise_model)
+    costs = estimate_costs(analyze_circuit(_ghz(12)), noisy=True, clifford_noise=True)
+    assert "stabilizer" in costs
+
+
+def test_kraus_noise_excludes_stabilizer():
+    noise_model = NoiseModel()
+    noise_model.add_all_qubit_quantum_error(amplitude_damping_error(0.05), ["h"])
+    assert not noise_is_clifford(noise_model)
+    costs = estimate_costs(analyze_circuit(_ghz(12)), noisy=True, clifford_noise=False)
+    assert "stabilizer" not in costs
+    assert costs
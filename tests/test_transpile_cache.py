@@ -0,0 +1,60 @@
+"""
+Regression tests for circuit fingerprints of the Quantum Circuit Simulator.
+"""
+from qiskit import QuantumCircuit, ClassicalRegister, QuantumRegister
+from qiskit.circuit.library import PauliEvolutionGate
+from qiskit.quantum_info import SparsePauliOp
+
+from utils.transpile_cache import circuit_fingerprint
+
+
+def _controlled_oracle_circuit(body):
+    oracle = QuantumCircuit(1, name="oracle")
+    if body == "x":
+        oracle.x(0)
+    else:
+        oracle.id(0)
+    qc = QuantumCircuit(2, 2)
+    qc.h(0)
+    qc.append(oracle.to_gate().control(1), [0, 1])
+    qc.measure([0, 1], [0, 1])
+    return qc
+
+
+def _evolution_circuit(pauli):
+    qc = QuantumCircuit(2, 2)
+    qc.h(0)
+    qc.append(PauliEvolutionGate(SparsePauliOp(pauli), 1.0), [0, 1])
+    qc.measure([0, 1], [0, 1])
+    return qc
+
+
+def test_controlled_gates_with_different_bodies_differ():
+    assert circuit_fingerprint(_controlled_oracle_circuit("id")) != circuit_fingerprint(_controlled_oracle_circuit("x"))
+
+
+def test_controlled_gates_with_the_same_body_match():
+    assert circuit_fingerprint(_controlled_oracle_circuit("x")) == circuit_fingerprint(_controlled_oracle_circuit("x"))
+
+
+def test_evolution_gates_with_different_operators_differ():
+    assert circuit_fingerprint(_evolution_circuit("XX")) != circuit_fingerprint(_evolution_circuit("ZZ"))
+
+
+def test_evolution_gates_with_different_coefficients_differ():
+    first = _evolution_circuit("XX")
+    second = QuantumCircuit(2, 2)
+    second.h(0)
+    second.append(PauliEvolutionGate(SparsePauliOp("XX", coeffs=[0.5]), 1.0), [0, 1])
+    second.measure([0, 1], [0, 1])
+    assert circuit_fingerprint(first) != circuit_fingerprint(second)
+
+
+def test_classical_register_layout_changes_the_fingerprint():
+    one_register = QuantumCircuit(QuantumRegister(2), ClassicalRegister(2, "c"))
+    two_registers = QuantumCircuit(QuantumRegister(2), ClassicalRegister(1, "a"), ClassicalRegister(1, "b"))
+    for qc in (one_register, two_registers):
+        qc.h(0)
+        qc.cx(0, 1)
+        qc.measure([0, 1], [0, 1])
+    assert circuit_fingerprint(one_register) != circuit_fingerprint(two_registers)
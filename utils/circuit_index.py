@@ -0,0 +1,450 @@
+"""
+Static circuit metadata index for the Quantum Circuit Simulator.
+
+The card grid, the 3D view and the scheduler need to know how expensive a
+module is without running it. Each module is executed once in a sandboxed
+worker process where run_with_simulator, run_many, run_sweep and the
+simulators' run only record the circuits they are given instead of
+simulating them; the worker is killed if the module outlives its time limit
+or memory ceiling. The index stores the qubit count, depth, gate histogram,
+two-qubit gate count and whether the circuits are Clifford-only, keyed by a
+hash of the module source. It is updated incrementally in the background
+whenever a module's source changes and is persisted between server restarts.
+"""
+import contextlib
+import hashlib
+import io
+import json
+import os
+import signal
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Bump when the recorded fields change so old entries are rebuilt
+INDEX_VERSION = 1
+
+# File the index is persisted to
+DEFAULT_INDEX_PATH = os.environ.get("QUANTUM_CIRCUIT_INDEX_PATH", os.path.join(".quantum_cache", "circuit_index.json"))
+
+# Set QUANTUM_CIRCUIT_INDEX=0 to never index modules in the background
+INDEXING_ENABLED = os.environ.get("QUANTUM_CIRCUIT_INDEX", "1") != "0"
+
+# Seconds a module may run in the sandbox before indexing gives up on it
+INDEX_TIMEOUT = float(os.environ.get("QUANTUM_CIRCUIT_INDEX_TIMEOUT", "30"))
+
+# Memory in MB the sandbox worker may use while indexing a module (0 disables the limit)
+INDEX_MEMORY_MB = int(os.environ.get("QUANTUM_CIRCUIT_INDEX_MEMORY_MB", "2048"))
+
+# Seconds the sandbox worker gets past INDEX_TIMEOUT before it is killed; the
+# timeout interrupts Python code, but not a long native call (e.g. transpile)
+KILL_AFTER_SECONDS = 5.0
+
+# Maximum number of entries kept; the oldest are dropped first
+DEFAULT_MAX_ENTRIES = 2048
+
+# Operations a stabilizer simulator can handle
+CLIFFORD_OPERATIONS = {
+    "id", "x", "y", "z", "h", "s", "sdg", "sx", "sxdg", "cx", "cy", "cz", "swap", "iswap", "dcx", "ecr",
+    "measure", "barrier", "reset", "delay",
+}
+
+# Operations that are not gates and are left out of the two-qubit gate count
+NON_GATE_OPERATIONS = {"measure", "barrier", "reset", "delay"}
+
+# Estimated costs at which the complexity rating goes up from 1 towards 5
+COMPLEXITY_THRESHOLDS = (1e4, 1e6, 1e8, 1e10)
+
+# Rounds of decomposition applied to reach standard gates
+_MAX_DECOMPOSE_REPS = 10
+
+
+class IndexingTimeout(BaseException):
+    """
+    Raised inside the sandbox when a module runs longer than the index timeout
+
+    A BaseException, so ``except Exception`` in module code cannot swallow it.
+    """
+
+
+def source_key(code):
+    """Return the index key of a module source"""
+    return hashlib.sha256(code.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+def _flatten(circuit):
+    """Decompose custom gates (oracles, library blocks) until only standard gates remain"""
+    from qiskit.circuit.library.standard_gates import get_standard_gate_name_mapping
+
+    standard = set(get_standard_gate_name_mapping()) | NON_GATE_OPERATIONS
+    for _ in range(_MAX_DECOMPOSE_REPS):
+        custom = {
+            instruction.operation.name for instruction in circuit.data
+            if instruction.operation.name not in standard and instruction.operation.definition is not None
+        }
+        if not custom:
+            break
+        circuit = circuit.decompose(gates_to_decompose=list(custom))
+    return circuit
+
+
+def circuit_metadata(circuit):
+    """
+    Describe the cost of one circuit
+
+    Args:
+        circuit (QuantumCircuit): The circuit to describe
+
+    Returns:
+        dict: ``qubits``, ``depth``, ``gates`` (histogram), ``gate_count``,
+        ``two_qubit_gates`` and ``clifford``
+    """
+    flat = _flatten(circuit)
+    gates = {name: int(count) for name, count in flat.count_ops().items()}
+    two_qubit_gates = sum(
+        1 for instruction in flat.data
+        if len(instruction.qubits) >= 2 and instruction.operation.name not in NON_GATE_OPERATIONS
+    )
+    return {
+        "qubits": flat.num_qubits,
+        "depth": flat.depth(),
+        "gates": gates,
+        "gate_count": sum(count for name, count in gates.items() if name not in NON_GATE_OPERATIONS),
+        "two_qubit_gates": two_qubit_gates,
+        "clifford": all(name in CLIFFORD_OPERATIONS for name in gates),
+    }
+
+
+def _summarize(circuits):
+    """Combine the metadata of a module's circuits into one index entry"""
+    entries = [circuit_metadata(circuit) for circuit in circuits]
+    gates = {}
+    for entry in entries:
+        for name, count in entry["gates"].items():
+            gates[name] = gates.get(name, 0) + count
+    return {
+        "circuits": len(entries),
+        "qubits": max((entry["qubits"] for entry in entries), default=0),
+        "depth": max((entry["depth"] for entry in entries), default=0),
+        "gates": gates,
+        "gate_count": sum(entry["gate_count"] for entry in entries),
+        "two_qubit_gates": sum(entry["two_qubit_gates"] for entry in entries),
+        "clifford": bool(entries) and all(entry["clifford"] for entry in entries),
+    }
+
+
+class _EmptyResult:
+    """Result of a run in the sandbox: no counts"""
+
+    def __init__(self, experiments):
+        self._experiments = experiments
+
+    def get_counts(self, experiment=None):
+        if experiment is None and self._experiments != 1:
+            return [{} for _ in range(self._experiments)]
+        return {}
+
+
+class _EmptyJob:
+    """Job of a run in the sandbox, already finished"""
+
+    def __init__(self, experiments):
+        self._result = _EmptyResult(experiments)
+
+    def result(self, *args, **kwargs):
+        return self._result
+
+
+def _recording_simulator_class(circuits):
+    """Return an AerSimulator subclass whose run only appends the circuits it is given"""
+    from qiskit_aer import AerSimulator
+
+    class RecordingSimulator(AerSimulator):
+        def run(self, run_input, *args, **kwargs):
+            batch = list(run_input) if isinstance(run_input, (list, tuple)) else [run_input]
+            circuits.extend(batch)
+            return _EmptyJob(len(batch))
+
+    return RecordingSimulator
+
+
+# Marks attributes _patched_modules added rather than replaced
+_MISSING = object()
+
+
+@contextlib.contextmanager
+def _patched_modules(replacements):
+    """
+    Replace simulator entry points on the modules module code imports them from
+
+    Module code may do ``from utils.simulator import run_with_simulator``
+    instead of using the namespace, which would bypass the recorders.
+    """
+    saved = []
+    for module_name in ("utils.simulator", "utils.executor", "quantum_core"):
+        module = sys.modules.get(module_name)
+        if module is None:
+            continue
+        for name, value in replacements.items():
+            if name in vars(module) or module_name == "utils.simulator":
+                saved.append((module, name, vars(module).get(name, _MISSING)))
+                setattr(module, name, value)
+    try:
+        yield
+    finally:
+        for module, name, value in reversed(saved):
+            if value is _MISSING:
+                delattr(module, name)
+            else:
+                setattr(module, name, value)
+
+
+def index_module_source(code, timeout=INDEX_TIMEOUT):
+    """
+    Build the index entry of a module (runs inside the sandbox worker)
+
+    The module runs in the usual namespace, except that run_with_simulator,
+    run_many, run_sweep and the run method of global_simulator and of any
+    AerSimulator the module creates record their circuits and return empty
+    counts.
+    Circuits left in the namespace (e.g. ``qc`` or ``circuit``) are recorded
+    too. Errors and timeouts are kept in the entry alongside whatever
+    circuits were recorded before them.
+
+    Args:
+        code (str): Python source of the module
+        timeout (float): Seconds the module may run
+
+    Returns:
+        dict: The index entry
+    """
+    import numpy as np
+    from qiskit import QuantumCircuit
+    from utils.code_cache import code_cache
+    from utils.executor import build_module_namespace
+    from utils.output_stream import capture_output
+
+    circuits = []
+
+    def record_run(circuit, *args, **kwargs):
+        circuits.append(circuit)
+        return {}
+
+    def record_many(batch, *args, **kwargs):
+        circuits.extend(batch)
+        return [{} for _ in batch]
+
+    def record_sweep(circuit, parameter_values, *args, **kwargs):
+        circuits.append(circuit)
+        grid_shape = np.shape(parameter_values)[:-1] or (1,)
+        results = np.empty(grid_shape, dtype=object)
+        results.fill({})
+        return results
+
+    recording_simulator = _recording_simulator_class(circuits)
+    replacements = {
+        "run_with_simulator": record_run,
+        "run_many": record_many,
+        "run_sweep": record_sweep,
+        "global_simulator": recording_simulator(),
+    }
+    namespace = build_module_namespace()
+    namespace.update(replacements, AerSimulator=recording_simulator)
+
+    def on_timeout(signum, frame):
+        raise IndexingTimeout(f"indexing timed out after {timeout:g} s")
+
+    # Tasks run in the worker's main thread, so an interval timer can interrupt them
+    use_alarm = hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread()
+    if use_alarm:
+        previous_handler = signal.signal(signal.SIGALRM, on_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+
+    error = None
+    start = time.perf_counter()
+    try:
+        with capture_output(io.StringIO()), _patched_modules(replacements):
+            compiled, _ = code_cache.compile(code)
+            exec(compiled, namespace)
+    except BaseException as e:
+        error = f"{type(e).__name__}: {e}"
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous_handler)
+    seconds = time.perf_counter() - start
+
+    recorded = {id(circuit) for circuit in circuits}
+    for name in ("circuit", "qc"):
+        value = namespace.get(name)
+        if isinstance(value, QuantumCircuit) and id(value) not in recorded:
+            circuits.append(value)
+            recorded.add(id(value))
+
+    entry = _summarize(circuits)
+    entry.update(error=error, seconds=seconds)
+    return entry
+
+
+def estimated_cost(entry):
+    """
+    Rough simulation cost of an indexed module, in amplitude-gate updates
+
+    Clifford-only modules are costed for a stabilizer simulator, everything
+    else for a dense statevector.
+
+    Returns:
+        float: The estimated cost, or None if the module has no indexed circuits
+    """
+    if not entry or not entry.get("circuits"):
+        return None
+    gate_count = max(entry["gate_count"], 1)
+    if entry["clifford"]:
+        return float(max(entry["qubits"], 1) ** 2 * gate_count)
+    return float(2 ** entry["qubits"] * gate_count)
+
+
+def complexity_rating(entry):
+    """
+    Map an indexed module to a 1-5 complexity rating
+
+    Returns:
+        int: The rating, or None if the module has no indexed circuits
+    """
+    cost = estimated_cost(entry)
+    if cost is None:
+        return None
+    return 1 + sum(cost >= threshold for threshold in COMPLEXITY_THRESHOLDS)
+
+
+class CircuitIndex:
+    """Persistent index of module circuit metadata, keyed by source hash"""
+
+    def __init__(self, path=DEFAULT_INDEX_PATH, max_entries=DEFAULT_MAX_ENTRIES, enabled=INDEXING_ENABLED):
+        self.path = path
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self._entries = None
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._pool = None
+        self._runner = None
+
+    def _load(self):
+        """Read the persisted index once (caller holds the lock)"""
+        if self._entries is not None:
+            return
+        try:
+            with open(self.path, "r") as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            entries = {}
+        self._entries = {
+            key: entry for key, entry in entries.items()
+            if isinstance(entry, dict) and entry.get("index_version") == INDEX_VERSION
+        }
+
+    def _save(self):
+        """Persist the index (caller holds the lock; best effort)"""
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            # Write to a temporary file first so readers never see a partial index
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self._entries, f)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
+
+    def _start(self):
+        """Start the sandbox worker and the thread that feeds it modules (caller holds the lock)"""
+        from utils.workers import WorkerPool
+
+        if self._pool is None:
+            self._pool = WorkerPool(1)
+            self._runner = ThreadPoolExecutor(max_workers=1, thread_name_prefix="quantum-index")
+        return self._runner
+
+    def _index(self, key, code):
+        """Index one module in the sandbox worker and store its entry (runs on the indexing thread)"""
+        from utils.workers import ModuleTimeoutError, ModuleMemoryError, ModuleExecutionError
+
+        try:
+            entry = self._pool.run(
+                (code, INDEX_TIMEOUT), timeout=INDEX_TIMEOUT + KILL_AFTER_SECONDS,
+                memory_mb=INDEX_MEMORY_MB, function=index_module_source
+            )
+        except (ModuleTimeoutError, ModuleMemoryError) as e:
+            # The worker was killed and replaced; record the module as failing so it is not retried
+            entry = _summarize([])
+            entry.update(error=str(e), seconds=None)
+        except ModuleExecutionError:
+            # The sandbox itself failed (e.g. the worker died): leave the
+            # module unindexed so a later lookup retries it
+            with self._lock:
+                self._pending.discard(key)
+            return
+
+        entry.update(key=key, index_version=INDEX_VERSION, indexed_at=time.time())
+        with self._lock:
+            self._pending.discard(key)
+            self._entries[key] = entry
+            while len(self._entries) > self.max_entries:
+                oldest = min(self._entries, key=lambda k: self._entries[k].get("indexed_at", 0))
+                del self._entries[oldest]
+            self._save()
+
+    def get(self, code):
+        """Return the index entry of a module source, or None if it is not indexed yet"""
+        with self._lock:
+            self._load()
+            return self._entries.get(source_key(code))
+
+    def lookup(self, modules, schedule=True):
+        """
+        Return the index entries of modules, scheduling any that are missing
+
+        Never runs module code in the calling thread, so it is safe to call
+        while rendering. Modules that are not indexed yet are left out of the
+        result and queued for the sandbox worker.
+
+        Args:
+            modules (dict): Module name -> source code
+            schedule (bool): Queue missing modules for indexing
+
+        Returns:
+            dict: Module name -> index entry, for the modules already indexed
+        """
+        found = {}
+        missing = {}
+        with self._lock:
+            self._load()
+            for name, code in modules.items():
+                key = source_key(code)
+                entry = self._entries.get(key)
+                if entry is not None:
+                    found[name] = entry
+                elif schedule and self.enabled and key not in self._pending:
+                    self._pending.add(key)
+                    missing[key] = code
+            runner = self._start() if missing else None
+
+        for key, code in missing.items():
+            runner.submit(self._index, key, code)
+        return found
+
+    def pending(self):
+        """Return the number of modules waiting to be indexed"""
+        with self._lock:
+            return len(self._pending)
+
+    def clear(self):
+        """Drop every entry, including the persisted index"""
+        with self._lock:
+            self._entries = {}
+            self._save()
+
+
+# Shared index used by the card grid, the 3D view and the scheduler
+circuit_index = CircuitIndex()
@@ -0,0 +1,195 @@
+"""
+Bytecode cache for module source in the Quantum Circuit Simulator.
+
+Every EXECUTE passes the module source to ``exec``, which parses and
+compiles it again. Compiled code objects are kept in an in-memory LRU keyed
+by a hash of the source, shared by all sessions of the process, and
+optionally written to disk as marshalled bytecode so worker processes and
+restarted servers skip the compile as well. The disk tier is off by default
+and holds at most ``QUANTUM_BYTECODE_CACHE_DISK_ENTRIES`` files.
+"""
+import hashlib
+import importlib.util
+import marshal
+import os
+import threading
+from collections import OrderedDict
+
+# Default number of code objects kept in memory
+DEFAULT_MAX_ENTRIES = 256
+
+# Directory of the on-disk tier (relative to the working directory, like the result cache)
+DEFAULT_CACHE_DIR = os.environ.get("QUANTUM_BYTECODE_CACHE_DIR", os.path.join(".quantum_cache", "bytecode"))
+
+# Set QUANTUM_BYTECODE_CACHE_DISK=1 to also write compiled modules to disk
+PERSIST_BYTECODE = os.environ.get("QUANTUM_BYTECODE_CACHE_DISK", "0") != "0"
+
+# Maximum number of marshalled files kept on disk (least recently used are removed first)
+DEFAULT_MAX_DISK_ENTRIES = int(os.environ.get("QUANTUM_BYTECODE_CACHE_DISK_ENTRIES", "1024"))
+
+# Filename compiled module code reports in tracebacks (the same as a plain exec of a string)
+MODULE_FILENAME = "<string>"
+
+
+class CodeCache:
+    """Two-tier (memory LRU + marshalled files) cache of compiled module code"""
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, cache_dir=DEFAULT_CACHE_DIR, persist=PERSIST_BYTECODE,
+                 max_disk_entries=DEFAULT_MAX_DISK_ENTRIES):
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        # Files on disk, counted on the first store (other processes may add more)
+        self._disk_entries = None
+        self.cache_dir = cache_dir
+        self.persist = persist
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def make_key(self, source):
+        """
+        Build the cache key of a module source
+
+        Marshalled bytecode is only valid for the interpreter that wrote it,
+        so the bytecode magic number is part of the key.
+        """
+        digest = hashlib.sha256(importlib.util.MAGIC_NUMBER)
+        digest.update(source.encode("utf-8", "surrogatepass"))
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.marshal")
+
+    def _remember(self, key, code):
+        """Store a code object in the memory tier (caller holds the lock)"""
+        self._entries[key] = code
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _load(self, key):
+        """Read a code object from the on-disk tier, or None"""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                code = marshal.load(f)
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        try:
+            # The modification time doubles as the last use for LRU eviction
+            os.utime(path)
+        except OSError:
+            pass
+        return code
+
+    def _disk_files(self):
+        """Return ``(mtime, path)`` of every marshalled file on disk"""
+        files = []
+        for root, _, names in os.walk(self.cache_dir):
+            for name in names:
+                if name.endswith(".marshal"):
+                    path = os.path.join(root, name)
+                    try:
+                        files.append((os.path.getmtime(path), path))
+                    except OSError:
+                        pass
+        return files
+
+    def _evict_disk(self):
+        """Remove the least recently used files beyond max_disk_entries and return how many are left"""
+        files = sorted(self._disk_files())
+        for _, path in files[:max(len(files) - self.max_disk_entries, 0)]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        return min(len(files), self.max_disk_entries)
+
+    def _store(self, key, code):
+        """Write a code object to the on-disk tier (best effort)"""
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write to a temporary file first so readers never see a partial entry
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                marshal.dump(code, f)
+            os.replace(tmp_path, path)
+        except OSError:
+            return
+
+        # Count the directory once, then rescan only when the limit is exceeded
+        with self._lock:
+            if self._disk_entries is None:
+                self._disk_entries = len(self._disk_files())
+            else:
+                self._disk_entries += 1
+            if self._disk_entries > self.max_disk_entries:
+                self._disk_entries = self._evict_disk()
+
+    def compile(self, source):
+        """
+        Compile module source, reusing a cached code object for the same source
+
+        Args:
+            source (str): Python source of the module
+
+        Returns:
+            tuple: ``(code, hit)`` where hit tells whether compiling was skipped
+
+        Raises:
+            SyntaxError: If the source does not compile (errors are not cached)
+        """
+        key = self.make_key(source)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                return self._entries[key], True
+
+        code = self._load(key) if self.persist else None
+        if code is not None:
+            with self._lock:
+                self.disk_hits += 1
+                self._remember(key, code)
+            return code, True
+
+        # Compile outside the lock so other sessions are not blocked
+        code = compile(source, MODULE_FILENAME, "exec")
+        with self._lock:
+            self.misses += 1
+            self._remember(key, code)
+        if self.persist:
+            self._store(key, code)
+        return code, False
+
+    def stats(self):
+        """Return hit/miss statistics for the cache"""
+        with self._lock:
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "persist": self.persist,
+            }
+
+    def clear(self, include_disk=False):
+        """Drop the memory tier, and optionally the on-disk tier"""
+        with self._lock:
+            self._entries.clear()
+            self.memory_hits = 0
+            self.disk_hits = 0
+            self.misses = 0
+            if include_disk:
+                self._disk_entries = None
+        if include_disk and os.path.isdir(self.cache_dir):
+            for _, path in self._disk_files():
+                os.remove(path)
+
+
+# Shared cache used by execute_module
+code_cache = CodeCache()
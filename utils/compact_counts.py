@@ -0,0 +1,201 @@
+"""
+Compact, array-backed measurement counts.
+
+Distinct outcomes are stored as bit-packed rows of a NumPy ``uint8`` array
+with a parallel array of counts, instead of a dict of Python bitstrings.
+Memory scales with the number of distinct outcomes, and marginalization,
+top-k and merging are vectorized. The legacy dict is only built on request.
+"""
+import numpy as np
+
+
+def _num_bytes(num_clbits):
+    return max(1, (num_clbits + 7) // 8)
+
+
+def _pack_int(value, num_bytes):
+    """Return an integer outcome as a little-endian uint8 row"""
+    return np.frombuffer(int(value).to_bytes(num_bytes, "little"), dtype=np.uint8)
+
+
+def pack_memory(memory, num_clbits):
+    """
+    Bit-pack per-shot memory (as returned with ``memory=True``)
+
+    Args:
+        memory (list[str]): Per-shot outcomes as hex ("0x5") or bitstrings ("101")
+        num_clbits (int): Number of classical bits
+
+    Returns:
+        numpy.ndarray: Array of shape (shots, ceil(num_clbits / 8)), little-endian bit order
+    """
+    num_bytes = _num_bytes(num_clbits)
+    packed = np.empty((len(memory), num_bytes), dtype=np.uint8)
+    for index, outcome in enumerate(memory):
+        value = int(outcome, 16) if outcome.startswith("0x") else int(outcome.replace(" ", ""), 2)
+        packed[index] = _pack_int(value, num_bytes)
+    return packed
+
+
+class CompactCounts:
+    """
+    Measurement counts backed by NumPy arrays
+
+    Attributes:
+        outcomes (numpy.ndarray): Distinct outcomes, shape (k, ceil(num_clbits / 8)),
+            bit i of a row (little-endian) is classical bit i
+        counts (numpy.ndarray): Number of shots of each outcome, shape (k,)
+        num_clbits (int): Number of classical bits
+        creg_sizes (list): ``[name, size]`` of each classical register, used for formatting
+    """
+
+    def __init__(self, outcomes, counts, num_clbits, creg_sizes=None):
+        self.outcomes = np.asarray(outcomes, dtype=np.uint8).reshape(-1, _num_bytes(num_clbits))
+        self.counts = np.asarray(counts, dtype=np.int64)
+        self.num_clbits = num_clbits
+        self.creg_sizes = creg_sizes or [["c", num_clbits]]
+
+    @classmethod
+    def from_int_counts(cls, int_counts, num_clbits, creg_sizes=None):
+        """Build from a mapping of integer outcomes to counts"""
+        num_bytes = _num_bytes(num_clbits)
+        outcomes = np.empty((len(int_counts), num_bytes), dtype=np.uint8)
+        counts = np.empty(len(int_counts), dtype=np.int64)
+        for index, (value, count) in enumerate(int_counts.items()):
+            outcomes[index] = _pack_int(value, num_bytes)
+            counts[index] = count
+        return cls(outcomes, counts, num_clbits, creg_sizes)
+
+    @classmethod
+    def from_hex_counts(cls, hex_counts, num_clbits, creg_sizes=None):
+        """Build from Aer's raw hex counts (``result.data(i)["counts"]``)"""
+        return cls.from_int_counts({int(key, 16): value for key, value in hex_counts.items()}, num_clbits, creg_sizes)
+
+    @classmethod
+    def from_counts(cls, counts, num_clbits=None, creg_sizes=None):
+        """Build from a legacy counts dict (bitstring keys, registers separated by spaces)"""
+        if not counts:
+            return cls(np.empty((0, _num_bytes(num_clbits or 0)), dtype=np.uint8), [], num_clbits or 0, creg_sizes)
+        first_key = next(iter(counts))
+        if creg_sizes is None and " " in first_key:
+            # Registers are printed most significant first
+            creg_sizes = [[f"c{index}", len(part)] for index, part in enumerate(reversed(first_key.split(" ")))]
+        if num_clbits is None:
+            num_clbits = len(first_key.replace(" ", ""))
+        int_counts = {}
+        for key, value in counts.items():
+            outcome = int(key.replace(" ", ""), 2)
+            int_counts[outcome] = int_counts.get(outcome, 0) + value
+        return cls.from_int_counts(int_counts, num_clbits, creg_sizes)
+
+    @classmethod
+    def from_memory(cls, memory, num_clbits, creg_sizes=None):
+        """Build from per-shot memory, aggregating identical outcomes"""
+        packed = pack_memory(memory, num_clbits)
+        if len(packed) == 0:
+            return cls(packed, [], num_clbits, creg_sizes)
+        outcomes, counts = np.unique(packed, axis=0, return_counts=True)
+        return cls(outcomes, counts, num_clbits, creg_sizes)
+
+    @property
+    def shots(self):
+        """Total number of shots"""
+        return int(self.counts.sum())
+
+    def __len__(self):
+        return len(self.counts)
+
+    def _bits(self, outcomes=None):
+        """Unpack outcome rows to a (k, num_clbits) array of 0/1"""
+        outcomes = self.outcomes if outcomes is None else outcomes
+        return np.unpackbits(outcomes, axis=1, bitorder="little")[:, :self.num_clbits]
+
+    def _format(self, bits):
+        """Format one row of bits like Aer's get_counts() keys"""
+        text = "".join("1" if bit else "0" for bit in bits[::-1])
+        if len(self.creg_sizes) <= 1:
+            return text
+        # Split into registers, last register first (leftmost)
+        parts = []
+        end = len(text)
+        for _, size in self.creg_sizes:
+            parts.append(text[end - size:end])
+            end -= size
+        return " ".join(reversed(parts))
+
+    def marginal(self, clbits):
+        """
+        Keep only some classical bits, summing the counts of merged outcomes
+
+        Args:
+            clbits (list[int]): Classical bit indices to keep, in their new order
+
+        Returns:
+            CompactCounts: Counts over the selected bits
+        """
+        clbits = list(clbits)
+        bits = self._bits()[:, clbits]
+        outcomes = np.packbits(bits, axis=1, bitorder="little")
+        if len(outcomes) == 0:
+            return CompactCounts(outcomes, [], len(clbits))
+        unique, inverse = np.unique(outcomes, axis=0, return_inverse=True)
+        counts = np.bincount(inverse.reshape(-1), weights=self.counts, minlength=len(unique)).astype(np.int64)
+        return CompactCounts(unique, counts, len(clbits))
+
+    def merge(self, *others):
+        """
+        Combine with other counts over the same classical bits
+
+        Returns:
+            CompactCounts: Counts with the shots of all inputs
+        """
+        parts = [self, *others]
+        outcomes = np.concatenate([part.outcomes for part in parts])
+        counts = np.concatenate([part.counts for part in parts])
+        if len(outcomes) == 0:
+            return CompactCounts(outcomes, counts, self.num_clbits, self.creg_sizes)
+        unique, inverse = np.unique(outcomes, axis=0, return_inverse=True)
+        totals = np.bincount(inverse.reshape(-1), weights=counts, minlength=len(unique)).astype(np.int64)
+        return CompactCounts(unique, totals, self.num_clbits, self.creg_sizes)
+
+    def top_k(self, k=10):
+        """
+        Return the k most frequent outcomes
+
+        Returns:
+            list[tuple]: ``(bitstring, count)`` pairs, most frequent first
+        """
+        k = min(k, len(self.counts))
+        if k == 0:
+            return []
+        indices = np.argpartition(-self.counts, k - 1)[:k]
+        indices = indices[np.argsort(-self.counts[indices], kind="stable")]
+        bits = self._bits(self.outcomes[indices])
+        return [(self._format(row), int(self.counts[index])) for row, index in zip(bits, indices)]
+
+    def most_frequent(self):
+        """Return the most frequent outcome as a bitstring"""
+        return self.top_k(1)[0][0]
+
+    def int_outcomes(self):
+        """Return the counts as a dict of integer outcomes"""
+        values = [int.from_bytes(row.tobytes(), "little") for row in self.outcomes]
+        return dict(zip(values, self.counts.tolist()))
+
+    def to_dict(self):
+        """Convert to the legacy ``{bitstring: count}`` dict"""
+        bits = self._bits()
+        return {self._format(row): int(count) for row, count in zip(bits, self.counts)}
+
+    def summary(self, k=10):
+        """Return a short text description listing the top outcomes"""
+        top = ", ".join(f"'{outcome}': {count}" for outcome, count in self.top_k(k))
+        more = f", ... ({len(self) - k} more outcomes)" if len(self) > k else ""
+        return f"{{{top}{more}}}"
+
+    def __str__(self):
+        # Printing never builds the full dict of a wide register
+        return self.summary()
+
+    def __repr__(self):
+        return f"CompactCounts(shots={self.shots}, outcomes={len(self)}, num_clbits={self.num_clbits})"
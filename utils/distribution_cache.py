@@ -0,0 +1,188 @@
+"""
+Outcome distribution cache for the Quantum Circuit Simulator.
+
+For a circuit whose measurements all come at the end, every run samples the
+same probability distribution over the measured outcomes. Changing the shot
+count, or rerunning a module, used to simulate the whole circuit again; with
+the distribution cached, new counts only cost one multinomial draw.
+
+Distributions are kept in an in-memory LRU bounded by size (vectors grow as
+2^measured qubits). An opt-in on-disk tier of ``.npz`` files lets worker
+processes and restarted servers share them.
+"""
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from utils.numpy_engine import sample_counts
+from utils.transpile_cache import versioned_cache_dir
+
+# Memory used by cached probability vectors, in MB
+DEFAULT_MAX_MEMORY_MB = int(os.environ.get("QUANTUM_DISTRIBUTION_CACHE_MB", "256"))
+
+# Directory of the on-disk tier (relative to the working directory, like the result cache)
+DEFAULT_CACHE_DIR = os.environ.get("QUANTUM_DISTRIBUTION_CACHE_DIR", os.path.join(".quantum_cache", "distributions"))
+
+# Opt-in on-disk tier (QUANTUM_DISTRIBUTION_CACHE_DISK=1), like the result cache
+PERSIST_DISTRIBUTIONS = os.environ.get("QUANTUM_DISTRIBUTION_CACHE_DISK", "0") == "1"
+
+
+class MeasurementDistribution:
+    """Probabilities of the measurement outcomes of a circuit, and how they map to its classical bits"""
+
+    def __init__(self, probabilities, measured, num_clbits, creg_sizes):
+        """
+        Args:
+            probabilities (numpy.ndarray): Outcome probabilities; index bit j is the j-th measured qubit
+            measured (dict): Clbit -> measured qubit
+            num_clbits (int): Number of classical bits of the circuit
+            creg_sizes (list): ``[name, size]`` of each classical register
+        """
+        self.probabilities = np.ascontiguousarray(probabilities, dtype=float)
+        self.measured = dict(measured)
+        self.num_clbits = num_clbits
+        self.creg_sizes = creg_sizes
+
+    @property
+    def nbytes(self):
+        return self.probabilities.nbytes
+
+    def sample(self, shots, seed=None):
+        """
+        Draw measurement counts
+
+        Returns:
+            Counts: Counts formatted like Aer's ``get_counts()``
+        """
+        return sample_counts(self.probabilities, self.measured, shots, seed, self.creg_sizes, self.num_clbits)
+
+
+class DistributionCache:
+    """Memory LRU cache of measurement distributions, optionally backed by npz files"""
+
+    def __init__(self, max_memory_mb=DEFAULT_MAX_MEMORY_MB, cache_dir=DEFAULT_CACHE_DIR, persist=PERSIST_DISTRIBUTIONS):
+        self.max_bytes = max_memory_mb * 1024 * 1024
+        self.cache_dir = cache_dir
+        self.persist = persist
+        self._entry_dir = None
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _path(self, key):
+        if self._entry_dir is None:
+            # Resolved on first disk access, dropping entries keyed by an older fingerprint
+            self._entry_dir = versioned_cache_dir(self.cache_dir)
+        return os.path.join(self._entry_dir, key[:2], f"{key}.npz")
+
+    def _remember(self, key, distribution):
+        """Store a distribution in the memory tier (caller holds the lock)"""
+        if distribution.nbytes > self.max_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= previous.nbytes
+        self._entries[key] = distribution
+        self._bytes += distribution.nbytes
+        while self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.nbytes
+
+    def _load(self, key):
+        """Read a distribution from the on-disk tier, or None"""
+        try:
+            with np.load(self._path(key), allow_pickle=False) as data:
+                return MeasurementDistribution(
+                    data["probabilities"],
+                    {int(clbit): int(qubit) for clbit, qubit in data["measured"]},
+                    int(data["num_clbits"]),
+                    json.loads(str(data["creg_sizes"]))
+                )
+        except (OSError, KeyError, ValueError):
+            return None
+
+    def _store(self, key, distribution):
+        """Write a distribution to the on-disk tier (best effort)"""
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write to a temporary file first so readers never see a partial entry
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                np.savez(
+                    f,
+                    probabilities=distribution.probabilities,
+                    measured=np.array(sorted(distribution.measured.items()), dtype=np.int64).reshape(-1, 2),
+                    num_clbits=np.int64(distribution.num_clbits),
+                    creg_sizes=np.array(json.dumps(distribution.creg_sizes))
+                )
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+
+    def get(self, key):
+        """
+        Look up the distribution of a circuit
+
+        Args:
+            key (str): Fingerprint of the circuit and simulator (see utils.transpile_cache.circuit_fingerprint)
+
+        Returns:
+            MeasurementDistribution: The cached distribution, or None on a miss
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                return self._entries[key]
+
+        distribution = self._load(key) if self.persist else None
+        with self._lock:
+            if distribution is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._remember(key, distribution)
+        return distribution
+
+    def put(self, key, distribution):
+        """Store the distribution of a circuit"""
+        with self._lock:
+            self._remember(key, distribution)
+        if self.persist:
+            self._store(key, distribution)
+
+    def stats(self):
+        """Return hit/miss statistics for the cache"""
+        with self._lock:
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "memory_mb": self._bytes / (1024 * 1024),
+            }
+
+    def clear(self, include_disk=False):
+        """Drop the memory tier, and optionally the on-disk tier"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.memory_hits = 0
+            self.disk_hits = 0
+            self.misses = 0
+        if include_disk and os.path.isdir(self.cache_dir):
+            for root, _, files in os.walk(self.cache_dir):
+                for name in files:
+                    if name.endswith(".npz"):
+                        os.remove(os.path.join(root, name))
+
+
+# Shared cache used by run_with_simulator
+distribution_cache = DistributionCache()
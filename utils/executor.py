@@ -0,0 +1,390 @@
+"""
+Asynchronous execution layer for the Quantum Circuit Simulator.
+
+Module code and simulations are submitted to a background scheduler and
+return a ``Future``, so the Streamlit script thread can keep rendering the
+page while a long QAOA/VQE module runs. The scheduler (see utils.scheduler)
+shares the execution slots fairly between sessions, and running modules can
+be cancelled and are stopped when they exceed their time or memory limits.
+"""
+import ctypes
+import os
+import threading
+import time
+import weakref
+
+from qiskit import transpile
+from qiskit_aer import AerSimulator
+from utils.simulator import run_with_simulator, run_many, run_sweep, get_simulator, get_aer_thread_limit
+from utils.simulator import aer_memory_limit
+import utils.workers as workers
+from utils.workers import run_module_in_worker, run_circuits_in_worker, ModuleCancelledError, ModuleTimeoutError
+from utils.code_cache import code_cache
+from utils.output_stream import OutputStream, capture_output
+from utils.scheduler import FairScheduler, NORMAL, PRIORITY_NAMES, module_priority, circuit_priority
+from utils.timing import trace, phase
+
+# Number of modules that may run at the same time
+MAX_WORKERS = int(os.environ.get("QUANTUM_EXECUTOR_WORKERS", os.cpu_count() or 1))
+
+# Run module code in worker processes unless a namespace must be shared
+ISOLATE_MODULES = os.environ.get("QUANTUM_ISOLATE_MODULES", "1") != "0"
+
+# Job states reported by get_job_status
+QUEUED = "QUEUED"
+RUNNING = "RUNNING"
+DONE = "DONE"
+FAILED = "FAILED"
+CANCELLED = "CANCELLED"
+
+scheduler = FairScheduler(MAX_WORKERS, thread_name_prefix="quantum-exec")
+
+# Status bookkeeping for submitted futures
+_job_info = weakref.WeakKeyDictionary()
+_job_info_lock = threading.Lock()
+
+
+def build_module_namespace():
+    """Return the namespace module code is executed in"""
+    return {
+        '__name__': '__quantum_module__',
+        'run_with_simulator': run_with_simulator,
+        'run_many': run_many,
+        'run_sweep': run_sweep,
+        'transpile': transpile,
+        'AerSimulator': AerSimulator,
+        'global_simulator': get_simulator()
+    }
+
+
+def extract_module_output(namespace):
+    """
+    Find the result of an executed module in its namespace
+
+    Modules usually store their result in ``counts`` or ``result``; if only a
+    circuit (``circuit`` or ``qc``) is defined, it is run with the simulator.
+    """
+    if 'counts' in namespace:
+        return namespace['counts']
+    if 'result' in namespace:
+        result = namespace['result']
+        return result.get_counts() if hasattr(result, 'get_counts') else str(result)
+    if 'circuit' in namespace:
+        return run_with_simulator(namespace['circuit'])
+    if 'qc' in namespace:
+        return run_with_simulator(namespace['qc'])
+    return "Execution completed, but no result or circuit was returned."
+
+
+def execute_module(code, namespace=None, label="module", stream=None):
+    """
+    Execute module code synchronously and collect its output
+
+    Args:
+        code (str): Python source of the module
+        namespace (dict): Namespace to execute in (defaults to build_module_namespace())
+        label (str): Name of the module recorded in its timing trace
+        stream (OutputStream): Capture that receives stdout and stderr while the module runs
+
+    Returns:
+        dict: ``stdout`` with the captured print output, ``output`` with the module result,
+        ``from_cache`` telling whether the result was served from the result cache and
+        ``timings`` with the per-phase timing trace (see utils.timing)
+    """
+    if namespace is None:
+        namespace = build_module_namespace()
+    if stream is None:
+        stream = OutputStream()
+
+    # The trace is logged by the caller once the result has been rendered
+    try:
+        # Context-local, so modules of other sessions running at the same time keep their own output
+        with trace(label, log=False) as timings, capture_output(stream):
+            # Unchanged module source is only compiled once (see utils.code_cache)
+            with phase("compile") as record:
+                compiled, record["hit"] = code_cache.compile(code)
+
+            # The exec phase includes the simulator phases recorded inside it
+            with phase("exec"):
+                # A single namespace lets functions defined by the module see each other
+                exec(compiled, namespace)
+                output = extract_module_output(namespace)
+    finally:
+        # A last line without a newline is still shown
+        stream.finish()
+
+    return {
+        "stdout": stream.getvalue(),
+        "output": output,
+        "from_cache": getattr(output, "from_cache", False),
+        "timings": timings
+    }
+
+
+def _submit(label, func, *args, stream=None, cancel_event=None, session=None, priority=NORMAL, **kwargs):
+    """Submit a callable to the scheduler and track its status (and output stream and cancel flag, if any)"""
+    info = {
+        "label": label, "state": QUEUED, "submitted_at": time.time(), "started_at": None, "finished_at": None,
+        "priority": PRIORITY_NAMES[priority], "stream": stream, "cancel_event": cancel_event
+    }
+
+    def run():
+        info["state"] = RUNNING
+        info["started_at"] = time.time()
+        try:
+            value = func(*args, **kwargs)
+            info["state"] = DONE
+            return value
+        except ModuleCancelledError:
+            info["state"] = CANCELLED
+            raise
+        except BaseException:
+            info["state"] = FAILED
+            raise
+        finally:
+            info["finished_at"] = time.time()
+
+    future = scheduler.submit(run, session=session, priority=priority, label=label)
+    with _job_info_lock:
+        _job_info[future] = info
+    return future
+
+
+def submit_module(code, namespace=None, label="module", session=None, priority=None):
+    """
+    Execute module code in the background
+
+    Module code runs in the worker process pool (see utils.workers). Passing
+    an explicit namespace runs it in this process instead, since the
+    namespace cannot be shared with another process. Either way the module
+    can be stopped with cancel_job and is stopped after MODULE_TIMEOUT seconds.
+
+    Args:
+        code (str): Python source of the module
+        namespace (dict): Namespace to execute in (defaults to build_module_namespace())
+        label (str): Human readable name shown in status displays
+        session (str): Scheduler queue of the submitting Streamlit session
+        priority (int): Scheduler priority class (defaults to module_priority(code))
+
+    Returns:
+        Future: Resolves to the dict returned by execute_module; the output printed
+        so far is available from get_job_output while it runs
+    """
+    stream = OutputStream()
+    cancel_event = threading.Event()
+    if priority is None:
+        priority = module_priority(code)
+    if ISOLATE_MODULES and namespace is None:
+        func, args = _run_isolated, (code, label, stream, cancel_event)
+    else:
+        func, args = _run_in_process, (code, namespace, label, stream, cancel_event)
+    return _submit(label, func, *args, stream=stream, cancel_event=cancel_event, session=session, priority=priority)
+
+
+def _run_isolated(code, label, stream, cancel_event):
+    """Run module code in a worker process with the Aer thread share of its execution slot"""
+    return run_module_in_worker(code, label, stream, aer_threads=get_aer_thread_limit(), cancel_event=cancel_event)
+
+
+class _ModuleStopped(BaseException):
+    """
+    Raised asynchronously in a thread running module code that has to stop
+
+    A BaseException, so ``except Exception`` in module code lets it through;
+    a bare ``except:`` can still swallow it, so it is raised again every
+    KILL_GRACE_SECONDS until the module returns.
+    """
+
+
+def _run_in_process(code, namespace, label, stream, cancel_event):
+    """
+    Run module code in this process, stopping it when cancelled or out of time
+
+    A thread cannot be killed, so the stop is raised as an exception in the
+    thread running the module; it takes effect at the module's next Python
+    instruction, i.e. once a running Aer simulation has returned. It is
+    raised again while the module keeps running (e.g. after swallowing it in
+    a bare ``except:``), and the module fails with the stop reason even if
+    it returns normally afterwards. The memory ceiling is enforced by Aer
+    refusing simulations larger than it.
+    """
+    thread_id = threading.get_ident()
+    finished = threading.Event()
+    stop_lock = threading.Lock()
+    errors = []
+
+    def watch():
+        timeout = workers.MODULE_TIMEOUT
+        deadline = time.monotonic() + timeout if timeout else None
+        while not finished.wait(workers.WATCH_INTERVAL):
+            if cancel_event.is_set():
+                error = ModuleCancelledError("Execution cancelled")
+            elif deadline is not None and time.monotonic() > deadline:
+                error = ModuleTimeoutError(f"Execution exceeded the time limit of {timeout:g} seconds")
+            else:
+                continue
+            with stop_lock:
+                if finished.is_set():
+                    return
+                errors.append(error)
+            break
+
+        # Keep stopping the thread until the module gives up (it can catch the stop in a bare except)
+        while True:
+            with stop_lock:
+                if finished.is_set():
+                    return
+                ctypes.pythonapi.PyThreadState_SetAsyncExc(ctypes.c_ulong(thread_id), ctypes.py_object(_ModuleStopped))
+            if finished.wait(workers.KILL_GRACE_SECONDS):
+                return
+
+    threading.Thread(target=watch, name="quantum-module-watch", daemon=True).start()
+    try:
+        try:
+            with aer_memory_limit(workers.MODULE_MEMORY_MB or None):
+                result = execute_module(code, namespace, label, stream)
+            # Once finished is set under the lock, the watcher can no longer stop this thread
+            with stop_lock:
+                finished.set()
+            if errors:
+                # The module swallowed the stop and returned anyway
+                raise errors[0]
+            return result
+        except _ModuleStopped:
+            raise errors[0] from None
+        finally:
+            with stop_lock:
+                finished.set()
+    except _ModuleStopped:
+        # A stop raised just as the module finished can arrive in the handlers above
+        raise errors[0] from None
+
+
+def _run_circuits_isolated(circuits, shots, seed_simulator, cancel_event):
+    """Simulate circuits in a worker process with the Aer thread share of their execution slot"""
+    return run_circuits_in_worker(
+        circuits, shots, seed_simulator, aer_threads=get_aer_thread_limit(), cancel_event=cancel_event
+    )
+
+
+def _run_circuit_isolated(circuit, shots, seed_simulator, cancel_event):
+    return _run_circuits_isolated([circuit], shots, seed_simulator, cancel_event)[0]
+
+
+def run_with_simulator_async(circuit, shots=1024, session=None, seed_simulator=None):
+    """
+    Run a quantum circuit on the global AerSimulator in the background
+
+    Like modules, the circuit runs in a worker process (see utils.workers)
+    with the module time and memory limits, and can be stopped with cancel_job.
+
+    Args:
+        circuit (QuantumCircuit): The quantum circuit to simulate
+        shots (int): Number of repetitions of each experiment
+        session (str): Scheduler queue of the submitting Streamlit session
+        seed_simulator (int): Seed of the simulation, for reproducible counts
+
+    Returns:
+        Future: Resolves to the measurement counts
+    """
+    priority = circuit_priority(circuit)
+    if not ISOLATE_MODULES:
+        return _submit(
+            circuit.name, run_with_simulator, circuit, shots=shots, seed_simulator=seed_simulator,
+            session=session, priority=priority
+        )
+    cancel_event = threading.Event()
+    return _submit(
+        circuit.name, _run_circuit_isolated, circuit, shots, seed_simulator, cancel_event,
+        cancel_event=cancel_event, session=session, priority=priority
+    )
+
+
+def run_many_async(circuits, shots=1024, session=None):
+    """
+    Run several quantum circuits as a single job in the background (see run_many)
+
+    Args:
+        circuits (list[QuantumCircuit]): The quantum circuits to simulate
+        shots (int): Number of repetitions of each experiment
+        session (str): Scheduler queue of the submitting session
+
+    Returns:
+        Future: Resolves to the list of measurement counts, in input order
+    """
+    circuits = list(circuits)
+    priority = min((circuit_priority(circuit) for circuit in circuits), default=NORMAL)
+    if not ISOLATE_MODULES:
+        return _submit("run_many", run_many, circuits, shots=shots, session=session, priority=priority)
+    cancel_event = threading.Event()
+    return _submit(
+        "run_many", _run_circuits_isolated, circuits, shots, None, cancel_event,
+        cancel_event=cancel_event, session=session, priority=priority
+    )
+
+
+def get_job_status(future):
+    """
+    Return the status of a submitted job
+
+    Returns:
+        dict: ``label``, ``state`` (QUEUED, RUNNING, DONE, FAILED or CANCELLED), ``priority``,
+        ``elapsed`` seconds since submission, ``finished_at`` timestamp, ``cancel_requested``
+        and, while the job is queued, its ``position`` in the scheduler queue
+    """
+    with _job_info_lock:
+        info = dict(_job_info.get(future, {}))
+    if not info:
+        return {"label": "job", "state": DONE if future.done() else RUNNING, "elapsed": 0.0, "finished_at": None}
+
+    info.pop("stream", None)
+    cancel_event = info.pop("cancel_event", None)
+    info["cancel_requested"] = cancel_event is not None and cancel_event.is_set()
+    if future.cancelled():
+        info["state"] = CANCELLED
+
+    end = info["finished_at"] or time.time()
+    info["elapsed"] = end - info["submitted_at"]
+    if info["state"] == QUEUED:
+        info["position"] = scheduler.queue_position(future)
+    return info
+
+
+def cancel_job(future):
+    """
+    Cancel a submitted job
+
+    A queued job is removed from the scheduler queue; a running module is
+    stopped together with its worker process (see utils.workers).
+
+    Returns:
+        bool: True if the job was still queued or running
+    """
+    with _job_info_lock:
+        info = _job_info.get(future)
+    if future.cancel():
+        if info is not None:
+            info["finished_at"] = time.time()
+        return True
+    if future.done() or info is None or info.get("cancel_event") is None:
+        return False
+    info["cancel_event"].set()
+    return True
+
+
+def get_scheduler_stats():
+    """Return the scheduler's running and queued job counts (see FairScheduler.stats)"""
+    return scheduler.stats()
+
+
+def get_job_output(future):
+    """
+    Return the output stream of a submitted module
+
+    Returns:
+        OutputStream: The lines the module printed so far (see utils.output_stream),
+        or None if the job has no output stream
+    """
+    with _job_info_lock:
+        info = _job_info.get(future)
+    return info.get("stream") if info else None
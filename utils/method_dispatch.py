@@ -0,0 +1,223 @@
+"""
+Cost-based simulation method dispatch for the Quantum Circuit Simulator.
+
+Each circuit is inspected before it runs (Clifford-only, entanglement across
+qubit cuts, width, depth, mid-circuit measurement) and the Aer method with
+the lowest estimated cost is chosen: ``stabilizer``, ``matrix_product_state``,
+``statevector`` or ``density_matrix``.
+"""
+import os
+import threading
+import time
+from collections import deque
+
+from qiskit.circuit import Gate, Instruction
+
+# Gates supported by Aer's stabilizer method
+CLIFFORD_GATES = {
+    "id", "x", "y", "z", "h", "s", "sdg", "sx", "sxdg",
+    "cx", "cy", "cz", "swap", "pauli", "delay"
+}
+
+# Operations a noise model may apply for the stabilizer method to accept it
+CLIFFORD_NOISE_OPERATIONS = CLIFFORD_GATES | {"reset", "measure"}
+
+# Operations that do not change the cost model
+NON_GATE_OPERATIONS = {"measure", "reset", "barrier"}
+
+# Classical control flow (dynamic circuits)
+CONTROL_FLOW_OPERATIONS = {"if_else", "while_loop", "for_loop", "switch_case"}
+
+# Memory available to a single simulation
+MEMORY_LIMIT_BYTES = int(os.environ.get(
+    "QUANTUM_SIMULATION_MEMORY_BYTES",
+    os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") // 2 if hasattr(os, "sysconf") else 8 * 1024 ** 3
+))
+
+# Widest circuit Aer's matrix_product_state method accepts
+MPS_MAX_QUBITS = 63
+
+# Bytes per complex amplitude (complex128)
+AMPLITUDE_BYTES = 16
+
+# Relative overhead of MPS tensor contractions compared to statevector updates
+MPS_OVERHEAD = 4
+
+# Number of recent decisions kept for inspection
+DISPATCH_LOG_SIZE = 100
+
+_dispatch_log = deque(maxlen=DISPATCH_LOG_SIZE)
+_dispatch_log_lock = threading.Lock()
+
+
+def _iter_operations(circuit, qubit_indices=None):
+    """Yield (name, qubit indices) for every operation, expanding custom gates"""
+    for instruction in circuit.data:
+        operation = instruction.operation
+        qubits = [circuit.find_bit(qubit).index for qubit in instruction.qubits]
+        if qubit_indices is not None:
+            qubits = [qubit_indices[qubit] for qubit in qubits]
+
+        # Custom gates (e.g. oracle.to_gate()) are judged by what they contain
+        if type(operation) in (Gate, Instruction) and operation.definition is not None:
+            yield from _iter_operations(operation.definition, qubits)
+        else:
+            yield operation.name, qubits
+
+
+def analyze_circuit(circuit):
+    """
+    Extract the structural features the cost model needs
+
+    Args:
+        circuit (QuantumCircuit): The circuit as written by the module (before transpilation)
+
+    Returns:
+        dict: ``num_qubits``, ``depth``, ``gate_count``, ``two_qubit_gates``,
+        ``is_clifford``, ``mid_circuit_measurement`` and ``bond_dimension``
+        (an upper bound on the MPS bond dimension across linear qubit cuts)
+    """
+    num_qubits = circuit.num_qubits
+    crossings = [0] * max(num_qubits - 1, 0)
+    measured = set()
+    gate_count = 0
+    two_qubit_gates = 0
+    is_clifford = True
+    mid_circuit_measurement = False
+
+    for name, qubits in _iter_operations(circuit):
+        if name == "measure":
+            measured.update(qubits)
+            continue
+        if name in ("barrier", "delay"):
+            continue
+        if name in CONTROL_FLOW_OPERATIONS or measured.intersection(qubits):
+            # Classical feed-forward, or a gate after a measurement on the same
+            # qubit, forces every shot to be simulated separately
+            mid_circuit_measurement = True
+        if name in NON_GATE_OPERATIONS:
+            continue
+
+        gate_count += 1
+        if name not in CLIFFORD_GATES:
+            is_clifford = False
+        if len(qubits) >= 2:
+            two_qubit_gates += 1
+            # Every cut between the gate's outermost qubits is crossed
+            for cut in range(min(qubits), max(qubits)):
+                crossings[cut] += 1
+
+    bond_dimension = 1
+    for cut, count in enumerate(crossings):
+        # A cut can never carry more entanglement than its smaller side allows
+        exponent = min(count, cut + 1, num_qubits - cut - 1)
+        bond_dimension = max(bond_dimension, 2 ** exponent)
+
+    return {
+        "num_qubits": num_qubits,
+        "depth": circuit.depth(),
+        "gate_count": gate_count,
+        "two_qubit_gates": two_qubit_gates,
+        "is_clifford": is_clifford,
+        "mid_circuit_measurement": mid_circuit_measurement,
+        "bond_dimension": bond_dimension,
+    }
+
+
+def noise_is_clifford(noise_model):
+    """
+    Return True if every error of a noise model is a Pauli/Clifford channel
+
+    Aer's stabilizer method rejects noise models with other errors
+    (e.g. the Kraus operators of amplitude damping). Readout errors are fine.
+
+    Args:
+        noise_model (NoiseModel): The backend's noise model
+
+    Returns:
+        bool: Whether the stabilizer method can simulate the noise
+    """
+    for error in noise_model.to_dict().get("errors", []):
+        for instructions in error.get("instructions", []):
+            if any(instruction["name"] not in CLIFFORD_NOISE_OPERATIONS for instruction in instructions):
+                return False
+    return True
+
+
+def estimate_costs(features, shots=1024, noisy=False, clifford_noise=True):
+    """
+    Estimate the relative cost of each simulation method
+
+    Args:
+        features (dict): Output of analyze_circuit
+        shots (int): Number of repetitions
+        noisy (bool): Whether the backend applies a noise model
+        clifford_noise (bool): Whether that noise model only has Pauli/Clifford errors (see noise_is_clifford)
+
+    Returns:
+        dict: Method name -> estimated cost; infeasible methods are left out
+    """
+    n = features["num_qubits"]
+    gates = max(features["gate_count"], 1)
+    chi = features["bond_dimension"]
+    # Noise or mid-circuit measurement means every shot is its own trajectory
+    trajectories = shots if (noisy or features["mid_circuit_measurement"]) else 1
+
+    costs = {}
+    if features["is_clifford"] and (not noisy or clifford_noise):
+        costs["stabilizer"] = trajectories * gates * max(n, 1) ** 2 / 64
+    if AMPLITUDE_BYTES * 2 ** n <= MEMORY_LIMIT_BYTES:
+        costs["statevector"] = trajectories * gates * 2 ** n
+    if noisy and AMPLITUDE_BYTES * 4 ** n <= MEMORY_LIMIT_BYTES:
+        # The density matrix absorbs noise deterministically, without trajectories
+        costs["density_matrix"] = gates * 4 ** n
+    if n <= MPS_MAX_QUBITS and AMPLITUDE_BYTES * n * chi ** 2 * 2 <= MEMORY_LIMIT_BYTES:
+        costs["matrix_product_state"] = trajectories * gates * MPS_OVERHEAD * chi ** 3
+    return costs
+
+
+def choose_method(circuit, shots=1024, backend=None):
+    """
+    Pick the cheapest simulation method for a circuit and record the decision
+
+    Args:
+        circuit (QuantumCircuit): The circuit as written by the module (before transpilation)
+        shots (int): Number of repetitions
+        backend: Backend the circuit runs on (used to detect a noise model)
+
+    Returns:
+        dict: The chosen ``method`` and ``reason`` together with the circuit
+        features and estimated ``costs``
+    """
+    noise_model = getattr(getattr(backend, "options", None), "noise_model", None)
+    features = analyze_circuit(circuit)
+    noisy = noise_model is not None
+    clifford_noise = noisy and noise_is_clifford(noise_model)
+    costs = estimate_costs(features, shots=shots, noisy=noisy, clifford_noise=clifford_noise)
+
+    if costs:
+        method = min(costs, key=costs.get)
+        reason = f"lowest estimated cost ({costs[method]:.3g})"
+    else:
+        # Nothing fits the memory model; let Aer try its own default
+        method = "automatic"
+        reason = "no method fits in memory"
+
+    decision = {
+        "circuit": circuit.name,
+        "method": method,
+        "reason": reason,
+        "costs": {name: float(f"{cost:.3g}") for name, cost in costs.items()},
+        "shots": shots,
+        "timestamp": time.time(),
+        **features,
+    }
+    with _dispatch_log_lock:
+        _dispatch_log.append(decision)
+    return decision
+
+
+def get_dispatch_log():
+    """Return the most recent dispatch decisions, oldest first"""
+    with _dispatch_log_lock:
+        return list(_dispatch_log)
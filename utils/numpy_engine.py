@@ -0,0 +1,246 @@
+"""
+Pure-NumPy statevector engine for small circuits.
+
+For the few-qubit circuits of the predefined examples, transpilation, Aer job
+setup and result construction cost far more than the simulation itself. This
+engine applies gates directly to the statevector with tensor contractions and
+samples all shots with a single multinomial draw, returning counts in the
+same format as Aer.
+"""
+import threading
+
+import numpy as np
+from qiskit.circuit import Gate, Instruction
+from qiskit.circuit.library.standard_gates import get_standard_gate_name_mapping
+from qiskit.result import Counts
+
+# Operations that do not act on the statevector
+IGNORED_OPERATIONS = {"barrier", "delay", "id"}
+
+# Number of gate matrices kept between runs
+MATRIX_CACHE_SIZE = 1024
+
+# Class of each standard gate by name; only those are identified by name and parameters
+_STANDARD_TYPES = {name: type(gate) for name, gate in get_standard_gate_name_mapping().items()}
+
+_matrix_cache = {}
+_matrix_cache_lock = threading.Lock()
+
+
+class UnsupportedCircuitError(Exception):
+    """Raised when a circuit needs features the NumPy engine does not implement"""
+
+
+def _gate_tensor(operation):
+    """Return the gate's unitary reshaped to a (2,) * 2k tensor"""
+    key = None
+    # Other gates (controlled custom gates, PauliEvolutionGate, ...) share a
+    # name and parameters whatever their body, so their matrices are not cached
+    is_standard = _STANDARD_TYPES.get(operation.name) is type(operation)
+    if is_standard and all(isinstance(param, (int, float)) for param in operation.params):
+        key = (operation.name, operation.num_qubits, tuple(operation.params))
+        with _matrix_cache_lock:
+            tensor = _matrix_cache.get(key)
+        if tensor is not None:
+            return tensor
+
+    try:
+        matrix = np.asarray(operation.to_matrix(), dtype=complex)
+    except Exception as e:
+        raise UnsupportedCircuitError(f"No matrix for operation '{operation.name}'") from e
+    tensor = matrix.reshape((2,) * (2 * operation.num_qubits))
+
+    if key is not None:
+        with _matrix_cache_lock:
+            if len(_matrix_cache) >= MATRIX_CACHE_SIZE:
+                _matrix_cache.clear()
+            _matrix_cache[key] = tensor
+    return tensor
+
+
+def _apply_gate(state, tensor, qubits, num_qubits):
+    """Contract a gate tensor into the statevector tensor"""
+    k = len(qubits)
+    # Qiskit is little-endian: qubit q is axis n-1-q of the C-ordered tensor,
+    # and the gate's own tensor axes run from its last qarg to its first
+    axes = [num_qubits - 1 - qubit for qubit in reversed(qubits)]
+    state = np.tensordot(tensor, state, axes=(list(range(k, 2 * k)), axes))
+    return np.moveaxis(state, list(range(k)), axes)
+
+
+def _evolve(state, circuit, qubit_indices, num_qubits, measured):
+    """Apply every operation of a circuit, expanding custom gates"""
+    for instruction in circuit.data:
+        operation = instruction.operation
+        qubits = [qubit_indices[circuit.find_bit(qubit).index] for qubit in instruction.qubits]
+        name = operation.name
+
+        if name == "measure":
+            clbit = circuit.find_bit(instruction.clbits[0]).index
+            measured[clbit] = qubits[0]
+            continue
+        if name in IGNORED_OPERATIONS:
+            continue
+        if measured and set(qubits).intersection(measured.values()):
+            raise UnsupportedCircuitError("Mid-circuit measurement is not supported")
+        if not isinstance(operation, Gate) or getattr(operation, "condition", None) is not None:
+            raise UnsupportedCircuitError(f"Operation '{name}' is not supported")
+        if operation.is_parameterized():
+            raise UnsupportedCircuitError("Circuit has unbound parameters")
+
+        if type(operation) in (Gate, Instruction) and operation.definition is not None:
+            # Custom gates (e.g. oracle.to_gate()) are expanded into their definition
+            state = _evolve(state, operation.definition, qubits, num_qubits, {})
+        else:
+            state = _apply_gate(state, _gate_tensor(operation), qubits, num_qubits)
+    return state
+
+
+def _check_supported(circuit, measured):
+    """Walk a circuit like _evolve does, without touching a statevector"""
+    for instruction in circuit.data:
+        operation = instruction.operation
+        qubits = [circuit.find_bit(qubit).index for qubit in instruction.qubits]
+        name = operation.name
+
+        if name == "measure":
+            measured.add(qubits[0])
+            continue
+        if name in IGNORED_OPERATIONS:
+            continue
+        if measured.intersection(qubits):
+            return False
+        if not isinstance(operation, Gate) or getattr(operation, "condition", None) is not None:
+            return False
+        if operation.is_parameterized():
+            return False
+        if type(operation) in (Gate, Instruction) and operation.definition is not None:
+            if not _check_supported(operation.definition, set()):
+                return False
+    return True
+
+
+def supports(circuit):
+    """
+    Cheaply check whether the engine can simulate a circuit, without simulating it
+
+    Mirrors the checks simulate_counts makes (measurements only at the end, no
+    resets or classical control, bound parameters, at least one measurement).
+    A gate without a matrix is only found when the circuit is simulated.
+
+    Returns:
+        bool: True if simulate_counts is expected to succeed
+    """
+    measured = set()
+    return _check_supported(circuit, measured) and bool(measured)
+
+
+def statevector(circuit):
+    """
+    Compute the final statevector of a circuit, ignoring its measurements
+
+    Returns:
+        numpy.ndarray: Amplitudes indexed like Qiskit (qubit 0 is the least significant bit)
+    """
+    num_qubits = circuit.num_qubits
+    state = np.zeros((2,) * num_qubits, dtype=complex)
+    state[(0,) * num_qubits] = 1.0
+    state = _evolve(state, circuit, list(range(num_qubits)), num_qubits, {})
+    return state.reshape(-1) * np.exp(1j * float(circuit.global_phase))
+
+
+def final_distribution(circuit):
+    """
+    Compute the probabilities of the measurement outcomes of a circuit
+
+    Args:
+        circuit (QuantumCircuit): A circuit whose measurements all come after its gates
+
+    Returns:
+        tuple: ``(probabilities, measured)``; outcome index bit j is the j-th measured
+        qubit (in ascending order) and ``measured`` maps each clbit to its qubit
+
+    Raises:
+        UnsupportedCircuitError: If the circuit uses mid-circuit measurement,
+            resets, classical control, unbound parameters or has no measurements
+    """
+    num_qubits = circuit.num_qubits
+    state = np.zeros((2,) * num_qubits, dtype=complex)
+    state[(0,) * num_qubits] = 1.0
+    measured = {}
+    state = _evolve(state, circuit, list(range(num_qubits)), num_qubits, measured)
+    if not measured:
+        raise UnsupportedCircuitError("Circuit has no measurements")
+
+    # Marginalize the probabilities onto the measured qubits
+    probabilities = np.abs(state) ** 2
+    measured_qubits = sorted(set(measured.values()))
+    unmeasured_axes = tuple(num_qubits - 1 - qubit for qubit in range(num_qubits) if qubit not in measured_qubits)
+    probabilities = probabilities.sum(axis=unmeasured_axes).reshape(-1)
+    probabilities /= probabilities.sum()
+    return probabilities, measured
+
+
+def sample_counts(probabilities, measured, shots, seed=None, creg_sizes=None, num_clbits=None):
+    """
+    Sample measurement counts from the outcome probabilities of final_distribution
+
+    Args:
+        probabilities (numpy.ndarray): Outcome probabilities over the measured qubits
+        measured (dict): Clbit -> measured qubit
+        shots (int): Number of repetitions
+        seed (int): Seed for the sampling RNG
+        creg_sizes (list): ``[name, size]`` of each classical register
+        num_clbits (int): Width of the classical register values
+
+    Returns:
+        Counts: Measurement counts formatted exactly like Aer's ``get_counts()``
+    """
+    # One multinomial draw samples every shot at once
+    rng = np.random.default_rng(seed)
+    samples = rng.multinomial(shots, probabilities)
+
+    # Outcome index bit j (from the least significant) is measured_qubits[j];
+    # map each sampled outcome to the value of the classical register
+    measured_qubits = sorted(set(measured.values()))
+    position = {qubit: j for j, qubit in enumerate(measured_qubits)}
+    outcomes = np.nonzero(samples)[0]
+    data = {}
+    if max(measured, default=0) < 63:
+        # Register values fit in int64, so all outcomes are mapped at once
+        values = np.zeros(len(outcomes), dtype=np.int64)
+        for clbit, qubit in measured.items():
+            values |= ((outcomes >> position[qubit]) & 1) << clbit
+        for value, count in zip(values.tolist(), samples[outcomes].tolist()):
+            data[hex(value)] = data.get(hex(value), 0) + count
+    else:
+        for outcome in outcomes:
+            value = 0
+            for clbit, qubit in measured.items():
+                value |= ((int(outcome) >> position[qubit]) & 1) << clbit
+            data[hex(value)] = data.get(hex(value), 0) + int(samples[outcome])
+
+    if num_clbits is None:
+        num_clbits = max(measured) + 1
+    return Counts(data, creg_sizes=creg_sizes, memory_slots=num_clbits)
+
+
+def simulate_counts(circuit, shots=1024, seed=None):
+    """
+    Simulate a circuit and sample measurement counts
+
+    Args:
+        circuit (QuantumCircuit): The quantum circuit to simulate (no transpilation needed)
+        shots (int): Number of repetitions
+        seed (int): Seed for the sampling RNG
+
+    Returns:
+        Counts: Measurement counts formatted exactly like Aer's ``get_counts()``
+
+    Raises:
+        UnsupportedCircuitError: If the circuit uses mid-circuit measurement,
+            resets, classical control, unbound parameters or has no measurements
+    """
+    probabilities, measured = final_distribution(circuit)
+    creg_sizes = [[register.name, register.size] for register in circuit.cregs]
+    return sample_counts(probabilities, measured, shots, seed, creg_sizes, circuit.num_clbits)
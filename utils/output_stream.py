@@ -0,0 +1,263 @@
+"""
+Streaming output capture for the Quantum Circuit Simulator.
+
+Module output is captured line by line into a bounded ring buffer, so a
+module printing millions of lines cannot exhaust memory, and the page can
+show the lines of a running module as they arrive instead of after exec
+returns. Lines carry sequence numbers so a reader only processes what is
+new since its last read.
+
+Capture is context-local: sys.stdout and sys.stderr are replaced once by
+routers that write to the capture of the current context (see
+capture_output), so modules executing at the same time on different
+threads each get their own output and never see another session's.
+"""
+import contextlib
+import contextvars
+import io
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+# Lines kept per capture; older lines are dropped first
+MAX_LINES = int(os.environ.get("QUANTUM_OUTPUT_MAX_LINES", "10000"))
+
+# Characters kept per line
+MAX_LINE_LENGTH = 10000
+
+# Seconds between chunks forwarded from a worker process
+FORWARD_INTERVAL = 0.1
+
+# Lines that make a chunk worth forwarding before the interval is up
+FORWARD_CHUNK_LINES = 256
+
+
+def _clip(line):
+    if len(line) > MAX_LINE_LENGTH:
+        return line[:MAX_LINE_LENGTH] + " [...]"
+    return line
+
+
+class OutputStream(io.TextIOBase):
+    """Thread-safe, line-buffered and bounded capture of module output"""
+
+    def __init__(self, max_lines=MAX_LINES, on_lines=None):
+        """
+        Args:
+            max_lines (int): Completed lines kept; older lines are dropped
+            on_lines (callable): Called with each batch of completed lines (e.g. to forward them)
+        """
+        super().__init__()
+        self._lines = deque(maxlen=max_lines)
+        self._partial = ""
+        self._next_seq = 0
+        self._lock = threading.Lock()
+        self.on_lines = on_lines
+
+    def writable(self):
+        return True
+
+    def write(self, text):
+        if not text:
+            return 0
+        with self._lock:
+            parts = (self._partial + text).split("\n")
+            self._partial = _clip(parts.pop())
+            lines = [_clip(line) for line in parts]
+            self._lines.extend(lines)
+            self._next_seq += len(lines)
+        if lines and self.on_lines is not None:
+            self.on_lines(lines)
+        return len(text)
+
+    def extend(self, lines, dropped=0):
+        """
+        Append lines that were already split, e.g. forwarded from a worker process
+
+        Args:
+            lines (list[str]): Completed lines
+            dropped (int): Lines the sender had to drop before these
+        """
+        with self._lock:
+            self._next_seq += dropped
+            self._lines.extend(lines)
+            self._next_seq += len(lines)
+
+    def finish(self):
+        """Complete a trailing line that has no newline yet"""
+        with self._lock:
+            partial, self._partial = self._partial, ""
+        if partial:
+            self.write(partial + "\n")
+
+    @property
+    def line_count(self):
+        """Number of completed lines written so far, including dropped ones"""
+        with self._lock:
+            return self._next_seq
+
+    @property
+    def dropped_lines(self):
+        """Number of lines dropped because the buffer was full"""
+        with self._lock:
+            return self._next_seq - len(self._lines)
+
+    def read_lines(self, since=0):
+        """
+        Return the lines written since a sequence number
+
+        Args:
+            since (int): Sequence number returned by the previous call (0 for everything)
+
+        Returns:
+            tuple: ``(lines, next_seq, skipped, partial)``; skipped counts the lines
+            after ``since`` that were dropped before they could be read, partial is
+            the current unfinished line
+        """
+        with self._lock:
+            first_seq = self._next_seq - len(self._lines)
+            start = max(since, first_seq)
+            offset = start - first_seq
+            lines = [self._lines[index] for index in range(offset, len(self._lines))]
+            return lines, self._next_seq, start - since, self._partial
+
+    def getvalue(self):
+        """Return the captured text, noting how many earlier lines were dropped"""
+        with self._lock:
+            dropped = self._next_seq - len(self._lines)
+            text = "".join(line + "\n" for line in self._lines) + self._partial
+        if dropped:
+            text = f"[... {dropped} earlier lines dropped ...]\n" + text
+        return text
+
+
+class QueueForwarder:
+    """
+    Forward the lines of a worker's OutputStream to the server process in chunks
+
+    Lines are batched so a module printing in a tight loop does not pay one
+    IPC message per line; a background thread sends whatever is pending at
+    least every FORWARD_INTERVAL seconds, so slow output still shows up.
+    """
+
+    def __init__(self, queue, stream_id, max_pending=MAX_LINES):
+        self.queue = queue
+        self.stream_id = stream_id
+        self._pending = deque(maxlen=max_pending)
+        self._dropped = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._last_sent = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name="quantum-output-forwarder", daemon=True)
+        self._thread.start()
+
+    def __call__(self, lines):
+        with self._lock:
+            overflow = len(self._pending) + len(lines) - self._pending.maxlen
+            if overflow > 0:
+                self._dropped += overflow
+            self._pending.extend(lines)
+            due = len(self._pending) >= FORWARD_CHUNK_LINES or time.monotonic() - self._last_sent >= FORWARD_INTERVAL
+        if due:
+            self.send()
+
+    def send(self):
+        """Send the pending lines now"""
+        with self._lock:
+            if not self._pending and not self._dropped:
+                return
+            lines, dropped = list(self._pending), self._dropped
+            self._pending.clear()
+            self._dropped = 0
+            self._last_sent = time.monotonic()
+        self.queue.put((self.stream_id, lines, dropped))
+
+    def _run(self):
+        while not self._stop.wait(FORWARD_INTERVAL):
+            self.send()
+
+    def close(self):
+        """Stop the background thread and send the remaining lines"""
+        self._stop.set()
+        self._thread.join()
+        self.send()
+
+
+# Capture of the code running in the current context (None: the real stream)
+_stdout_capture = contextvars.ContextVar("quantum_stdout_capture", default=None)
+_stderr_capture = contextvars.ContextVar("quantum_stderr_capture", default=None)
+_install_lock = threading.Lock()
+
+
+class _ContextRouter(io.TextIOBase):
+    """Stand-in for sys.stdout/sys.stderr that writes to the capture of the current context"""
+
+    def __init__(self, capture, fallback):
+        super().__init__()
+        self._capture = capture
+        self.fallback = fallback
+
+    def _target(self):
+        capture = self._capture.get()
+        return capture if capture is not None else self.fallback
+
+    def writable(self):
+        return True
+
+    def write(self, text):
+        return self._target().write(text)
+
+    def flush(self):
+        target = self._target()
+        if hasattr(target, "flush"):
+            target.flush()
+
+    def isatty(self):
+        target = self._target()
+        return target.isatty() if hasattr(target, "isatty") else False
+
+    def fileno(self):
+        return self._target().fileno()
+
+    @property
+    def encoding(self):
+        return getattr(self._target(), "encoding", "utf-8")
+
+    def __getattr__(self, name):
+        # Anything else (buffer, errors, ...) comes from the stream in use
+        return getattr(self._target(), name)
+
+
+def _install_routers():
+    """Route sys.stdout and sys.stderr through the context-local captures (idempotent)"""
+    with _install_lock:
+        if not isinstance(sys.stdout, _ContextRouter):
+            sys.stdout = _ContextRouter(_stdout_capture, sys.stdout)
+        if not isinstance(sys.stderr, _ContextRouter):
+            sys.stderr = _ContextRouter(_stderr_capture, sys.stderr)
+
+
+@contextlib.contextmanager
+def capture_output(stdout, stderr=None):
+    """
+    Capture what the current context writes to sys.stdout and sys.stderr
+
+    Unlike contextlib.redirect_stdout, nothing global is swapped per call:
+    other threads keep writing to their own captures (or the real streams)
+    while this one runs. Threads started inside the block get a fresh
+    context and write to the real streams.
+
+    Args:
+        stdout: Stream receiving stdout (e.g. an OutputStream)
+        stderr: Stream receiving stderr (defaults to ``stdout``)
+    """
+    _install_routers()
+    stdout_token = _stdout_capture.set(stdout)
+    stderr_token = _stderr_capture.set(stderr if stderr is not None else stdout)
+    try:
+        yield stdout
+    finally:
+        _stderr_capture.reset(stderr_token)
+        _stdout_capture.reset(stdout_token)
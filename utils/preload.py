@@ -0,0 +1,43 @@
+"""
+Background preloading of the simulation core for the Quantum Circuit Simulator.
+
+The interface imports qiskit and qiskit_aer only when an execution needs them.
+Once the first page has been painted, this loads them (and starts the worker
+pool) in a background thread so the first EXECUTE does not pay for it either.
+"""
+import os
+import threading
+
+# Load the simulation core in the background after the first paint
+PRELOAD_ENABLED = os.environ.get("QUANTUM_PRELOAD", "1") != "0"
+
+_preload_thread = None
+_preload_lock = threading.Lock()
+
+
+def _preload():
+    """Import the execution layer, build the simulator and warm the worker pool"""
+    from utils.executor import ISOLATE_MODULES
+    from utils.simulator import get_simulator
+    from utils.workers import get_pool
+
+    get_simulator()
+    if ISOLATE_MODULES:
+        get_pool()
+
+
+def preload_simulation_core():
+    """
+    Start loading the simulation core in a background thread (once per process)
+
+    Returns:
+        threading.Thread: The preload thread, or None when preloading is disabled
+    """
+    global _preload_thread
+    if not PRELOAD_ENABLED:
+        return None
+    with _preload_lock:
+        if _preload_thread is None:
+            _preload_thread = threading.Thread(target=_preload, name="quantum-preload", daemon=True)
+            _preload_thread.start()
+        return _preload_thread
@@ -0,0 +1,123 @@
+"""
+Rerun caching for the Quantum Circuit Simulator.
+
+Streamlit reruns the whole script on every click. The user application
+registry, card HTML and the 3D figure are derived from data that rarely
+changes, so they are kept in Streamlit's data cache, keyed by cheap
+fingerprints (the application store's revision, or the module names) instead
+of the data itself. Every cached call is timed so the time saved by each
+rerun can be shown in the sidebar.
+"""
+import functools
+import threading
+import time
+
+import streamlit as st
+
+_stats = {}
+_stats_lock = threading.Lock()
+
+# Per-rerun accounting; each Streamlit session runs its script in its own thread
+_current_rerun = threading.local()
+
+
+def _rerun_stats():
+    if not hasattr(_current_rerun, "stats"):
+        _current_rerun.stats = {}
+    return _current_rerun.stats
+
+
+def _record(name, call_seconds, compute_seconds):
+    """Record one cached call; compute_seconds is None when it was a hit"""
+    with _stats_lock:
+        stats = _stats.setdefault(name, {"hits": 0, "misses": 0, "compute_seconds": 0.0, "saved_seconds": 0.0})
+        if compute_seconds is None:
+            # A hit saves what the last miss cost, minus the lookup itself
+            saved = max(stats["compute_seconds"] - call_seconds, 0.0)
+            stats["hits"] += 1
+            stats["saved_seconds"] += saved
+        else:
+            saved = 0.0
+            stats["misses"] += 1
+            stats["compute_seconds"] = compute_seconds
+
+    rerun = _rerun_stats().setdefault(name, {"hits": 0, "misses": 0, "saved_seconds": 0.0})
+    rerun["hits" if compute_seconds is None else "misses"] += 1
+    rerun["saved_seconds"] += saved
+
+
+def cached_data(name, **cache_options):
+    """
+    Cache a function with st.cache_data and account for the time it saves
+
+    Arguments whose name starts with an underscore are not hashed (Streamlit
+    convention), so large inputs can be passed next to a cheap fingerprint.
+
+    Args:
+        name (str): Name shown in the cache metrics
+        **cache_options: Passed to st.cache_data (e.g. max_entries)
+    """
+    def decorator(func):
+        state = threading.local()
+
+        @functools.wraps(func)
+        def compute(*args, **kwargs):
+            start = time.perf_counter()
+            value = func(*args, **kwargs)
+            state.compute_seconds = time.perf_counter() - start
+            return value
+
+        cached_compute = st.cache_data(show_spinner=False, **cache_options)(compute)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            state.compute_seconds = None
+            start = time.perf_counter()
+            value = cached_compute(*args, **kwargs)
+            _record(name, time.perf_counter() - start, state.compute_seconds)
+            return value
+
+        wrapper.clear = cached_compute.clear
+        return wrapper
+    return decorator
+
+
+def begin_rerun():
+    """Reset the per-rerun metrics; call at the top of the script"""
+    _current_rerun.stats = {}
+
+
+def get_cache_stats():
+    """
+    Return cache metrics
+
+    Returns:
+        dict: ``rerun`` (this rerun's hits, misses and saved seconds per cache)
+        and ``total`` (the same since the server started)
+    """
+    with _stats_lock:
+        total = {name: dict(stats) for name, stats in _stats.items()}
+    return {"rerun": {name: dict(stats) for name, stats in _rerun_stats().items()}, "total": total}
+
+
+def render_cache_metrics():
+    """Show the time saved by the rerun caches in the sidebar"""
+    stats = get_cache_stats()
+    rerun_saved = sum(entry["saved_seconds"] for entry in stats["rerun"].values())
+    total_saved = sum(entry["saved_seconds"] for entry in stats["total"].values())
+
+    with st.sidebar.expander(f"⚡ RERUN CACHE: {rerun_saved * 1000:.1f} ms saved"):
+        rows = ""
+        for name, entry in stats["total"].items():
+            rerun = stats["rerun"].get(name, {"saved_seconds": 0.0})
+            rows += (
+                f"<tr><td>{name}</td><td style='text-align: right;'>{entry['hits']}/{entry['misses']}</td>"
+                f"<td style='text-align: right;'>{rerun['saved_seconds'] * 1000:.1f}</td></tr>"
+            )
+        st.markdown(f"""
+        <table style="width: 100%; font-family: 'Courier New', monospace; font-size: 0.8em;">
+            <tr><th style="text-align: left;">CACHE</th><th style="text-align: right;">HIT/MISS</th>
+                <th style="text-align: right;">SAVED ms</th></tr>{rows}
+        </table>
+        <p style="font-size: 0.8em;">Saved since server start: {total_saved:.2f} s</p>
+        """, unsafe_allow_html=True)
@@ -0,0 +1,149 @@
+"""
+Result memoization for deterministic simulations.
+
+Seeded runs of the same circuit always produce the same counts, so their
+results are kept in an in-memory LRU tier backed by an on-disk tier that
+survives Streamlit restarts.
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from qiskit.result import Counts
+
+from utils.transpile_cache import circuit_fingerprint, versioned_cache_dir
+
+# Default number of results kept in memory
+DEFAULT_MAX_ENTRIES = 512
+
+# Directory of the on-disk tier (relative to the working directory, like user_applications.json)
+DEFAULT_CACHE_DIR = os.environ.get("QUANTUM_RESULT_CACHE_DIR", os.path.join(".quantum_cache", "results"))
+
+
+class CachedCounts(Counts):
+    """Measurement counts that were served from the result cache (a regular qiskit ``Counts``)"""
+
+    from_cache = True
+
+
+class ResultCache:
+    """Two-tier (memory LRU + disk) cache of measurement counts"""
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, cache_dir=DEFAULT_CACHE_DIR):
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self._entry_dir = None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def make_key(self, circuit, backend, shots, seed_simulator, **run_options):
+        """
+        Build the cache key of a run
+
+        Args:
+            circuit (QuantumCircuit): The circuit being simulated
+            backend: Backend the circuit runs on (its options are part of the key)
+            shots (int): Number of repetitions
+            seed_simulator (int): Simulator seed
+            **run_options: Extra options passed to ``backend.run``
+
+        Returns:
+            str: Hex digest identifying the run
+        """
+        payload = json.dumps({
+            "circuit": circuit_fingerprint(circuit, backend),
+            "shots": shots,
+            "seed_simulator": seed_simulator,
+            "run_options": sorted((key, repr(value)) for key, value in run_options.items()),
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _path(self, key):
+        if self._entry_dir is None:
+            # Resolved on first disk access, dropping entries keyed by an older fingerprint
+            self._entry_dir = versioned_cache_dir(self.cache_dir)
+        return os.path.join(self._entry_dir, key[:2], f"{key}.json")
+
+    def _remember(self, key, counts):
+        """Store counts in the memory tier (caller holds the lock)"""
+        self._entries[key] = counts
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, key):
+        """
+        Look up cached counts
+
+        Returns:
+            CachedCounts: The cached counts, or None on a miss
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                return CachedCounts(self._entries[key])
+
+        try:
+            with open(self._path(key), "r") as f:
+                counts = json.load(f)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.disk_hits += 1
+            self._remember(key, counts)
+        return CachedCounts(counts)
+
+    def put(self, key, counts):
+        """Store counts in both tiers"""
+        counts = dict(counts)
+        with self._lock:
+            self._remember(key, counts)
+
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write to a temporary file first so readers never see a partial entry
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(counts, f)
+            os.replace(tmp_path, path)
+        except OSError:
+            # The disk tier is best effort; the memory tier still has the entry
+            pass
+
+    def stats(self):
+        """Return hit/miss statistics for the cache"""
+        with self._lock:
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+            }
+
+    def clear(self, include_disk=False):
+        """Drop the memory tier, and optionally the on-disk tier"""
+        with self._lock:
+            self._entries.clear()
+            self.memory_hits = 0
+            self.disk_hits = 0
+            self.misses = 0
+        if include_disk and os.path.isdir(self.cache_dir):
+            for root, _, files in os.walk(self.cache_dir):
+                for name in files:
+                    if name.endswith(".json"):
+                        os.remove(os.path.join(root, name))
+
+
+# Shared cache used by run_with_simulator
+result_cache = ResultCache()
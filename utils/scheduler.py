@@ -0,0 +1,240 @@
+"""
+Fair multi-session job scheduler for the Quantum Circuit Simulator.
+
+Jobs from every Streamlit session go through one scheduler with a bounded
+number of execution slots. Each session has its own queue and sessions are
+served round-robin, so one user submitting many modules cannot push
+everybody else back. Within that, small interactive circuits are dispatched
+ahead of long sweeps, and waiting jobs slowly gain priority so nothing
+starves.
+
+Every dispatched job gets a share of the CPU cores for Aer's threads
+(cores / running jobs), so concurrent simulations do not oversubscribe the
+machine with one full set of OpenMP threads each.
+"""
+import itertools
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+# Priority classes, most urgent first
+INTERACTIVE = 0
+NORMAL = 1
+BATCH = 2
+PRIORITY_NAMES = {INTERACTIVE: "INTERACTIVE", NORMAL: "NORMAL", BATCH: "BATCH"}
+
+# Seconds of waiting that move a job up by one priority class
+AGING_SECONDS = float(os.environ.get("QUANTUM_SCHEDULER_AGING", "30"))
+
+# Cores shared by the Aer threads of running jobs
+CPU_COUNT = int(os.environ.get("QUANTUM_AER_CORES", os.cpu_count() or 1))
+
+# Session of jobs submitted outside Streamlit
+DEFAULT_SESSION = "default"
+
+
+class _Job:
+    """A submitted callable waiting in a session queue"""
+
+    __slots__ = ("future", "func", "args", "kwargs", "session", "priority", "label", "submitted_at", "seq")
+
+    def __init__(self, future, func, args, kwargs, session, priority, label, seq):
+        self.future = future
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.session = session
+        self.priority = priority
+        self.label = label
+        self.submitted_at = time.monotonic()
+        self.seq = seq
+
+    def effective_priority(self, now):
+        # Whole classes only, so sessions within a class are still served round-robin
+        return self.priority - int((now - self.submitted_at) // AGING_SECONDS)
+
+
+def _select(queues, order, now):
+    """
+    Pick the next job to dispatch
+
+    Each session offers its most urgent job; the most urgent offer wins, and
+    ties go to the session that has waited longest for its turn. The chosen
+    job is removed and its session moves to the back of the round-robin order.
+
+    Args:
+        queues (dict): Session -> list of waiting jobs (modified)
+        order (deque): Round-robin order of sessions with waiting jobs (modified)
+        now (float): Current time.monotonic()
+
+    Returns:
+        _Job: The job to run next, or None if nothing is waiting
+    """
+    best = None
+    for session in order:
+        candidate = min(queues[session], key=lambda job: (job.effective_priority(now), job.seq))
+        if best is None or candidate.effective_priority(now) < best.effective_priority(now):
+            best = candidate
+    if best is None:
+        return None
+
+    queue = queues[best.session]
+    queue.remove(best)
+    order.remove(best.session)
+    if queue:
+        order.append(best.session)
+    else:
+        del queues[best.session]
+    return best
+
+
+class FairScheduler:
+    """Bounded pool of execution slots with per-session fair queues and priorities"""
+
+    def __init__(self, max_workers, thread_name_prefix="quantum-sched"):
+        self.max_workers = max_workers
+        self.thread_name_prefix = thread_name_prefix
+        self._queues = {}
+        self._order = deque()
+        self._running = {}
+        self._condition = threading.Condition()
+        self._threads = []
+        self._seq = itertools.count()
+
+    def _start_threads(self):
+        """Start the slot threads on first use (caller holds the condition)"""
+        while len(self._threads) < self.max_workers:
+            thread = threading.Thread(
+                target=self._work, name=f"{self.thread_name_prefix}_{len(self._threads)}", daemon=True
+            )
+            self._threads.append(thread)
+            thread.start()
+
+    def submit(self, func, *args, session=None, priority=NORMAL, label="job", **kwargs):
+        """
+        Queue a callable
+
+        Args:
+            func (callable): Called with ``*args`` and ``**kwargs`` in an execution slot
+            session (str): Queue the job belongs to (one per Streamlit session)
+            priority (int): INTERACTIVE, NORMAL or BATCH
+            label (str): Name shown in status displays
+
+        Returns:
+            Future: Resolves to the callable's return value; cancelling it before
+            it starts removes it from the queue
+        """
+        future = Future()
+        session = session or DEFAULT_SESSION
+        job = _Job(future, func, args, kwargs, session, priority, label, next(self._seq))
+        with self._condition:
+            self._start_threads()
+            if session not in self._queues:
+                self._queues[session] = []
+                self._order.append(session)
+            self._queues[session].append(job)
+            self._condition.notify()
+        return future
+
+    def _work(self):
+        """Slot thread: run the next job whenever one is waiting"""
+        from utils.simulator import aer_thread_limit
+
+        while True:
+            with self._condition:
+                job = None
+                while job is None:
+                    job = _select(self._queues, self._order, time.monotonic())
+                    if job is None:
+                        self._condition.wait()
+                if not job.future.set_running_or_notify_cancel():
+                    continue
+                self._running[job.future] = job
+                # Share the cores between the running jobs (jobs already running keep their share)
+                aer_threads = max(1, CPU_COUNT // len(self._running))
+
+            try:
+                with aer_thread_limit(aer_threads):
+                    result = job.func(*job.args, **job.kwargs)
+            except BaseException as e:
+                job.future.set_exception(e)
+            else:
+                job.future.set_result(result)
+            finally:
+                with self._condition:
+                    self._running.pop(job.future, None)
+                # Drop references to the job's arguments before waiting for the next one
+                job = None
+
+    def queue_position(self, future):
+        """
+        Return how many jobs will be dispatched before a queued job, plus one
+
+        Returns:
+            int: 1 for the next job to run, or 0 if the job is not waiting
+        """
+        with self._condition:
+            queues = {
+                session: [job for job in jobs if not job.future.cancelled()]
+                for session, jobs in self._queues.items()
+            }
+            queues = {session: jobs for session, jobs in queues.items() if jobs}
+            order = deque(session for session in self._order if session in queues)
+
+        # Replay the dispatch order on a copy of the queues
+        now = time.monotonic()
+        position = 0
+        while True:
+            job = _select(queues, order, now)
+            if job is None:
+                return 0
+            position += 1
+            if job.future is future:
+                return position
+
+    def stats(self):
+        """Return the number of running jobs and of queued jobs per priority class and session"""
+        with self._condition:
+            queued = [job for jobs in self._queues.values() for job in jobs if not job.future.cancelled()]
+            return {
+                "slots": self.max_workers,
+                "running": len(self._running),
+                "queued": len(queued),
+                "queued_by_priority": {
+                    name: sum(1 for job in queued if job.priority == priority)
+                    for priority, name in PRIORITY_NAMES.items()
+                },
+                "sessions": len({job.session for job in queued} | {job.session for job in self._running.values()}),
+            }
+
+
+def module_priority(code):
+    """
+    Pick the priority class of module code from its circuit index entry
+
+    Modules the index rates as cheap run interactively, expensive modules and
+    parameter sweeps as batch jobs; modules not indexed yet are NORMAL.
+
+    Args:
+        code (str): Python source of the module
+
+    Returns:
+        int: INTERACTIVE, NORMAL or BATCH
+    """
+    from utils.circuit_index import circuit_index, complexity_rating
+
+    if "run_sweep" in code:
+        return BATCH
+    rating = complexity_rating(circuit_index.get(code))
+    if rating is None:
+        return NORMAL
+    if rating <= 2:
+        return INTERACTIVE
+    return BATCH if rating >= 4 else NORMAL
+
+
+def circuit_priority(circuit):
+    """Pick the priority class of a single circuit run from its width"""
+    return INTERACTIVE if circuit.num_qubits <= 16 else NORMAL
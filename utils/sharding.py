@@ -0,0 +1,126 @@
+"""
+Shot sharding for large simulations.
+
+Runs with many shots are split into shards that execute in separate worker
+processes. Each shard gets its own reproducible RNG stream derived from one
+seed, and the shard counts are merged with a vectorized reduction.
+"""
+import os
+import threading
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+from qiskit.result import Counts
+
+from utils.workers import new_process_pool
+
+# Runs with at least this many shots per shard are split across processes
+MIN_SHOTS_PER_SHARD = int(os.environ.get("QUANTUM_MIN_SHOTS_PER_SHARD", "100000"))
+
+# Number of shard worker processes
+MAX_SHARDS = int(os.environ.get("QUANTUM_MAX_SHARDS", os.cpu_count() or 1))
+
+_shard_pool = None
+_shard_pool_lock = threading.Lock()
+
+
+def plan_shards(shots, max_shards=None, min_shots_per_shard=MIN_SHOTS_PER_SHARD):
+    """
+    Split a shot count into shards
+
+    Args:
+        shots (int): Total number of repetitions
+        max_shards (int): Upper bound on the shards (defaults to MAX_SHARDS, read at call time)
+        min_shots_per_shard (int): Smallest shard worth a separate process
+
+    Returns:
+        list[int]: Shots per shard (a single entry when the run is too small to split)
+    """
+    if max_shards is None:
+        max_shards = MAX_SHARDS
+    num_shards = max(1, min(max_shards, shots // max(min_shots_per_shard, 1)))
+    base, remainder = divmod(shots, num_shards)
+    return [base + (1 if index < remainder else 0) for index in range(num_shards)]
+
+
+def shard_seeds(seed, num_shards):
+    """
+    Derive independent, reproducible simulator seeds for each shard
+
+    Args:
+        seed (int): Seed of the whole run, or None for fresh entropy
+        num_shards (int): Number of shards
+
+    Returns:
+        list[int]: One seed per shard
+    """
+    children = np.random.SeedSequence(seed).spawn(num_shards)
+    return [int(child.generate_state(1, dtype=np.uint32)[0]) for child in children]
+
+
+def merge_counts(counts_list):
+    """
+    Merge several counts dictionaries by summing the counts of each outcome
+
+    Returns:
+        Counts: The combined counts
+    """
+    keys = [key for counts in counts_list for key in counts]
+    if not keys:
+        return Counts({})
+    values = np.fromiter((value for counts in counts_list for value in counts.values()), dtype=np.int64, count=len(keys))
+    outcomes, inverse = np.unique(np.array(keys), return_inverse=True)
+    totals = np.bincount(inverse.reshape(-1), weights=values, minlength=len(outcomes)).astype(np.int64)
+    return Counts(dict(zip(outcomes.tolist(), totals.tolist())))
+
+
+def _run_shard(circuit, shots, seed, aer_threads=None):
+    """Simulate one shard inside a worker process"""
+    from utils.simulator import simulate, aer_thread_limit
+    with aer_thread_limit(aer_threads):
+        return dict(simulate(circuit, shots, seed))
+
+
+def _get_shard_pool():
+    """Return the shard worker pool, starting it on first use"""
+    global _shard_pool
+    with _shard_pool_lock:
+        if _shard_pool is None:
+            _shard_pool = new_process_pool(MAX_SHARDS)
+        return _shard_pool
+
+
+def run_sharded(circuit, shots, seed_simulator=None, aer_threads=None):
+    """
+    Simulate a circuit with its shots split across worker processes
+
+    Args:
+        circuit (QuantumCircuit): The quantum circuit to simulate
+        shots (int): Total number of repetitions
+        seed_simulator (int): Seed of the whole run; shard seeds are derived from it
+        aer_threads (int): Aer threads the whole run may use, split across the shards
+            (defaults to the machine's cores, so shards do not oversubscribe them)
+
+    Returns:
+        Counts: Merged measurement counts
+    """
+    global _shard_pool
+    shards = plan_shards(shots)
+    seeds = shard_seeds(seed_simulator, len(shards))
+
+    pool = _get_shard_pool()
+    try:
+        if not aer_threads:
+            aer_threads = os.cpu_count() or 1
+        shard_threads = max(1, aer_threads // len(shards))
+        futures = [
+            pool.submit(_run_shard, circuit, shard_shots, seed, shard_threads)
+            for shard_shots, seed in zip(shards, seeds)
+        ]
+        return merge_counts([future.result() for future in futures])
+    except BrokenProcessPool:
+        # Start a fresh pool for the next run
+        with _shard_pool_lock:
+            if _shard_pool is pool:
+                _shard_pool = None
+        raise
@@ -1,69 +1,478 @@
 """
 Quantum simulator utilities for the Quantum Circuit Simulator.
 """
-from qiskit import transpile
-from qiskit_aer import AerSimulator
-import json
+import numpy as np
+import contextlib
+import contextvars
 import os
-import streamlit as st
+import threading
+from utils.transpile_cache import transpile_cache
+from utils.result_cache import result_cache
+from utils.method_dispatch import choose_method, get_dispatch_log
+from utils.numpy_engine import simulate_counts, supports, UnsupportedCircuitError
+from utils.distribution_cache import distribution_cache, MeasurementDistribution
+from utils.transpile_cache import circuit_fingerprint
+from utils.sharding import plan_shards, run_sharded
+from utils.compact_counts import CompactCounts
+from utils.timing import trace, phase
 
-# Create a global AerSimulator instance that can be used by all examples
-global_simulator = AerSimulator()
+# Global AerSimulator instance used by all examples, created on first use
+# (importing qiskit_aer is a large part of the interface's cold start)
+_global_simulator = None
 
-def run_with_simulator(circuit, shots=1024):
+# Pick stabilizer / MPS / statevector / density_matrix per circuit from its estimated cost
+METHOD_DISPATCH_ENABLED = os.environ.get("QUANTUM_METHOD_DISPATCH", "1") != "0"
+
+# Circuits up to this width run on the built-in NumPy engine instead of Aer (0 disables it)
+NUMPY_ENGINE_MAX_QUBITS = int(os.environ.get("QUANTUM_NUMPY_MAX_QUBITS", "10"))
+
+# Measurement-at-end circuits up to this width are sampled from their cached
+# outcome distribution instead of being simulated on every run (0 disables it)
+RESAMPLE_MAX_QUBITS = int(os.environ.get("QUANTUM_RESAMPLE_MAX_QUBITS", "20"))
+
+# Opt-in memoization of seeded (deterministic) runs
+RESULT_CACHE_ENABLED = os.environ.get("QUANTUM_RESULT_CACHE", "0") == "1"
+
+# Seed used when a run does not pass one, making demo runs deterministic (and cacheable)
+DEFAULT_SEED_SIMULATOR = os.environ.get("QUANTUM_SEED_SIMULATOR")
+if DEFAULT_SEED_SIMULATOR is not None:
+    DEFAULT_SEED_SIMULATOR = int(DEFAULT_SEED_SIMULATOR)
+
+# Simulators configured for a specific method, created on first use
+_method_simulators = {}
+_simulator_lock = threading.Lock()
+
+# Aer threads a simulation in the current context may use (None: Aer's default, every core);
+# the scheduler sets it so concurrent jobs share the cores instead of oversubscribing them
+_aer_thread_limit = contextvars.ContextVar("quantum_aer_thread_limit", default=None)
+
+@contextlib.contextmanager
+def aer_thread_limit(threads):
+    """Limit the Aer threads of simulations run in this context (None removes the limit)"""
+    token = _aer_thread_limit.set(threads)
+    try:
+        yield
+    finally:
+        _aer_thread_limit.reset(token)
+
+def get_aer_thread_limit():
+    """Return the Aer thread limit of the current context, or None"""
+    return _aer_thread_limit.get()
+
+# Memory in MB a simulation in the current context may need (None: Aer's default, the machine's memory);
+# Aer refuses circuits that need more up front instead of swapping the worker to death
+_aer_memory_limit = contextvars.ContextVar("quantum_aer_memory_limit", default=None)
+
+@contextlib.contextmanager
+def aer_memory_limit(memory_mb):
+    """Limit the memory of simulations run in this context (None removes the limit)"""
+    token = _aer_memory_limit.set(memory_mb)
+    try:
+        yield
+    finally:
+        _aer_memory_limit.reset(token)
+
+def _with_resource_limits(run_options):
+    """Add the context's Aer thread and memory limits to the options of a simulator.run call"""
+    threads = _aer_thread_limit.get()
+    if threads is not None:
+        run_options["max_parallel_threads"] = threads
+    memory_mb = _aer_memory_limit.get()
+    if memory_mb is not None:
+        run_options["max_memory_mb"] = memory_mb
+    return run_options
+
+def get_simulator(method="automatic"):
+    """
+    Return the AerSimulator to use for a simulation method
+
+    Args:
+        method (str): Aer simulation method, or "automatic" for the global simulator
+
+    Returns:
+        AerSimulator: A simulator whose target matches the method's gate set and width
+    """
+    global _global_simulator
+    from qiskit_aer import AerSimulator
+
+    with _simulator_lock:
+        if _global_simulator is None:
+            _global_simulator = AerSimulator()
+        if method == "automatic":
+            return _global_simulator
+        if method not in _method_simulators:
+            _method_simulators[method] = AerSimulator(method=method)
+        simulator = _method_simulators[method]
+        _sync_options(simulator)
+        return simulator
+
+def _sync_options(simulator):
+    """
+    Copy the global simulator's options (noise model, precision, ...) to a method simulator
+
+    Runs on every get_simulator call, so options a module sets on
+    global_simulator after the method simulator was created still apply.
+    Only options that changed are set (caller holds the simulator lock).
+    """
+    options = _global_simulator.options
+    items = options.items() if hasattr(options, "items") else vars(options).items()
+    changed = {
+        name: value for name, value in items
+        if name != "method" and getattr(simulator.options, name, None) is not value
+    }
+    if changed:
+        simulator.set_options(**changed)
+
+def __getattr__(name):
+    # ``global_simulator`` stays importable but is only built when first accessed
+    if name == "global_simulator":
+        return get_simulator()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def select_method(circuit, shots=1024):
+    """Return the simulation method to use for a circuit"""
+    if not METHOD_DISPATCH_ENABLED:
+        return "automatic"
+    return choose_method(circuit, shots, get_simulator())["method"]
+
+def numpy_engine_applies(circuit):
+    """
+    Return True if run_numpy_fast_path would simulate a circuit, without simulating it
+
+    The circuit must be narrow enough and supported by the engine, and the
+    global simulator must not have a noise model (the engine is noiseless).
+    """
+    return (
+        circuit.num_qubits <= NUMPY_ENGINE_MAX_QUBITS
+        and get_simulator().options.noise_model is None
+        and supports(circuit)
+    )
+
+def run_numpy_fast_path(circuit, shots=1024, seed_simulator=None):
+    """
+    Run a small circuit on the NumPy engine, skipping transpilation and Aer
+
+    Returns:
+        dict: Measurement counts, or None if the engine does not apply (see numpy_engine_applies)
+    """
+    if not numpy_engine_applies(circuit):
+        return None
+    try:
+        return simulate_counts(circuit, shots, seed_simulator)
+    except UnsupportedCircuitError:
+        return None
+
+def to_compact_counts(counts, circuit):
+    """Convert counts of a circuit's run to CompactCounts"""
+    if isinstance(counts, CompactCounts):
+        return counts
+    creg_sizes = [[register.name, register.size] for register in circuit.cregs]
+    if getattr(counts, "int_raw", None) is not None:
+        # qiskit Counts already hold integer outcomes, so no bitstrings are parsed
+        return CompactCounts.from_int_counts(counts.int_raw, circuit.num_clbits, creg_sizes)
+    return CompactCounts.from_counts(counts, circuit.num_clbits, creg_sizes)
+
+def circuit_attributes(circuit, shots):
+    """Return the qubit count, depth and shots recorded with each timed phase"""
+    return {"qubits": circuit.num_qubits, "depth": circuit.depth(), "shots": shots}
+
+def _split_final_measurements(circuit):
+    """
+    Separate a circuit into its gates and the measurements that follow them
+
+    Returns:
+        tuple: ``(gates, measured)`` with the circuit minus its measurements and a
+        clbit -> qubit map, or None if the circuit measures mid-circuit, resets,
+        uses classical control or has no measurements
+    """
+    from qiskit.circuit import Gate
+
+    gates = circuit.copy_empty_like()
+    measured = {}
+    for instruction in circuit.data:
+        operation = instruction.operation
+        qubits = [circuit.find_bit(qubit).index for qubit in instruction.qubits]
+        if operation.name == "measure":
+            measured[circuit.find_bit(instruction.clbits[0]).index] = qubits[0]
+            continue
+        if operation.name == "barrier":
+            continue
+        if not isinstance(operation, Gate) or getattr(operation, "condition", None) is not None:
+            return None
+        if operation.is_parameterized() or set(qubits).intersection(measured.values()):
+            return None
+        gates.append(instruction)
+    if not measured:
+        return None
+    return gates, measured
+
+def measurement_distribution(circuit):
+    """
+    Compute the probabilities of a circuit's measurement outcomes
+
+    One Aer statevector run saves the probabilities of the measured qubits.
+
+    Returns:
+        MeasurementDistribution: The distribution, or None if the circuit's outcomes cannot be
+        sampled from one (mid-circuit measurement, resets, classical control, noise, too wide)
+    """
+    if circuit.num_qubits > RESAMPLE_MAX_QUBITS or get_simulator().options.noise_model is not None:
+        return None
+    creg_sizes = [[register.name, register.size] for register in circuit.cregs]
+
+    split = _split_final_measurements(circuit)
+    if split is None:
+        return None
+    gates, measured = split
+    # Outcome index bit j is the j-th measured qubit, as in the NumPy engine
+    gates.save_probabilities(sorted(set(measured.values())))
+    simulator = get_simulator("statevector")
+    transpiled_circuit = transpile_cache.transpile(gates, simulator)
+    result = simulator.run(transpiled_circuit, **_with_resource_limits({"shots": 1})).result()
+    return MeasurementDistribution(result.data(0)["probabilities"], measured, circuit.num_clbits, creg_sizes)
+
+def sample_from_distribution(circuit, shots=1024, seed_simulator=None):
+    """
+    Draw counts from the cached outcome distribution of a circuit, computing it on a miss
+
+    Returns:
+        dict: Measurement counts, or None if the circuit cannot be sampled this way
+    """
+    attributes = circuit_attributes(circuit, shots)
+    with phase("distribution_cache", **attributes) as record:
+        key = circuit_fingerprint(circuit, get_simulator())
+        distribution = distribution_cache.get(key)
+        record["hit"] = distribution is not None
+    if distribution is None:
+        with phase("distribution", **attributes):
+            distribution = measurement_distribution(circuit)
+        if distribution is None:
+            return None
+        distribution_cache.put(key, distribution)
+
+    # Another shot count or another run costs one multinomial draw
+    with phase("sample", **attributes):
+        return distribution.sample(shots, seed_simulator)
+
+def simulate(circuit, shots=1024, seed_simulator=None, compact=False):
+    """
+    Simulate a circuit in this process, without caching or sharding
+
+    Args:
+        circuit (QuantumCircuit): The quantum circuit to simulate
+        shots (int): Number of repetitions of each experiment
+        seed_simulator (int): Seed for the simulator's sampling
+        compact (bool): Return CompactCounts built straight from Aer's raw
+            outcomes, without creating bitstring keys
+
+    Returns:
+        dict: Measurement counts from the simulation
+    """
+    attributes = circuit_attributes(circuit, shots)
+
+    # Small circuits are fastest on the NumPy engine
+    with phase("numpy_engine", **attributes):
+        counts = run_numpy_fast_path(circuit, shots, seed_simulator)
+    if counts is not None:
+        return counts
+
+    # Pick the cheapest simulation method for this circuit
+    method = select_method(circuit, shots)
+    simulator = get_simulator(method)
+
+    # Transpile the circuit for the simulator, reusing the cached
+    # result when an identical circuit has been transpiled before
+    with phase("transpile", method=method, **attributes):
+        transpiled_circuit = transpile_cache.transpile(circuit, simulator)
+
+    # Run the simulation
+    run_options = {"shots": shots}
+    if seed_simulator is not None:
+        run_options["seed_simulator"] = seed_simulator
+    with phase("run", method=method, **attributes):
+        job = simulator.run(transpiled_circuit, **_with_resource_limits(run_options))
+    with phase("result", method=method, **attributes):
+        result = job.result()
+
+        # Get the counts (measurement results)
+        if compact:
+            creg_sizes = [[register.name, register.size] for register in circuit.cregs]
+            return CompactCounts.from_hex_counts(result.data(0)["counts"], circuit.num_clbits, creg_sizes)
+        return result.get_counts()
+
+def run_with_simulator(circuit, shots=1024, seed_simulator=None, use_cache=None, compact=False):
     """
     Run a quantum circuit using the global AerSimulator
     
     Args:
         circuit (QuantumCircuit): The quantum circuit to simulate
         shots (int): Number of repetitions of each experiment
+        seed_simulator (int): Seed for the simulator's sampling
+        use_cache (bool): Serve seeded runs from the result cache
+            (defaults to the QUANTUM_RESULT_CACHE setting)
+        compact (bool): Return CompactCounts (array-backed) instead of a dict,
+            recommended for wide registers
         
     Returns:
         dict: Measurement counts from the simulation
     """
-    # Transpile the circuit for the AerSimulator
-    transpiled_circuit = transpile(circuit, global_simulator)
+    if seed_simulator is None:
+        seed_simulator = DEFAULT_SEED_SIMULATOR
+    if use_cache is None:
+        use_cache = RESULT_CACHE_ENABLED
 
-    # Run the simulation
-    result = global_simulator.run(transpiled_circuit, shots=shots).result()
+    # Joins the module's trace when called from module code (only module and UI traces are logged)
+    with trace(circuit.name, log=False):
+        # Only seeded runs are deterministic, so only they can be memoized
+        cache_key = None
+        if use_cache and seed_simulator is not None:
+            with phase("result_cache", **circuit_attributes(circuit, shots)) as record:
+                cache_key = result_cache.make_key(circuit, get_simulator(), shots, seed_simulator)
+                cached_counts = result_cache.get(cache_key)
+                record["hit"] = cached_counts is not None
+            if cached_counts is not None:
+                return to_compact_counts(cached_counts, circuit) if compact else cached_counts
 
-    # Get the counts (measurement results)
-    return result.get_counts()
+        # Measurement-at-end circuits are sampled from their cached outcome distribution;
+        # circuits the NumPy engine handles are cheaper to simulate than to look up
+        counts = None
+        if NUMPY_ENGINE_MAX_QUBITS < circuit.num_qubits <= RESAMPLE_MAX_QUBITS:
+            counts = sample_from_distribution(circuit, shots, seed_simulator)
 
-# Function to load saved user applications
-def load_user_applications():
-    """Load user-defined applications from the save file"""
-    try:
-        if os.path.exists("user_applications.json"):
-            with open("user_applications.json", "r") as f:
-                return json.load(f)
-        return {}
-    except Exception as e:
-        st.error(f"Error loading user applications: {e}")
-        return {}
-
-# Function to save user applications
-def save_user_applications(user_apps):
-    """Save user-defined applications to a file"""
-    try:
-        with open("user_applications.json", "w") as f:
-            json.dump(user_apps, f, indent=2)
-        return True
-    except Exception as e:
-        st.error(f"Error saving user applications: {e}")
-        return False
-
-# Add a sidebar for user interaction
-st.sidebar.title("Quantum Circuit Simulator Sidebar")
-
-# File uploader for quantum circuits
-uploaded_file = st.sidebar.file_uploader("Upload a Quantum Circuit (QASM format)", type=["qasm"])
-if uploaded_file is not None:
-    st.sidebar.success("File uploaded successfully!")
-    # Placeholder for processing the uploaded file
-    st.write("Uploaded file content:")
-    st.code(uploaded_file.getvalue().decode("utf-8"))
-
-# Settings configuration
-shots = st.sidebar.number_input("Number of Shots", min_value=1, max_value=10000, value=1024)
-st.sidebar.write(f"Current shots: {shots}")
+        if counts is None:
+            if len(plan_shards(shots)) > 1 and not numpy_engine_applies(circuit):
+                # Large shot counts are split across worker processes (the NumPy
+                # engine samples any number of shots in one draw, so it is not split)
+                with phase("run", method="sharded", **circuit_attributes(circuit, shots)):
+                    counts = run_sharded(circuit, shots, seed_simulator, aer_threads=get_aer_thread_limit())
+            else:
+                # The result cache stores dicts, so only uncached runs skip bitstrings
+                counts = simulate(circuit, shots, seed_simulator, compact=compact and cache_key is None)
+
+        if cache_key is not None:
+            result_cache.put(cache_key, counts)
+        if compact:
+            return to_compact_counts(counts, circuit)
+        return counts
+
+def run_many(circuits, shots=1024):
+    """
+    Run several quantum circuits as a single job on the global AerSimulator
+
+    Aer parallelizes across the experiments of one job, so this is much
+    cheaper than calling run_with_simulator once per circuit.
+
+    Args:
+        circuits (list[QuantumCircuit]): The quantum circuits to simulate
+        shots (int): Number of repetitions of each experiment
+
+    Returns:
+        list[dict]: Measurement counts for each circuit, in input order
+    """
+    circuits = list(circuits)
+    if not circuits:
+        return []
+
+    with trace("run_many", log=False):
+        # Small circuits run on the NumPy engine; a job runs with a single
+        # method, so the rest are grouped by method and each group is one job
+        with phase("numpy_engine", circuits=len(circuits), shots=shots):
+            all_counts = [run_numpy_fast_path(circuit, shots) for circuit in circuits]
+        groups = {}
+        for index, circuit in enumerate(circuits):
+            if all_counts[index] is None:
+                groups.setdefault(select_method(circuit, shots), []).append(index)
+
+        for method, indices in groups.items():
+            simulator = get_simulator(method)
+            group = [circuits[index] for index in indices]
+            attributes = {
+                "method": method,
+                "circuits": len(group),
+                "qubits": max(circuit.num_qubits for circuit in group),
+                "depth": max(circuit.depth() for circuit in group),
+                "shots": shots,
+            }
+
+            # Transpile the group together, reusing cached results where possible
+            with phase("transpile", **attributes):
+                transpiled_circuits = transpile_cache.transpile_many(group, simulator)
+
+            with phase("run", **attributes):
+                job = simulator.run(transpiled_circuits, **_with_resource_limits({"shots": shots}))
+            with phase("result", **attributes):
+                result = job.result()
+                for position, index in enumerate(indices):
+                    all_counts[index] = result.get_counts(position)
+        return all_counts
+
+def run_sweep(circuit, parameter_values, shots=1024, seed_simulator=None):
+    """
+    Run a parameterized circuit over a grid of parameter values as a single job
+
+    The circuit is transpiled once and every parameter set is bound by Aer
+    inside one job, instead of rebuilding and re-transpiling per point.
+
+    Args:
+        circuit (QuantumCircuit): Circuit with unbound parameters
+        parameter_values (array-like): Values of shape (..., P), where P is the number
+            of circuit parameters in ``circuit.parameters`` order
+        shots (int): Number of repetitions of each experiment
+        seed_simulator (int): Seed for the simulator's sampling
+
+    Returns:
+        numpy.ndarray: Object array of shape (...) holding the counts of each grid point
+    """
+    parameters = list(circuit.parameters)
+    values = np.asarray(parameter_values, dtype=float)
+    if values.ndim == 1 and len(parameters) == 1:
+        values = values[:, np.newaxis]
+    if values.ndim == 0 or values.shape[-1] != len(parameters):
+        raise ValueError(
+            f"parameter_values must have shape (..., {len(parameters)}) for parameters "
+            f"{[parameter.name for parameter in parameters]}, got {values.shape}"
+        )
+
+    grid_shape = values.shape[:-1]
+    points = values.reshape(-1, len(parameters))
+    results = np.empty(grid_shape, dtype=object)
+    if points.shape[0] == 0:
+        return results
+
+    with trace(circuit.name, log=False):
+        # Transpile once, for the method the unbound circuit dispatches to
+        method = select_method(circuit, shots)
+        simulator = get_simulator(method)
+        attributes = {"method": method, "points": points.shape[0], **circuit_attributes(circuit, shots)}
+        with phase("transpile", **attributes):
+            transpiled_circuit = transpile_cache.transpile(circuit, simulator)
+
+        # Both parameter lists are sorted by name, so they line up even when the
+        # cached circuit was transpiled from an equivalent circuit's parameters
+        parameter_binds = {
+            parameter: points[:, column].tolist()
+            for column, parameter in enumerate(transpiled_circuit.parameters)
+        }
+        run_options = {"shots": shots}
+        if seed_simulator is not None:
+            run_options["seed_simulator"] = seed_simulator
+        with phase("run", **attributes):
+            job = simulator.run(transpiled_circuit, parameter_binds=[parameter_binds], **_with_resource_limits(run_options))
+        with phase("result", **attributes):
+            result = job.result()
+            flat_results = results.reshape(-1)
+            for index in range(points.shape[0]):
+                flat_results[index] = result.get_counts(index)
+        return results
+
+def get_transpile_cache_stats():
+    """Return hit/miss statistics of the transpilation cache"""
+    return transpile_cache.stats()
+
+def get_method_dispatch_log():
+    """Return the most recent simulation method decisions"""
+    return get_dispatch_log()
+
+def get_result_cache_stats():
+    """Return hit/miss statistics of the result cache"""
+    return result_cache.stats()
@@ -0,0 +1,402 @@
+"""
+User application storage for the Quantum Circuit Simulator.
+
+Applications live in an SQLite database (WAL mode), one row per module, so
+creating, editing or deleting a module writes only that row, and concurrent
+sessions cannot overwrite each other's changes. Every change is also kept in
+a version history. An existing user_applications.json is imported once.
+
+Storage is independent of Streamlit: errors are raised as StorageError and
+the UI (see utils/ui.py) decides how to report them.
+"""
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+# Database the user applications are stored in
+USER_APPLICATIONS_DB = os.environ.get("QUANTUM_USER_APPLICATIONS_DB", "user_applications.db")
+
+# Legacy JSON save file, imported into the database on first use
+USER_APPLICATIONS_PATH = os.environ.get("QUANTUM_USER_APPLICATIONS", "user_applications.json")
+
+# Seconds a writer waits for another writer's transaction to finish
+BUSY_TIMEOUT = 30
+
+# Columns of the applications table; any other field is kept in ``extra``
+_COLUMNS = ("code", "created", "last_modified")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS applications (
+    name TEXT PRIMARY KEY,
+    code TEXT NOT NULL,
+    created TEXT NOT NULL,
+    last_modified TEXT,
+    extra TEXT,
+    version INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS applications_created ON applications (created);
+CREATE TABLE IF NOT EXISTS application_versions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    code TEXT,
+    extra TEXT,
+    saved_at TEXT NOT NULL,
+    deleted INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS application_versions_name ON application_versions (name, version);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+INSERT OR IGNORE INTO meta (key, value) VALUES ('revision', '0');
+"""
+
+# sqlite3 connections cannot be shared between threads
+_connections = threading.local()
+_initialized = set()
+_initialized_lock = threading.Lock()
+
+
+class StorageError(Exception):
+    """Raised when user applications cannot be read or written"""
+
+
+class ApplicationExistsError(StorageError):
+    """Raised when an application is created or renamed to a name that is already taken"""
+
+
+def _now():
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _connect(path=None):
+    """Return this thread's connection to the database, creating the schema on first use"""
+    path = path or USER_APPLICATIONS_DB
+    connections = getattr(_connections, "by_path", None)
+    if connections is None:
+        connections = _connections.by_path = {}
+    connection = connections.get(path)
+    if connection is None:
+        # Autocommit mode; writes open their own BEGIN IMMEDIATE transaction
+        connection = sqlite3.connect(path, timeout=BUSY_TIMEOUT, isolation_level=None)
+        connection.row_factory = sqlite3.Row
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connections[path] = connection
+
+    with _initialized_lock:
+        if path not in _initialized:
+            connection.executescript(_SCHEMA)
+            _migrate_json(connection)
+            _initialized.add(path)
+    return connection
+
+
+class _transaction:
+    """Write transaction that takes the database write lock up front"""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        self.connection.execute("BEGIN IMMEDIATE")
+        return self.connection
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.connection.execute("UPDATE meta SET value = CAST(value AS INTEGER) + 1 WHERE key = 'revision'")
+            self.connection.execute("COMMIT")
+        else:
+            self.connection.execute("ROLLBACK")
+        return False
+
+
+def _split(data):
+    """Split application data into column values and the JSON of any other fields"""
+    extra = {key: value for key, value in data.items() if key not in _COLUMNS}
+    return (
+        data.get("code", ""),
+        data.get("created") or _now(),
+        data.get("last_modified"),
+        json.dumps(extra) if extra else None,
+    )
+
+
+def _row_to_application(row):
+    """Convert a database row back to the application dict the UI uses"""
+    application = {"code": row["code"], "created": row["created"]}
+    if row["last_modified"]:
+        application["last_modified"] = row["last_modified"]
+    if row["extra"]:
+        application.update(json.loads(row["extra"]))
+    return application
+
+
+def _next_version(connection, name):
+    """Next version number of a name; continues after deletions so history stays unique"""
+    row = connection.execute("SELECT MAX(version) FROM application_versions WHERE name = ?", (name,)).fetchone()
+    return (row[0] or 0) + 1
+
+
+def _upsert(connection, name, data):
+    """Insert or update one application and record the new version"""
+    code, created, last_modified, extra = _split(data)
+    version = _next_version(connection, name)
+    connection.execute(
+        """
+        INSERT INTO applications (name, code, created, last_modified, extra, version)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT (name) DO UPDATE SET
+            code = excluded.code, created = excluded.created, last_modified = excluded.last_modified,
+            extra = excluded.extra, version = excluded.version
+        """,
+        (name, code, created, last_modified, extra, version)
+    )
+    connection.execute(
+        "INSERT INTO application_versions (name, version, code, extra, saved_at) VALUES (?, ?, ?, ?, ?)",
+        (name, version, code, extra, _now())
+    )
+    return version
+
+
+def _insert(connection, name, data):
+    """Insert a new application and record its first version; never replaces an existing one"""
+    code, created, last_modified, extra = _split(data)
+    version = _next_version(connection, name)
+    try:
+        connection.execute(
+            "INSERT INTO applications (name, code, created, last_modified, extra, version) VALUES (?, ?, ?, ?, ?, ?)",
+            (name, code, created, last_modified, extra, version)
+        )
+    except sqlite3.IntegrityError as e:
+        raise ApplicationExistsError(f"A module named '{name}' already exists") from e
+    connection.execute(
+        "INSERT INTO application_versions (name, version, code, extra, saved_at) VALUES (?, ?, ?, ?, ?)",
+        (name, version, code, extra, _now())
+    )
+    return version
+
+
+def _delete(connection, name):
+    """Delete one application, recording the deletion in its history"""
+    if connection.execute("DELETE FROM applications WHERE name = ?", (name,)).rowcount == 0:
+        return False
+    connection.execute(
+        "INSERT INTO application_versions (name, version, code, extra, saved_at, deleted) VALUES (?, ?, NULL, NULL, ?, 1)",
+        (name, _next_version(connection, name), _now())
+    )
+    return True
+
+
+def _migrate_json(connection, json_path=None):
+    """Import the legacy JSON save file once, if the database has never been populated from it"""
+    json_path = json_path or USER_APPLICATIONS_PATH
+    migrated = connection.execute("SELECT value FROM meta WHERE key = 'json_migrated'").fetchone()
+    if migrated is not None or not os.path.exists(json_path):
+        return
+    with open(json_path, "r") as f:
+        user_apps = json.load(f)
+    with _transaction(connection):
+        # Checked again under the write lock: another process may have imported the file meanwhile
+        if connection.execute("SELECT 1 FROM meta WHERE key = 'json_migrated'").fetchone() is not None:
+            return
+        for name, data in user_apps.items():
+            if connection.execute("SELECT 1 FROM applications WHERE name = ?", (name,)).fetchone() is None:
+                _upsert(connection, name, data)
+        connection.execute("INSERT INTO meta (key, value) VALUES ('json_migrated', ?)", (os.path.abspath(json_path),))
+
+
+def _storage_operation(description):
+    """Turn database and file errors of a storage function into StorageError"""
+    def decorator(func):
+        def wrapper(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            except (sqlite3.Error, OSError, TypeError, ValueError) as e:
+                raise StorageError(f"Error {description}: {e}") from e
+        wrapper.__name__ = func.__name__
+        wrapper.__doc__ = func.__doc__
+        return wrapper
+    return decorator
+
+
+@_storage_operation("reading user applications")
+def user_applications_signature(path=None):
+    """
+    Return a cheap fingerprint of the stored user applications
+
+    Returns:
+        tuple: ``(database path, revision)``; the revision changes with every write
+    """
+    path = path or USER_APPLICATIONS_DB
+    row = _connect(path).execute("SELECT value FROM meta WHERE key = 'revision'").fetchone()
+    return (os.path.abspath(path), int(row["value"]))
+
+
+@_storage_operation("loading user applications")
+def read_user_applications(path=None):
+    """
+    Read all saved user applications
+
+    Args:
+        path (str): Database file (defaults to USER_APPLICATIONS_DB)
+
+    Returns:
+        dict: Application name -> application data, in the order they were added
+
+    Raises:
+        StorageError: If the database cannot be read
+    """
+    rows = _connect(path).execute("SELECT * FROM applications ORDER BY rowid")
+    return {row["name"]: _row_to_application(row) for row in rows}
+
+
+@_storage_operation("loading a user application")
+def get_user_application(name, path=None):
+    """Return one application's data, or None if it does not exist"""
+    row = _connect(path).execute("SELECT * FROM applications WHERE name = ?", (name,)).fetchone()
+    return _row_to_application(row) if row is not None else None
+
+
+@_storage_operation("searching user applications")
+def find_user_applications(name_prefix=None, created_after=None, limit=None, path=None):
+    """
+    Look up applications by name prefix and/or creation time, using the indexes
+
+    Args:
+        name_prefix (str): Only names starting with this
+        created_after (str): Only applications created at or after this ("%Y-%m-%d %H:%M:%S")
+        limit (int): Maximum number of results
+
+    Returns:
+        dict: Application name -> application data, newest first
+    """
+    query = "SELECT * FROM applications WHERE 1 = 1"
+    params = []
+    if name_prefix:
+        # A range on the primary key instead of LIKE, so the index is used
+        query += " AND name >= ? AND name < ?"
+        params += [name_prefix, name_prefix + "\U0010ffff"]
+    if created_after:
+        query += " AND created >= ?"
+        params.append(created_after)
+    query += " ORDER BY created DESC"
+    if limit:
+        query += " LIMIT ?"
+        params.append(int(limit))
+    rows = _connect(path).execute(query, params)
+    return {row["name"]: _row_to_application(row) for row in rows}
+
+
+@_storage_operation("creating a user application")
+def create_user_application(name, data, path=None):
+    """
+    Create a new application
+
+    Args:
+        name (str): Application name
+        data (dict): ``code``, ``created`` and any other fields
+
+    Returns:
+        int: The application's version number (1 unless the name was used before)
+
+    Raises:
+        ApplicationExistsError: If an application with this name already exists
+    """
+    connection = _connect(path)
+    with _transaction(connection):
+        return _insert(connection, name, data)
+
+
+@_storage_operation("saving a user application")
+def upsert_user_application(name, data, path=None):
+    """
+    Create or update one application
+
+    Args:
+        name (str): Application name
+        data (dict): ``code``, ``created``, ``last_modified`` and any other fields
+
+    Returns:
+        int: The application's new version number
+    """
+    connection = _connect(path)
+    with _transaction(connection):
+        return _upsert(connection, name, data)
+
+
+@_storage_operation("renaming a user application")
+def rename_user_application(old_name, new_name, data, path=None):
+    """
+    Save an application under a new name and remove the old one, atomically
+
+    Returns:
+        int: The version number under the new name
+
+    Raises:
+        ApplicationExistsError: If another application already has the new name (nothing is changed)
+    """
+    connection = _connect(path)
+    with _transaction(connection):
+        if old_name == new_name:
+            return _upsert(connection, new_name, data)
+        _delete(connection, old_name)
+        return _insert(connection, new_name, data)
+
+
+@_storage_operation("deleting a user application")
+def delete_user_application(name, path=None):
+    """
+    Delete one application (its history is kept)
+
+    Returns:
+        bool: True if the application existed
+    """
+    connection = _connect(path)
+    with _transaction(connection):
+        return _delete(connection, name)
+
+
+@_storage_operation("loading the history of a user application")
+def get_application_history(name, path=None):
+    """
+    Return every saved version of an application, oldest first
+
+    Returns:
+        list[dict]: ``version``, ``code``, ``saved_at`` and ``deleted`` of each version
+    """
+    rows = _connect(path).execute(
+        "SELECT version, code, extra, saved_at, deleted FROM application_versions WHERE name = ? ORDER BY version",
+        (name,)
+    )
+    return [
+        {"version": row["version"], "code": row["code"], "saved_at": row["saved_at"], "deleted": bool(row["deleted"])}
+        for row in rows
+    ]
+
+
+@_storage_operation("saving user applications")
+def write_user_applications(user_apps, path=None):
+    """
+    Make the stored applications match a full dict
+
+    Only applications that were added, changed or removed are written.
+
+    Args:
+        user_apps (dict): Application name -> application data
+        path (str): Database file (defaults to USER_APPLICATIONS_DB)
+
+    Raises:
+        StorageError: If the database cannot be written
+    """
+    connection = _connect(path)
+    with _transaction(connection):
+        stored = {row["name"]: _row_to_application(row) for row in connection.execute("SELECT * FROM applications")}
+        for name in stored.keys() - user_apps.keys():
+            _delete(connection, name)
+        for name, data in user_apps.items():
+            if stored.get(name) != data:
+                _upsert(connection, name, data)
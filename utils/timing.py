@@ -0,0 +1,140 @@
+"""
+Per-phase execution timing for the Quantum Circuit Simulator.
+
+A trace collects wall and CPU time for each phase of an execution (module
+``exec``, ``transpile``, Aer ``run``, ``result``, HTML ``render``) together
+with qubit count, depth and shots. Finished module and UI traces are
+appended to a JSON lines log file, rotated once it grows past
+TIMING_LOG_MAX_MB, so hot paths can be analysed from production sessions.
+"""
+import contextlib
+import contextvars
+import json
+import os
+import threading
+import time
+
+# JSON lines file traces are written to
+TIMING_LOG_PATH = os.environ.get("QUANTUM_TIMING_LOG", os.path.join("logs", "timing.jsonl"))
+
+# Size in MB at which the log is moved to ``<path>.1`` (replacing the previous one) and restarted
+TIMING_LOG_MAX_MB = float(os.environ.get("QUANTUM_TIMING_LOG_MAX_MB", "10"))
+
+_current_trace = contextvars.ContextVar("quantum_timing_trace", default=None)
+_log_lock = threading.Lock()
+
+
+def current_trace():
+    """Return the trace of the execution running in this context, if any"""
+    return _current_trace.get()
+
+
+@contextlib.contextmanager
+def trace(label, log=True):
+    """
+    Collect phase timings for an execution
+
+    Nested calls join the trace that is already active, so a run_with_simulator
+    call inside a module is recorded as part of the module's trace.
+
+    Args:
+        label (str): Name of the execution (module name, circuit name, ...)
+        log (bool): Write the trace to the timing log when it finishes
+
+    Yields:
+        dict: The trace, with ``label``, ``started_at``, ``pid`` and ``phases``
+    """
+    existing = _current_trace.get()
+    if existing is not None:
+        yield existing
+        return
+
+    current = {"label": label, "started_at": time.time(), "pid": os.getpid(), "phases": []}
+    token = _current_trace.set(current)
+    try:
+        yield current
+    finally:
+        _current_trace.reset(token)
+        if log:
+            write_trace(current)
+
+
+@contextlib.contextmanager
+def phase(name, **attributes):
+    """
+    Time one phase of the active trace (a no-op when no trace is active)
+
+    CPU time is process CPU time, which includes Aer's worker threads and is
+    exact in worker processes, where one module runs at a time.
+
+    Args:
+        name (str): Phase name, e.g. "exec", "transpile", "run", "result", "render"
+        **attributes: Extra fields such as qubits, depth and shots
+
+    Yields:
+        dict: The phase record; more attributes can be added while it runs
+    """
+    current = _current_trace.get()
+    record = {"phase": name, **attributes}
+    if current is None:
+        yield record
+        return
+
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    try:
+        yield record
+    finally:
+        record["wall"] = time.perf_counter() - wall_start
+        record["cpu"] = time.process_time() - cpu_start
+        current["phases"].append(record)
+
+
+def add_phase(current, name, wall, cpu=None, **attributes):
+    """Append an externally measured phase to a trace"""
+    record = {"phase": name, "wall": wall, "cpu": cpu, **attributes}
+    current["phases"].append(record)
+    return record
+
+
+def summarize(current):
+    """
+    Total the wall and CPU time of each phase name
+
+    Returns:
+        dict: Phase name -> {"wall", "cpu", "count"}, in first-seen order
+    """
+    totals = {}
+    for record in current.get("phases", []):
+        total = totals.setdefault(record["phase"], {"wall": 0.0, "cpu": 0.0, "count": 0})
+        total["wall"] += record.get("wall") or 0.0
+        total["cpu"] += record.get("cpu") or 0.0
+        total["count"] += 1
+    return totals
+
+
+def _rotate(path):
+    """Move a timing log that grew past TIMING_LOG_MAX_MB aside (caller holds the log lock)"""
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        return
+    if size >= TIMING_LOG_MAX_MB * 1024 * 1024:
+        os.replace(path, f"{path}.1")
+
+
+def write_trace(current, path=None):
+    """Append a trace to the timing log as one JSON line"""
+    path = path or TIMING_LOG_PATH
+    line = json.dumps({**current, "summary": summarize(current)}, default=str)
+    try:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with _log_lock:
+            _rotate(path)
+            with open(path, "a") as f:
+                f.write(line + "\n")
+    except OSError:
+        # Timing must never break an execution
+        pass
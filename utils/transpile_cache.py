@@ -0,0 +1,300 @@
+"""
+Transpilation cache for the Quantum Circuit Simulator.
+
+Circuits are keyed by a canonical structural hash, so re-running the same
+Bell/GHZ/Grover module reuses the transpiled circuit instead of calling
+``transpile`` again.
+"""
+import hashlib
+import os
+import re
+import shutil
+import threading
+from collections import OrderedDict
+
+from qiskit import transpile
+from qiskit.circuit import Gate, Instruction, ControlFlowOp, ControlledGate, ClassicalRegister, Clbit, QuantumCircuit
+from qiskit.circuit.library.standard_gates import get_standard_gate_name_mapping
+
+# Default number of transpiled circuits kept in memory
+DEFAULT_MAX_ENTRIES = 256
+
+# Bumped whenever the fingerprint changes, so entries keyed by an older one are never reused
+FINGERPRINT_VERSION = 3
+
+# Class of each standard operation by name; those are fully identified by name and parameters
+_STANDARD_TYPES = {name: type(operation) for name, operation in get_standard_gate_name_mapping().items()}
+
+
+def _format_param(param):
+    """Return a stable string for a gate parameter"""
+    if hasattr(param, "tobytes"):
+        # Matrices (e.g. UnitaryGate) are hashed by their raw contents
+        return f"array:{param.dtype}:{param.shape}:{hashlib.sha1(param.tobytes()).hexdigest()}"
+    if isinstance(param, float):
+        return repr(param)
+    return str(param)
+
+
+def _format_condition(circuit, condition):
+    """Return a stable string for a classical condition or switch target"""
+    if isinstance(condition, tuple):
+        target, value = condition
+        return f"({_format_condition(circuit, target)}=={value})"
+    if isinstance(condition, Clbit):
+        return f"clbit{circuit.find_bit(condition).index}"
+    if isinstance(condition, ClassicalRegister):
+        return f"creg:{condition.name}:{condition.size}"
+    # Classical expressions (qiskit.circuit.classical.expr) name their bits and registers
+    return repr(condition)
+
+
+def _is_standard(operation):
+    return _STANDARD_TYPES.get(operation.name) is type(operation)
+
+
+def _update_with_operator(digest, operator):
+    """Feed the operator of an evolution gate (e.g. PauliEvolutionGate) into a hash object"""
+    if isinstance(operator, (list, tuple)):
+        for term in operator:
+            _update_with_operator(digest, term)
+        return
+    if hasattr(operator, "paulis") and hasattr(operator, "coeffs"):
+        digest.update(f"operator{operator.paulis.to_labels()}".encode())
+        digest.update(_format_param(operator.coeffs).encode())
+    else:
+        digest.update(f"operator:{operator!r}".encode())
+
+
+def _update_with_definition(digest, operation):
+    """
+    Feed what a non-standard operation does into a hash object
+
+    Library and controlled gates keep the same name and parameters whatever
+    their body (``oracle.control(1)``, ``PauliEvolutionGate`` of XX or ZZ),
+    so their base gate, operator and definition are hashed as well.
+    Operations given by a matrix parameter (UnitaryGate) are already fully
+    hashed, and synthesizing their definition would be expensive.
+    """
+    if _is_standard(operation) or any(hasattr(param, "tobytes") for param in operation.params):
+        return
+    operator = getattr(operation, "operator", None)
+    if operator is not None:
+        _update_with_operator(digest, operator)
+    if isinstance(operation, ControlledGate):
+        base_gate = operation.base_gate
+        params = ",".join(_format_param(param) for param in base_gate.params)
+        digest.update(f"base:{operation.num_ctrl_qubits}:{operation.ctrl_state}:{params}".encode())
+        _update_with_definition(digest, base_gate)
+    definition = operation.definition
+    if definition is not None:
+        digest.update(b"{")
+        _update_with_circuit(digest, definition)
+        digest.update(b"}")
+
+
+def _update_with_circuit(digest, circuit):
+    """Feed the structure of a circuit into a hash object"""
+    digest.update(f"q{circuit.num_qubits}c{circuit.num_clbits}".encode())
+    # The register layout decides how counts keys are split ('01' or '0 1')
+    digest.update(repr([(register.name, register.size) for register in circuit.cregs]).encode())
+    digest.update(_format_param(circuit.global_phase).encode())
+    for instruction in circuit.data:
+        operation = instruction.operation
+        qubits = [circuit.find_bit(qubit).index for qubit in instruction.qubits]
+        clbits = [circuit.find_bit(clbit).index for clbit in instruction.clbits]
+
+        # Custom gates (e.g. oracle.to_gate()) get a fresh name on every run,
+        # so they are identified by their definition instead of their name
+        is_custom = type(operation) in (Gate, Instruction) and operation.definition is not None
+        if is_custom:
+            name = "custom"
+        elif type(operation) is ControlledGate:
+            name = "controlled"
+        else:
+            name = operation.name
+        # Control-flow blocks are hashed structurally below, not by their drawing
+        params = ",".join(
+            _format_param(param) for param in operation.params if not isinstance(param, QuantumCircuit)
+        )
+        digest.update(f"|{name}({params}){qubits}{clbits}".encode())
+
+        condition = getattr(operation, "condition", None)
+        if condition is not None:
+            digest.update(f"?{_format_condition(circuit, condition)}".encode())
+        target = getattr(operation, "target", None)
+        if isinstance(operation, ControlFlowOp) and target is not None:
+            digest.update(f"switch{_format_condition(circuit, target)}".encode())
+            digest.update(repr([values for values, _ in operation.cases_specifier()]).encode())
+        if isinstance(operation, ControlFlowOp):
+            for block in operation.blocks:
+                digest.update(b"{")
+                _update_with_circuit(digest, block)
+                digest.update(b"}")
+        else:
+            _update_with_definition(digest, operation)
+
+
+def _backend_options(backend):
+    """Return the backend options as a sorted, hashable string"""
+    options = getattr(backend, "options", None)
+    if options is None:
+        return ""
+    items = options.items() if hasattr(options, "items") else vars(options).items()
+    return repr(sorted((key, repr(value)) for key, value in items))
+
+
+def circuit_fingerprint(circuit, backend=None, **transpile_options):
+    """
+    Compute a canonical structural hash of a circuit
+
+    Args:
+        circuit (QuantumCircuit): The circuit to fingerprint
+        backend: Backend the circuit will be transpiled for
+        **transpile_options: Extra keyword arguments passed to ``transpile``
+
+    Returns:
+        str: Hex digest covering gates, qubit mapping, parameters and options
+    """
+    digest = hashlib.sha256()
+    digest.update(f"v{FINGERPRINT_VERSION}".encode())
+    _update_with_circuit(digest, circuit)
+    if backend is not None:
+        digest.update(f"|backend:{backend.name}".encode())
+        digest.update(_backend_options(backend).encode())
+    digest.update(repr(sorted((key, repr(value)) for key, value in transpile_options.items())).encode())
+    return digest.hexdigest()
+
+
+def versioned_cache_dir(cache_dir):
+    """
+    Return the directory holding on-disk cache entries keyed by the current fingerprint
+
+    Entries keyed by an older fingerprint (the two-character shard directories
+    directly under cache_dir, or an older version directory) may map different
+    circuits to the same key, so they are deleted.
+
+    Args:
+        cache_dir (str): Root directory of an on-disk cache tier
+
+    Returns:
+        str: Subdirectory of cache_dir for the current FINGERPRINT_VERSION
+    """
+    current = f"v{FINGERPRINT_VERSION}"
+    try:
+        names = os.listdir(cache_dir)
+    except OSError:
+        names = []
+    for name in names:
+        if name != current and re.fullmatch(r"[0-9a-f]{2}|v\d+", name):
+            shutil.rmtree(os.path.join(cache_dir, name), ignore_errors=True)
+    return os.path.join(cache_dir, current)
+
+
+class TranspileCache:
+    """Bounded LRU cache of transpiled circuits"""
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def transpile(self, circuit, backend, **transpile_options):
+        """
+        Transpile a circuit, reusing a cached result when the structure matches
+
+        Args:
+            circuit (QuantumCircuit): The circuit to transpile
+            backend: Backend to transpile for
+            **transpile_options: Extra keyword arguments passed to ``transpile``
+
+        Returns:
+            QuantumCircuit: The transpiled circuit
+        """
+        key = circuit_fingerprint(circuit, backend, **transpile_options)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        # Transpile outside the lock so other sessions are not blocked
+        transpiled_circuit = transpile(circuit, backend, **transpile_options)
+
+        with self._lock:
+            self._entries[key] = transpiled_circuit
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return transpiled_circuit
+
+    def transpile_many(self, circuits, backend, **transpile_options):
+        """
+        Transpile a list of circuits, sending all cache misses to ``transpile`` together
+
+        Args:
+            circuits (list[QuantumCircuit]): The circuits to transpile
+            backend: Backend to transpile for
+            **transpile_options: Extra keyword arguments passed to ``transpile``
+
+        Returns:
+            list[QuantumCircuit]: The transpiled circuits, in input order
+        """
+        keys = [circuit_fingerprint(circuit, backend, **transpile_options) for circuit in circuits]
+        transpiled_circuits = [None] * len(circuits)
+        missing = {}
+        with self._lock:
+            for index, key in enumerate(keys):
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    transpiled_circuits[index] = self._entries[key]
+                else:
+                    self.misses += 1
+                    # Identical circuits in one batch are only transpiled once
+                    missing.setdefault(key, []).append(index)
+
+        if missing:
+            # Transpile outside the lock so other sessions are not blocked
+            pending = [circuits[indices[0]] for indices in missing.values()]
+            results = transpile(pending, backend, **transpile_options)
+            with self._lock:
+                for (key, indices), transpiled_circuit in zip(missing.items(), results):
+                    for index in indices:
+                        transpiled_circuits[index] = transpiled_circuit
+                    self._entries[key] = transpiled_circuit
+                    self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return transpiled_circuits
+
+    def stats(self):
+        """Return hit/miss statistics for the cache"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def clear(self):
+        """Drop all cached circuits and reset the statistics"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+
+# Shared cache used by run_with_simulator
+transpile_cache = TranspileCache()
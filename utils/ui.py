@@ -1,7 +1,16 @@
 """
 UI styling and theming components for the Quantum Circuit Simulator
 """
+import html
+from collections import deque
+
 import streamlit as st
+from utils.timing import summarize
+from utils.storage import read_user_applications, write_user_applications, user_applications_signature, StorageError
+from utils.storage import upsert_user_application, rename_user_application, delete_user_application
+from utils.storage import create_user_application, ApplicationExistsError
+from utils.rerun_cache import cached_data
+from utils.circuit_index import complexity_rating
 
 def configure_page_style():
     """Configure the page style and layout with the robotic/futuristic theme"""
@@ -158,12 +167,179 @@ def display_error_message(message, details=None):
     </div>
     """, unsafe_allow_html=True)
 
-def display_terminal_output(output):
-    """Display output in a terminal-like container"""
-    st.markdown("<h4>QUANTUM OUTPUT DATA</h4>", unsafe_allow_html=True)
+@cached_data("user applications", max_entries=4)
+def _read_user_applications_cached(signature):
+    """Read the store once per revision of it (signature is the database path and revision)"""
+    return read_user_applications()
+
+def load_user_applications():
+    """Load user-defined applications, reporting errors on the page"""
+    try:
+        signature = user_applications_signature()
+        # Each call returns its own copy, so callers may modify it before saving
+        return _read_user_applications_cached(signature)
+    except StorageError as e:
+        st.error(str(e))
+        return {}
+
+def save_user_applications(user_apps):
+    """Save user-defined applications, reporting errors on the page"""
+    try:
+        write_user_applications(user_apps)
+        return True
+    except StorageError as e:
+        st.error(str(e))
+        return False
+
+def save_user_application(name, data, old_name=None, create=False):
+    """
+    Save one user-defined application, reporting errors on the page
+
+    Creating or renaming never replaces another application with the same name.
+
+    Args:
+        name (str): Application name
+        data (dict): Application data (code, created, last_modified)
+        old_name (str): Previous name, when the application is being renamed
+        create (bool): The application is new
+
+    Returns:
+        bool: True if the application was saved
+    """
+    try:
+        if create:
+            create_user_application(name, data)
+        elif old_name is not None and old_name != name:
+            rename_user_application(old_name, name, data)
+        else:
+            upsert_user_application(name, data)
+        return True
+    except ApplicationExistsError:
+        display_error_message(
+            "ERROR: IDENTIFIER CONFLICT DETECTED",
+            f"A module with identifier '{name}' already exists"
+        )
+        return False
+    except StorageError as e:
+        st.error(str(e))
+        return False
+
+def remove_user_application(name):
+    """Delete one user-defined application, reporting errors on the page"""
+    try:
+        delete_user_application(name)
+        return True
+    except StorageError as e:
+        st.error(str(e))
+        return False
+
+def format_complexity(entry):
+    """
+    Return the COMPLEXITY meter of a module card
+
+    Args:
+        entry (dict): The module's circuit index entry, or None while it is being indexed
+
+    Returns:
+        str: HTML of the meter, with the circuit metrics as a tooltip
+    """
+    rating = complexity_rating(entry)
+    if rating is None:
+        status = "INDEXING" if entry is None else "N/A"
+        tooltip = "Circuit metadata is being collected" if entry is None else (entry.get("error") or "No circuits found")
+        tooltip = html.escape(tooltip, quote=True)
+        return f"<span title=\"{tooltip}\">COMPLEXITY: {'○' * 5} {status}</span>"
+
+    tooltip = (
+        f"{entry['qubits']} qubits | depth {entry['depth']} | {entry['gate_count']} gates | "
+        f"{entry['two_qubit_gates']} two-qubit{' | Clifford' if entry['clifford'] else ''}"
+    )
+    return f"<span title=\"{tooltip}\">COMPLEXITY: {'●' * rating}{'○' * (5 - rating)}</span>"
+
+# Lines shown in a terminal panel; earlier lines stay in the capture only
+TERMINAL_DISPLAY_LINES = 500
+
+def new_terminal_view():
+    """Return an empty terminal view for update_terminal_view"""
+    return {"seq": 0, "lines": deque(maxlen=TERMINAL_DISPLAY_LINES), "hidden": 0, "partial": ""}
+
+def update_terminal_view(view, stream):
+    """
+    Add the lines a running module printed since the last update to a terminal view
+
+    Only new lines are escaped, so polling a module that prints a lot stays cheap.
+
+    Args:
+        view (dict): View returned by new_terminal_view (kept between reruns)
+        stream (OutputStream): The module's output stream
+    """
+    lines, next_seq, skipped, partial = stream.read_lines(view["seq"])
+    overflow = max(len(view["lines"]) + len(lines) - TERMINAL_DISPLAY_LINES, 0)
+    view["hidden"] += skipped + overflow
+    view["lines"].extend(html.escape(line) for line in lines[-TERMINAL_DISPLAY_LINES:])
+    view["seq"] = next_seq
+    view["partial"] = html.escape(partial)
+
+def display_terminal_view(view, title="QUANTUM OUTPUT DATA", from_cache=False):
+    """Display a terminal view in a terminal-like container, scrolled to the latest line"""
+    st.markdown(f"<h4>{title}</h4>", unsafe_allow_html=True)
+    if from_cache:
+        # Badge for results memoized by the result cache
+        st.markdown("""
+        <span style="display: inline-block; background-color: #222244; color: #00ffcc; border: 1px solid #00ffcc;
+              border-radius: 10px; padding: 2px 10px; font-size: 0.8em; margin-bottom: 5px;">⚡ SERVED FROM CACHE</span>
+        """, unsafe_allow_html=True)
+    hidden = ""
+    if view["hidden"]:
+        hidden = f"<div style='color: #00ffcc80;'>[... {view['hidden']} earlier lines not shown ...]</div>"
+    body = "\n".join(view["lines"])
+    if view["partial"]:
+        body = f"{body}\n{view['partial']}" if body else view["partial"]
+    # column-reverse keeps the panel scrolled to the bottom as lines arrive
     st.markdown(f"""
     <div style="background-color: #1a1a2e; color: #00ffcc; font-family: 'Courier New', monospace; 
-         padding: 15px; border-radius: 5px; border: 1px solid #00ffcc; height: 200px; overflow-y: auto;">
-        <pre>{output}</pre>
+         padding: 15px; border-radius: 5px; border: 1px solid #00ffcc; height: 200px; overflow-y: auto;
+         display: flex; flex-direction: column-reverse;">
+        <div>{hidden}<pre style="margin: 0;">{body}</pre></div>
+    </div>
+    """, unsafe_allow_html=True)
+
+def display_terminal_output(output, from_cache=False):
+    """Display output in a terminal-like container"""
+    lines = output.split("\n")
+    view = new_terminal_view()
+    view["lines"].extend(html.escape(line) for line in lines[-TERMINAL_DISPLAY_LINES:])
+    view["hidden"] = max(len(lines) - TERMINAL_DISPLAY_LINES, 0)
+    display_terminal_view(view, from_cache=from_cache)
+
+def display_timing_breakdown(timings):
+    """Display the per-phase wall and CPU time of an execution"""
+    st.markdown("<h4>TIMING BREAKDOWN</h4>", unsafe_allow_html=True)
+    if not timings or not timings.get("phases"):
+        st.markdown("<p style='color: #00ffcc99;'>No timing data recorded</p>", unsafe_allow_html=True)
+        return
+
+    rows = ""
+    for name, total in summarize(timings).items():
+        count = f" ×{total['count']}" if total["count"] > 1 else ""
+        rows += f"""
+        <tr><td>{name}{count}</td><td style="text-align: right;">{total['wall'] * 1000:.1f}</td>
+            <td style="text-align: right;">{total['cpu'] * 1000:.1f}</td></tr>"""
+
+    # Circuit size of the last simulation recorded in the trace
+    circuit_html = ""
+    sized = [record for record in timings["phases"] if "qubits" in record]
+    if sized:
+        record = sized[-1]
+        circuit_html = f"<p style='margin: 5px 0 0 0;'>QUBITS: {record['qubits']} | DEPTH: {record.get('depth', '-')} | SHOTS: {record.get('shots', '-')}</p>"
+
+    st.markdown(f"""
+    <div style="background-color: #1a1a2e; color: #00ffcc; font-family: 'Courier New', monospace; font-size: 0.8em;
+         padding: 10px; border-radius: 5px; border: 1px solid #00ffcc;">
+        <table style="width: 100%;">
+            <tr><th style="text-align: left;">PHASE</th><th style="text-align: right;">WALL ms</th>
+                <th style="text-align: right;">CPU ms</th></tr>{rows}
+        </table>
+        {circuit_html}
     </div>
     """, unsafe_allow_html=True)
@@ -0,0 +1,515 @@
+"""
+Process-pool execution workers for the Quantum Circuit Simulator.
+
+Module code runs in a warm pool of worker processes instead of the Streamlit
+server process, so CPU-heavy modules use every core, do not fight over the
+GIL, and a crashing module cannot take other sessions down with it.
+
+Each module gets a worker to itself, and the server watches it while it
+runs: a module that is cancelled, runs past its time limit or grows past its
+memory ceiling has its worker process killed (taking the Aer simulation in
+it down too) and replaced by a fresh one, so a bad module never holds on to
+a slot.
+"""
+import atexit
+import contextlib
+import importlib.machinery
+import itertools
+import multiprocessing
+import os
+import pickle
+import queue
+import sys
+import threading
+import time
+import traceback
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+
+# Number of worker processes in the pool
+POOL_SIZE = int(os.environ.get("QUANTUM_WORKER_PROCESSES", os.cpu_count() or 1))
+
+# Seconds a module may run before its worker is stopped (0 disables the limit)
+MODULE_TIMEOUT = float(os.environ.get("QUANTUM_MODULE_TIMEOUT", "300"))
+
+# Memory in MB a worker may use while running a module (0 disables the limit)
+MODULE_MEMORY_MB = int(os.environ.get("QUANTUM_MODULE_MEMORY_MB", "4096"))
+
+# Seconds between checks of a running module's cancel flag and limits
+WATCH_INTERVAL = 0.1
+
+# Seconds a stopped worker gets to exit before it is killed
+KILL_GRACE_SECONDS = 1.0
+
+_pool = None
+_pool_lock = threading.Lock()
+
+# Output streams of running jobs, by the id their worker tags forwarded lines with
+_streams = weakref.WeakValueDictionary()
+_stream_ids = itertools.count()
+
+# Queue a worker process forwards module output on (set in each worker by _init_worker)
+_worker_output_queue = None
+
+
+class ModuleExecutionError(Exception):
+    """Raised in the parent process when module code failed inside a worker"""
+
+    def __init__(self, message, worker_traceback=""):
+        super().__init__(message)
+        self.worker_traceback = worker_traceback
+
+
+class ModuleCancelledError(ModuleExecutionError):
+    """Raised when a running module was cancelled"""
+
+
+class ModuleTimeoutError(ModuleExecutionError):
+    """Raised when a module ran past its time limit"""
+
+
+class ModuleMemoryError(ModuleExecutionError):
+    """Raised when a module used more memory than its ceiling"""
+
+
+def _warm_worker(output_queue=None):
+    """Pre-import the heavy libraries once when a worker process starts"""
+    global _worker_output_queue
+    _worker_output_queue = output_queue
+
+    import numpy  # noqa: F401
+    import qiskit  # noqa: F401
+    import qiskit_aer  # noqa: F401
+    import utils.executor  # noqa: F401
+
+
+def _ping():
+    """No-op task used to start the worker processes ahead of time"""
+    return os.getpid()
+
+
+def _run_module(code, label="module", stream_id=None, aer_threads=None, memory_mb=None):
+    """
+    Execute module code inside a worker process
+
+    Args:
+        code (str): Python source of the module
+        label (str): Name of the module recorded in its timing trace
+        stream_id (int): Forward print output to the server process under this id while the module runs
+        aer_threads (int): Limit on the OpenMP threads of each Aer run (None for Aer's default)
+        memory_mb (int): Memory Aer may plan a simulation for (None for Aer's default)
+
+    Returns:
+        dict: ``stdout``, ``output``, ``timings`` and ``error`` fields that are safe to send over IPC
+    """
+    from utils.executor import execute_module
+    from utils.output_stream import OutputStream, QueueForwarder
+    from utils.simulator import aer_thread_limit, aer_memory_limit
+
+    forwarder = None
+    if stream_id is not None and _worker_output_queue is not None:
+        forwarder = QueueForwarder(_worker_output_queue, stream_id)
+
+    try:
+        with aer_thread_limit(aer_threads), aer_memory_limit(memory_mb):
+            result = execute_module(code, label=label, stream=OutputStream(on_lines=forwarder))
+    except BaseException as e:
+        return {
+            "stdout": "",
+            "output": None,
+            "from_cache": False,
+            "timings": None,
+            "error": f"{type(e).__name__}: {e}",
+            "traceback": traceback.format_exc(),
+        }
+    finally:
+        if forwarder is not None:
+            forwarder.close()
+
+    output = result["output"]
+    try:
+        pickle.dumps(output)
+    except Exception:
+        # Results that cannot cross the process boundary are sent as text
+        output = str(output)
+    return {
+        "stdout": result["stdout"],
+        "output": output,
+        "from_cache": result["from_cache"],
+        "timings": result["timings"],
+        "error": None,
+        "traceback": ""
+    }
+
+
+def _run_circuits(circuits, shots=1024, seed_simulator=None, aer_threads=None, memory_mb=None):
+    """
+    Simulate circuits inside a worker process
+
+    Args:
+        circuits (list[QuantumCircuit]): The circuits to simulate
+        shots (int): Number of repetitions of each experiment
+        seed_simulator (int): Seed of each simulation (None runs the circuits as one run_many job)
+        aer_threads (int): Limit on the OpenMP threads of each Aer run (None for Aer's default)
+        memory_mb (int): Memory Aer may plan a simulation for (None for Aer's default)
+
+    Returns:
+        dict: ``output`` with the counts of each circuit, and ``error`` and ``traceback`` fields
+    """
+    from utils.simulator import run_many, run_with_simulator, aer_thread_limit, aer_memory_limit
+
+    try:
+        with aer_thread_limit(aer_threads), aer_memory_limit(memory_mb):
+            if seed_simulator is None:
+                all_counts = run_many(circuits, shots)
+            else:
+                # Seeded runs must be reproducible on their own, so they are not batched
+                all_counts = [run_with_simulator(circuit, shots, seed_simulator=seed_simulator) for circuit in circuits]
+    except BaseException as e:
+        return {"output": None, "error": f"{type(e).__name__}: {e}", "traceback": traceback.format_exc()}
+    return {"output": [dict(counts) for counts in all_counts], "error": None, "traceback": ""}
+
+
+@contextlib.contextmanager
+def _main_script_not_reimported():
+    """
+    Keep starting worker processes from re-running the Streamlit script
+
+    Streamlit installs the running script as ``__main__`` without a module
+    spec, and spawn/forkserver children re-execute such a ``__main__`` before
+    running any task. Workers only run functions from this package, so while
+    they start the script is given a spec named ``__main__``, which children
+    skip just like a ``python -m`` entry point.
+    """
+    main_module = sys.modules.get("__main__")
+    if main_module is None or getattr(main_module, "__spec__", None) is not None:
+        yield
+        return
+    main_module.__spec__ = importlib.machinery.ModuleSpec("__main__", None)
+    try:
+        yield
+    finally:
+        main_module.__spec__ = None
+
+
+def _drain_output(output_queue):
+    """Hand lines forwarded by the workers to the output stream of their job"""
+    while True:
+        message = output_queue.get()
+        if message is None:
+            return
+        stream_id, lines, dropped = message
+        stream = _streams.get(stream_id)
+        if stream is not None:
+            stream.extend(lines, dropped)
+
+
+def new_process_pool(max_workers, forward_output=False):
+    """
+    Create a process pool whose workers have qiskit, qiskit_aer and numpy pre-imported
+
+    Args:
+        max_workers (int): Number of worker processes
+        forward_output (bool): Give the workers a queue to stream module output back on
+
+    Returns:
+        ProcessPoolExecutor: The pool, with every worker already starting up
+    """
+    # forkserver avoids forking the multi-threaded Streamlit server
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    context = multiprocessing.get_context(method)
+    output_queue = None
+    if forward_output:
+        output_queue = context.Queue()
+        threading.Thread(target=_drain_output, args=(output_queue,), name="quantum-output-drain", daemon=True).start()
+    pool = ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=context,
+        initializer=_warm_worker,
+        initargs=(output_queue,)
+    )
+    pool.output_queue = output_queue
+    # Every worker is started here, by these submissions
+    with _main_script_not_reimported():
+        for _ in range(max_workers):
+            pool.submit(_ping)
+    return pool
+
+
+def _worker_main(connection, output_queue):
+    """Entry point of a module worker process: run the tasks sent over the pipe until told to stop"""
+    _warm_worker(output_queue)
+
+    # Shards would run in processes this worker cannot take down with it when it
+    # is stopped; the worker already gets its share of the cores from the scheduler
+    import utils.sharding
+    utils.sharding.MAX_SHARDS = 1
+
+    while True:
+        try:
+            task = connection.recv()
+        except (EOFError, OSError):
+            return
+        if task is None:
+            return
+        function, args = task
+        connection.send(function(*args))
+
+
+def _memory_mb(pid):
+    """Return the resident memory of a process in MB, or None where /proc is not available"""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            resident_pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+class _Worker:
+    """A warm worker process and the pipe modules are sent to it on"""
+
+    def __init__(self, context, output_queue):
+        self.connection, child_connection = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main, args=(child_connection, output_queue), name="quantum-module-worker"
+        )
+        with _main_script_not_reimported():
+            self.process.start()
+        child_connection.close()
+
+    def stop(self):
+        """Stop the process, killing it if it does not exit within KILL_GRACE_SECONDS"""
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(KILL_GRACE_SECONDS)
+            if self.process.is_alive():
+                self.process.kill()
+        self.process.join()
+        self.connection.close()
+
+
+class WorkerPool:
+    """
+    Warm module worker processes that can be stopped one at a time
+
+    Unlike a ProcessPoolExecutor, stopping the worker of one module does not
+    break the pool for the modules running in the other workers.
+    """
+
+    def __init__(self, size):
+        # forkserver avoids forking the multi-threaded Streamlit server
+        method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        self._context = multiprocessing.get_context(method)
+        self.output_queue = self._context.Queue()
+        threading.Thread(
+            target=_drain_output, args=(self.output_queue,), name="quantum-output-drain", daemon=True
+        ).start()
+        self._idle = queue.Queue()
+        self._workers = set()
+        self._lock = threading.Lock()
+        self._closed = False
+        for _ in range(size):
+            self._idle.put(self._spawn())
+
+    def _spawn(self):
+        worker = _Worker(self._context, self.output_queue)
+        with self._lock:
+            self._workers.add(worker)
+        return worker
+
+    def _release(self, worker):
+        """Return a worker that finished its module to the idle workers"""
+        if self._closed:
+            self._discard(worker)
+        else:
+            self._idle.put(worker)
+
+    def _discard(self, worker):
+        """Stop a worker for good"""
+        with self._lock:
+            self._workers.discard(worker)
+        worker.stop()
+
+    def _replace(self, worker):
+        """Stop a worker in the background and start its replacement"""
+        def replace():
+            self._discard(worker)
+            if not self._closed:
+                self._idle.put(self._spawn())
+
+        threading.Thread(target=replace, name="quantum-worker-replace", daemon=True).start()
+
+    def _acquire(self, cancel_event):
+        """Wait for an idle worker; returns None if the job is cancelled first"""
+        while True:
+            try:
+                return self._idle.get(timeout=WATCH_INTERVAL)
+            except queue.Empty:
+                if cancel_event is not None and cancel_event.is_set():
+                    return None
+
+    def run(self, task, cancel_event=None, timeout=None, memory_mb=None, function=_run_module):
+        """
+        Run function(*task) in an idle worker and watch it until it finishes
+
+        Args:
+            task (tuple): Arguments of function
+            cancel_event (threading.Event): Stops the module when set
+            timeout (float): Seconds the module may run (None or 0 for no limit)
+            memory_mb (float): Resident memory the worker may use (None or 0 for no limit)
+            function (callable): Module-level function to run (_run_module or _run_circuits)
+
+        Returns:
+            dict: The result of function
+
+        Raises:
+            ModuleCancelledError, ModuleTimeoutError, ModuleMemoryError: If the worker had to be stopped
+            ModuleExecutionError: If the worker died
+        """
+        worker = self._acquire(cancel_event)
+        if worker is None:
+            raise ModuleCancelledError("Execution cancelled before it started")
+
+        deadline = time.monotonic() + timeout if timeout else None
+        try:
+            worker.connection.send((function, task))
+            while not worker.connection.poll(WATCH_INTERVAL):
+                if not worker.process.is_alive():
+                    raise EOFError
+                if cancel_event is not None and cancel_event.is_set():
+                    raise ModuleCancelledError("Execution cancelled")
+                if deadline is not None and time.monotonic() > deadline:
+                    raise ModuleTimeoutError(f"Execution exceeded the time limit of {timeout:g} seconds")
+                used_mb = _memory_mb(worker.process.pid) if memory_mb else None
+                if used_mb is not None and used_mb > memory_mb:
+                    raise ModuleMemoryError(f"Execution exceeded the memory limit of {memory_mb:g} MB")
+            result = worker.connection.recv()
+        except (EOFError, OSError):
+            self._replace(worker)
+            raise ModuleExecutionError("The execution worker terminated unexpectedly")
+        except BaseException:
+            # Killing the process is the only way to stop module code (and Aer) mid-run
+            self._replace(worker)
+            raise
+        self._release(worker)
+        return result
+
+    def shutdown(self):
+        """Stop every worker; modules still running are stopped as well"""
+        self._closed = True
+        with self._lock:
+            workers = list(self._workers)
+        for worker in workers:
+            self._discard(worker)
+        self.output_queue.put(None)
+
+
+def get_pool():
+    """Return the shared module worker pool, starting and warming it on first use"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = WorkerPool(POOL_SIZE)
+            atexit.register(_pool.shutdown)
+        return _pool
+
+
+def run_module_in_worker(code, label="module", stream=None, aer_threads=None, cancel_event=None,
+                         timeout=None, memory_mb=None, pool=None):
+    """
+    Execute module code in a worker process and wait for its result
+
+    Args:
+        code (str): Python source of the module
+        label (str): Name of the module recorded in its timing trace
+        stream (OutputStream): Receives the module's print output while it runs
+        aer_threads (int): Limit on the OpenMP threads of each Aer run in the worker
+        cancel_event (threading.Event): Stops the module (and its worker) when set
+        timeout (float): Seconds the module may run (defaults to MODULE_TIMEOUT, 0 for no limit)
+        memory_mb (int): Memory ceiling of the worker in MB (defaults to MODULE_MEMORY_MB, 0 for no limit)
+        pool (WorkerPool): Pool to run in (defaults to the shared pool)
+
+    Returns:
+        dict: ``stdout``, ``output``, ``from_cache`` and ``timings`` as returned by execute_module
+
+    Raises:
+        ModuleExecutionError: If the module raised an exception or its worker died; the
+        ModuleCancelledError, ModuleTimeoutError and ModuleMemoryError subclasses tell
+        why a worker was stopped
+    """
+    if timeout is None:
+        timeout = MODULE_TIMEOUT
+    if memory_mb is None:
+        memory_mb = MODULE_MEMORY_MB
+    if pool is None:
+        pool = get_pool()
+    stream_id = None
+    if stream is not None:
+        stream_id = next(_stream_ids)
+        _streams[stream_id] = stream
+    try:
+        result = pool.run(
+            (code, label, stream_id, aer_threads, memory_mb or None),
+            cancel_event=cancel_event, timeout=timeout, memory_mb=memory_mb
+        )
+    finally:
+        if stream_id is not None:
+            _streams.pop(stream_id, None)
+
+    if result["error"]:
+        raise ModuleExecutionError(result["error"], result["traceback"])
+    return {
+        "stdout": result["stdout"],
+        "output": result["output"],
+        "from_cache": result["from_cache"],
+        "timings": result["timings"]
+    }
+
+
+def run_circuits_in_worker(circuits, shots=1024, seed_simulator=None, aer_threads=None, cancel_event=None,
+                           timeout=None, memory_mb=None, pool=None):
+    """
+    Simulate circuits in a worker process and wait for their counts
+
+    The circuits get the time and memory limits of a module, and can be
+    cancelled mid-simulation, which an Aer run in the server process cannot.
+
+    Args:
+        circuits (list[QuantumCircuit]): The circuits to simulate
+        shots (int): Number of repetitions of each experiment
+        seed_simulator (int): Seed of each simulation (None runs the circuits as one run_many job)
+        aer_threads (int): Limit on the OpenMP threads of each Aer run in the worker
+        cancel_event (threading.Event): Stops the simulation (and its worker) when set
+        timeout (float): Seconds the simulation may run (defaults to MODULE_TIMEOUT, 0 for no limit)
+        memory_mb (int): Memory ceiling of the worker in MB (defaults to MODULE_MEMORY_MB, 0 for no limit)
+        pool (WorkerPool): Pool to run in (defaults to the shared pool)
+
+    Returns:
+        list[dict]: Measurement counts of each circuit, in input order
+
+    Raises:
+        ModuleExecutionError: If the simulation failed or its worker was stopped (see run_module_in_worker)
+    """
+    if timeout is None:
+        timeout = MODULE_TIMEOUT
+    if memory_mb is None:
+        memory_mb = MODULE_MEMORY_MB
+    if pool is None:
+        pool = get_pool()
+    result = pool.run(
+        (list(circuits), shots, seed_simulator, aer_threads, memory_mb or None),
+        cancel_event=cancel_event, timeout=timeout, memory_mb=memory_mb, function=_run_circuits
+    )
+    if result["error"]:
+        raise ModuleExecutionError(result["error"], result["traceback"])
+    return result["output"]
+
+
+def shutdown_pool():
+    """Stop all worker processes"""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown()